@@ -0,0 +1,319 @@
+"""
+整份PPT生成基准：v6各页构建函数 + generate_chinese_ppt / generate_english_ppt 全流程
+用不同分辨率的合成图片代替 analyses/data，记录：
+- 每种页面：构建耗时（首次 / 最快）、形状数、幻灯片XML字节数、媒体字节数
+- 全流程：耗时、峰值内存、输出文件大小
+结果保存为JSON（默认 benchmarks/results/<提交号>.json），两次结果可用 --compare 对比
+
+用法：
+    python PPT/benchmarks/bench_deck.py                          # 运行并保存结果
+    python PPT/benchmarks/bench_deck.py -o /tmp/bench.json       # 指定结果文件
+    python PPT/benchmarks/bench_deck.py --compare old.json new.json
+
+注意：图片预处理与静态页片段的磁盘缓存（PPT/.cache）照常生效，测得的是日常重复构建的耗时。
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PPT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PPT_DIR)
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# 合成图片分辨率（像素）：屏幕截图级 / 300dpi导出 / 600dpi导出
+RESOLUTIONS = {
+    "small": (1200, 800),
+    "medium": (3600, 2400),
+    "large": (7200, 4800),
+}
+LANGS = ("cn", "en")
+SLIDE_REPEATS = 5
+DECK_REPEATS = 3
+
+# 对比时变化超过该比例才标记
+REGRESSION_THRESHOLD = 0.10
+
+
+def make_plot_image(path, size, seed):
+    """生成一张类似统计图的PNG：白底、坐标轴、散点与折线"""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    width, height = size
+    im = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(im)
+    margin = width // 10
+    line_w = max(1, width // 600)
+    draw.line([(margin, margin), (margin, height - margin), (width - margin, height - margin)], fill="black", width=line_w * 2)
+    palette = ["#1465C0", "#4CAF50", "#FF9800", "#E53935", "#7B1FA2", "#009688"]
+    r = max(2, width // 300)
+    for color in palette:
+        points = [
+            (rng.randint(margin, width - margin), rng.randint(margin, height - margin))
+            for _ in range(200)
+        ]
+        for x, y in points:
+            draw.ellipse([x - r, y - r, x + r, y + r], fill=color)
+        draw.line(sorted(points)[::20], fill=color, width=line_w)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    im.save(path)
+
+
+def make_svg_image(path, size, seed):
+    """生成一张矢量统计图SVG（散点），并像R脚本一样在旁边导出同名PNG"""
+    rng = random.Random(seed)
+    width, height = size
+    margin = width // 10
+    palette = ["#1465C0", "#4CAF50", "#FF9800", "#E53935", "#7B1FA2", "#009688"]
+    dots = "".join(
+        f'<circle cx="{rng.randint(margin, width - margin)}" cy="{rng.randint(margin, height - margin)}" r="{max(2, width // 300)}" fill="{color}"/>'
+        for color in palette for _ in range(20)
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}px" height="{height}px" viewBox="0 0 {width} {height}">'
+            f'<rect width="{width}" height="{height}" fill="white"/>'
+            f'<path d="M{margin} {margin}V{height - margin}H{width - margin}" stroke="black" fill="none"/>{dots}</svg>'
+        )
+    make_plot_image(f"{os.path.splitext(path)[0]}.png", size, seed)
+
+
+def make_image_dir(root, spec, size):
+    """按描述文件引用的相对路径生成合成图片（.svg另带同名PNG），返回图片目录"""
+    import deck_engine
+
+    for i, slide_spec in enumerate(spec["slides"]):
+        for ref in deck_engine.slide_image_refs(slide_spec):
+            make = make_svg_image if ref.lower().endswith(".svg") else make_plot_image
+            make(os.path.join(root, *ref.split("/")), size, seed=f"{ref}|{size}|{i}")
+    return root
+
+
+def slide_metrics(slide):
+    """单页的形状数、XML字节数、媒体字节数"""
+    media = [
+        rel.target_part for rel in slide.part.rels.values()
+        if not rel.is_external and rel.target_part.content_type.startswith("image/")
+    ]
+    return {
+        "shapes": len(slide.shapes),
+        "xml_bytes": len(slide.part.blob),
+        "media_bytes": sum(len(part.blob) for part in media),
+    }
+
+
+def bench_slides(lang, image_dir):
+    """逐页计时 v6 构建函数（每次都在新的Presentation中构建）"""
+    import deck_engine
+    import results_store
+
+    spec = results_store.bind_spec(deck_engine.load_spec(deck_engine.spec_path("v6", lang)), image_dir)
+    ctx = deck_engine.DeckContext(lang, image_dir)
+    results = {}
+    for slide_spec in spec["slides"]:
+        slide_type = slide_spec["type"]
+        builder = deck_engine.COMPONENTS[slide_type]
+        times = []
+        for _ in range(SLIDE_REPEATS):
+            prs = deck_engine.new_presentation(spec)
+            start = time.perf_counter()
+            builder(prs, slide_spec, ctx)
+            times.append(time.perf_counter() - start)
+        results[slide_type] = {
+            "first_ms": times[0] * 1e3,
+            "best_ms": min(times) * 1e3,
+            **slide_metrics(prs.slides[-1]),
+        }
+    return results
+
+
+def peak_rss_mb():
+    """当前进程的峰值常驻内存（MB）；没有resource模块（Windows）时返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux单位为KB，macOS为字节
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_deck(args):
+    """在独立子进程中运行完整生成流程，返回耗时、峰值内存与输出大小"""
+    lang, image_dir, output_dir = args
+    import generate_ppt_v6 as v6
+
+    generate = v6.generate_chinese_ppt if lang == "cn" else v6.generate_english_ppt
+    tracemalloc.start()
+    times = []
+    output_bytes = 0
+    for i in range(DECK_REPEATS):
+        # 每次写到新文件，避免可复现模式跳过写入
+        output_path = os.path.join(output_dir, f"{lang}_{i}.pptx")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate(output_path, image_dir)
+        times.append(time.perf_counter() - start)
+        output_bytes = os.path.getsize(output_path)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "first_s": times[0],
+        "best_s": min(times),
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_traced_mb": traced_peak / (1024 * 1024),
+        "output_bytes": output_bytes,
+    }
+
+
+def git_revision():
+    """当前提交号（不在git仓库中时返回unknown）"""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PPT_DIR, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmarks(resolutions):
+    """对每种分辨率运行逐页与全流程基准"""
+    import deck_engine
+    import pptx
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "python_pptx": pptx.__version__,
+        "platform": platform.platform(),
+        "resolutions": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="pc047_bench_") as tmp:
+        for name in resolutions:
+            size = RESOLUTIONS[name]
+            print(f"[{name}] {size[0]}x{size[1]}")
+            image_dir = os.path.join(tmp, name, "data")
+            output_dir = os.path.join(tmp, name, "out")
+            os.makedirs(output_dir)
+            make_image_dir(image_dir, deck_engine.load_spec(deck_engine.spec_path("v6", "cn")), size)
+
+            entry = {"size": list(size), "slides": {}, "decks": {}}
+            for lang in LANGS:
+                entry["slides"][lang] = bench_slides(lang, image_dir)
+                # 每个全流程在新启动（spawn）的进程中运行，峰值内存不含父进程的占用
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    entry["decks"][lang] = pool.submit(run_deck, (lang, image_dir, output_dir)).result()
+            results["resolutions"][name] = entry
+    return results
+
+
+def print_results(results):
+    """打印逐页与全流程结果"""
+    for name, entry in results["resolutions"].items():
+        print(f"\n== {name} {entry['size'][0]}x{entry['size'][1]} ==")
+        for lang, slides in entry["slides"].items():
+            print(f"\n[{lang}] {'页面类型':<22}{'首次(ms)':>10}{'最快(ms)':>10}{'形状':>6}{'XML(KB)':>10}{'媒体(KB)':>10}")
+            for slide_type, m in slides.items():
+                print(
+                    f"     {slide_type:<22}{m['first_ms']:>10.2f}{m['best_ms']:>10.2f}{m['shapes']:>6}"
+                    f"{m['xml_bytes'] / 1024:>10.1f}{m['media_bytes'] / 1024:>10.1f}"
+                )
+        print(f"\n{'语言':<6}{'首次(s)':>10}{'最快(s)':>10}{'峰值RSS(MB)':>14}{'Python堆(MB)':>14}{'输出(KB)':>10}")
+        for lang, d in entry["decks"].items():
+            rss = f"{d['peak_rss_mb']:.1f}" if d["peak_rss_mb"] is not None else "-"
+            print(
+                f"{lang:<6}{d['first_s']:>10.3f}{d['best_s']:>10.3f}{rss:>14}"
+                f"{d['peak_traced_mb']:>14.1f}{d['output_bytes'] / 1024:>10.1f}"
+            )
+
+
+def compare_metric(old, new):
+    """返回 (相对变化, 标记)；增大超过阈值记为回退"""
+    if old in (None, 0) or new is None:
+        return None, ""
+    change = (new - old) / old
+    if change > REGRESSION_THRESHOLD:
+        return change, "  <-- 回退"
+    if change < -REGRESSION_THRESHOLD:
+        return change, "  改善"
+    return change, ""
+
+
+def compare(old_path, new_path):
+    """对比两次结果，列出每个指标的变化"""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{old['revision']} -> {new['revision']}")
+
+    rows = []
+    for name, entry in new["resolutions"].items():
+        old_entry = old["resolutions"].get(name)
+        if old_entry is None:
+            continue
+        for lang, slides in entry["slides"].items():
+            for slide_type, m in slides.items():
+                old_m = old_entry["slides"].get(lang, {}).get(slide_type)
+                if old_m:
+                    for key in ("best_ms", "shapes", "xml_bytes", "media_bytes"):
+                        rows.append((f"{name}/{lang}/{slide_type}/{key}", old_m[key], m[key]))
+        for lang, d in entry["decks"].items():
+            old_d = old_entry["decks"].get(lang)
+            if old_d:
+                for key in ("best_s", "peak_rss_mb", "peak_traced_mb", "output_bytes"):
+                    rows.append((f"{name}/{lang}/deck/{key}", old_d[key], d[key]))
+
+    regressions = 0
+    for label, old_value, new_value in rows:
+        change, mark = compare_metric(old_value, new_value)
+        if change is None:
+            continue
+        regressions += mark == "  <-- 回退"
+        print(f"{label:<55}{old_value:>14.3f}{new_value:>14.3f}{change:>+9.1%}{mark}")
+    print(f"\n{regressions} 项回退（阈值 {REGRESSION_THRESHOLD:.0%}）")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PC047组会PPT生成基准")
+    parser.add_argument("-r", "--resolutions", nargs="+", default=list(RESOLUTIONS), choices=RESOLUTIONS, help="合成图片分辨率")
+    parser.add_argument("-o", "--output", help="结果JSON路径（默认 benchmarks/results/<提交号>.json）")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="对比两个结果文件")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.compare:
+        return compare(*args.compare)
+
+    results = run_benchmarks(args.resolutions)
+    print_results(results)
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存：{output}")
+
+
+if __name__ == "__main__":
+    main()
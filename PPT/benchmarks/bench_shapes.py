@@ -0,0 +1,79 @@
+"""
+形状创建基准：python-pptx代理对象逐步设置 vs fast_shapes一次性生成
+每页放置 N 个带文字方框（N = 50 / 100 / 200），比较单个形状的平均耗时；
+两者都不做文字适配，文字适配（text_fit）的开销单独一列
+
+用法：
+    python PPT/benchmarks/bench_shapes.py
+"""
+
+import contextlib
+import functools
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Inches, Pt
+
+from generate_ppt_v6 import COLORS, add_box_with_text
+
+BOX_COUNTS = (50, 100, 200)
+REPEATS = 5
+
+
+def proxy_box_with_text(slide, left, top, width, height, text, fill_color, text_color=None, font_size=14, bold=False):
+    """v6原实现：逐步通过python-pptx代理对象设置"""
+    shape = slide.shapes.add_shape(
+        MSO_SHAPE.ROUNDED_RECTANGLE, Inches(left), Inches(top), Inches(width), Inches(height)
+    )
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = fill_color
+    shape.line.color.rgb = COLORS['dark_gray']
+    shape.line.width = Pt(1)
+    shape.adjustments[0] = 0.1
+
+    tf = shape.text_frame
+    tf.word_wrap = True
+    tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+    p = tf.paragraphs[0]
+    p.text = text
+    p.font.size = Pt(font_size)
+    p.font.bold = bold
+    p.font.color.rgb = text_color or COLORS['dark_gray']
+    tf.paragraphs[0].space_before = Pt(0)
+    tf.paragraphs[0].space_after = Pt(0)
+    return shape
+
+
+def time_slide(add_box, n_boxes):
+    """在一页上放置n_boxes个方框，返回单个形状平均耗时（秒）"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        start = time.perf_counter()
+        for i in range(n_boxes):
+            add_box(slide, (i % 10) * 0.95, (i // 10) * 0.3, 0.9, 0.25, f"Box {i}\n第{i}个", COLORS['light_blue'], None, 10, i % 2 == 0)
+        best = min(best, time.perf_counter() - start)
+    return best / n_boxes
+
+
+def main():
+    print(f"{'方框数':>6}{'python-pptx(us)':>18}{'fast_shapes(us)':>18}{'加速比':>8}{'+文字适配(us)':>16}")
+    for n in BOX_COUNTS:
+        proxy = time_slide(proxy_box_with_text, n)
+        fast = time_slide(functools.partial(add_box_with_text, fit=False), n)
+        # 方框很矮，文字适配到最小字号仍放不下，不输出其警告
+        with contextlib.redirect_stderr(io.StringIO()):
+            fitted = time_slide(add_box_with_text, n)
+        print(f"{n:>6}{proxy * 1e6:>18.1f}{fast * 1e6:>18.1f}{proxy / fast:>8.1f}x{(fitted - fast) * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""
+PC047组会附录PPT：把大结果表分页排成表格幻灯片
+generate_ppt.py 的 add_table_slide 把整张表放在一页上，几百上千行的结果表（全部显著的物种-KO关联、
+关键KO驱动物种、GO/PFAM差异分析）放不下。这里流式生成附录：
+- 逐行惰性读取CSV（不整表载入），按 where 条件筛选、按列格式化
+- 按估算的行高分页：每个单元格按字形步进宽度（text_fit.py）与列宽估算折行数，
+  超过 max_lines 的内容截断加省略号，一页放不下下一行就换页；续页标题加"（续）"，页脚注明行号范围
+- 表格页的XML只用python-pptx生成一次（标题栏 + 表头 + 一行样例）作为模板，之后每页只做字符串拼接
+- 每页生成后立即写入zip（pptx_writer.ZipStreamWriter），内存中只保留当前页，
+  最后在 presentation.xml 与 [Content_Types].xml 中一次性登记全部页面，5000行的附录也在几秒内生成
+
+描述文件 decks/appendix_<语言>.json：
+    "tables": [
+        {"id": "taxa-ko", "title": "附录A 物种-KO关联", "ref": "02_functional_profiling/21_taxa_ko_associations.csv",
+         "where": {"FDR": {"max": 0.05}},
+         "columns": [{"column": "Species_short", "label": "物种", "width": 4.2},
+                     {"column": "FDR", "format": "{:.2e}", "width": 1.6}]}
+    ]
+- where：列名 -> {"max": x, "min": x, "in": [...]}，数值比较时NA行不保留
+- columns：width 为英寸（不给则平分9英寸），format 同绑定的format
+CSV不存在的表跳过并打印警告。
+
+用法：
+    python PPT/deck_appendix.py -l cn            # 输出 PPT/<date>/组会汇报_附录.pptx
+    python PPT/deck_appendix.py -l cn en --force
+"""
+
+import argparse
+import codecs
+import csv
+import hashlib
+import math
+import os
+import re
+import sys
+import time
+from xml.sax.saxutils import escape
+
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml.ns import qn
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.util import Emu, Inches, Pt
+
+import deck_engine
+import fast_shapes
+import generate_ppt_v6 as v6
+import pptx_writer
+import results_store
+import text_fit
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(PPT_DIR)
+MEETING_DATE = "20260126"
+
+LANGS = ("cn", "en")
+OUTPUT_NAMES = {
+    "cn": "组会汇报_附录.pptx",
+    "en": "GroupMeeting_appendix.pptx",
+}
+
+# 表格位置与字号（英寸 / 磅）
+TABLE_LEFT = 0.5
+TABLE_TOP = 1.3
+TABLE_WIDTH = 9
+BOTTOM_MARGIN = 0.4
+FONT_SIZE = 10
+HEADER_FONT_SIZE = 11
+MAX_LINES = 2
+LINE_SPACING = 1.2
+# 单元格内边距（比python-pptx默认的0.1/0.05英寸紧凑）
+CELL_MARGIN_X = Inches(0.06)
+CELL_MARGIN_Y = Inches(0.02)
+ELLIPSIS = "…"
+
+NA_TEXT = "NA"
+
+# 模板中的占位标记：@@名称@@
+_MARK = re.compile(r"@@([A-Z]+[0-9]*)@@")
+_ROW_MARK = 7777777
+_FRAME_MARK = 8888888
+
+
+# ---------------------------------------------------------------------------
+# 惰性读取CSV
+# ---------------------------------------------------------------------------
+
+def detect_encoding(path):
+    """逐块增量解码判断CSV编码（不把整个文件读入内存），依次尝试UTF-8与GBK"""
+    for encoding in results_store.ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"无法识别CSV编码：{path}")
+
+
+def _matches(value, cond):
+    if "in" in cond and value not in cond["in"]:
+        return False
+    if "min" in cond or "max" in cond:
+        if not isinstance(value, (int, float)):
+            return False
+        if "min" in cond and value < cond["min"]:
+            return False
+        if "max" in cond and value > cond["max"]:
+            return False
+    return True
+
+
+def iter_rows(path, columns, where=None):
+    """逐行读取CSV，按where筛选，返回每行格式化后的单元格文本列表"""
+    where = where or {}
+    with open(path, newline="", encoding=detect_encoding(path)) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        index = {name: i for i, name in enumerate(header)}
+        missing = [c for c in [col["column"] for col in columns] + list(where) if c not in index]
+        if missing:
+            raise ValueError(f"{path} 中没有列 {', '.join(missing)}（可用：{', '.join(header)}）")
+        picks = [(index[col["column"]], col.get("format")) for col in columns]
+        conditions = [(index[name], cond) for name, cond in where.items()]
+        for row in reader:
+            if not row:
+                continue
+            if not all(_matches(results_store.convert(_cell(row, i)), cond) for i, cond in conditions):
+                continue
+            yield [_format(results_store.convert(_cell(row, i)), fmt) for i, fmt in picks]
+
+
+def _cell(row, i):
+    return row[i] if i < len(row) else None
+
+
+def _format(value, fmt):
+    return NA_TEXT if value is None else results_store.format_value(value, fmt)
+
+
+# ---------------------------------------------------------------------------
+# 行高估算
+# ---------------------------------------------------------------------------
+
+def char_width(ch, font_size):
+    """单个字符的估算宽度（磅）"""
+    return text_fit.char_width(ch) * font_size
+
+
+def text_width(text, font_size):
+    return text_fit.text_width(text) * font_size
+
+
+def fit_cell(text, width, font_size, max_lines=MAX_LINES):
+    """估算单元格折行数（width为列宽EMU）；超过max_lines时截断，返回 (文本, 行数)"""
+    avail = (width - 2 * CELL_MARGIN_X) / 12700
+    used = text_width(text, font_size)
+    lines = max(1, math.ceil(used / avail))
+    if lines <= max_lines:
+        return text, lines
+    budget = avail * max_lines - char_width(ELLIPSIS, font_size)
+    total = 0.0
+    for i, ch in enumerate(text):
+        total += char_width(ch, font_size)
+        if total > budget:
+            return text[:i] + ELLIPSIS, max_lines
+    return text, max_lines
+
+
+def row_height(lines, font_size):
+    """行数 -> 行高（EMU）"""
+    return int(Pt(lines * font_size * LINE_SPACING)) + 2 * CELL_MARGIN_Y
+
+
+# ---------------------------------------------------------------------------
+# 页面模板
+# ---------------------------------------------------------------------------
+
+def _split(xml):
+    """按 @@名称@@ 切分为 [文本, 名称, 文本, 名称, ..., 文本]"""
+    return _MARK.split(xml)
+
+
+def _fill(pieces, values):
+    return "".join(piece if i % 2 == 0 else values[piece] for i, piece in enumerate(pieces))
+
+
+class PageTemplate:
+    """一张表的表格页模板：python-pptx生成一次，之后按页拼接字符串"""
+
+    def __init__(self, spec, table):
+        prs = deck_engine.new_presentation(spec)
+        self.slide_height = prs.slide_height
+        columns = table["columns"]
+        widths = [Inches(col.get("width", TABLE_WIDTH / len(columns))) for col in columns]
+        self.widths = widths
+        self.font_size = table.get("font_size", spec.get("font_size", FONT_SIZE))
+        self.max_lines = table.get("max_lines", spec.get("max_lines", MAX_LINES))
+
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        v6.add_header(slide, prs, "@@TITLE@@")
+        headers = [col.get("label", col["column"]) for col in columns]
+        header_lines = max(fit_cell(h, w, HEADER_FONT_SIZE, 3)[1] for h, w in zip(headers, widths))
+        self.header_height = row_height(header_lines, HEADER_FONT_SIZE)
+        frame = slide.shapes.add_table(
+            2, len(columns), Inches(TABLE_LEFT), Inches(TABLE_TOP), sum(widths), Emu(_FRAME_MARK)
+        )
+        tbl = frame.table
+        tbl.rows[0].height = Emu(self.header_height)
+        tbl.rows[1].height = Emu(_ROW_MARK)
+        for i, (header, width) in enumerate(zip(headers, widths)):
+            tbl.columns[i].width = width
+            for cell in (tbl.cell(0, i), tbl.cell(1, i)):
+                cell.margin_left = cell.margin_right = CELL_MARGIN_X
+                cell.margin_top = cell.margin_bottom = CELL_MARGIN_Y
+            cell = tbl.cell(0, i)
+            cell.text = header
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = v6.COLORS['dark_blue']
+            font = cell.text_frame.paragraphs[0].runs[0].font
+            font.bold = True
+            font.size = Pt(HEADER_FONT_SIZE)
+            font.color.rgb = v6.COLORS['white']
+            cell = tbl.cell(1, i)
+            cell.text = f"@@CELL{i}@@"
+            font = cell.text_frame.paragraphs[0].runs[0].font
+            font.size = Pt(self.font_size)
+            font.color.rgb = v6.COLORS['dark_gray']
+        frame.height = Emu(_FRAME_MARK)
+        fast_shapes.add_sp(
+            slide, Inches(TABLE_LEFT), prs.slide_height - Inches(0.35), Inches(TABLE_WIDTH), Inches(0.3),
+            textbox=True, text="@@RANGE@@", font_size=9, color=v6.COLORS['dark_gray'], align='right',
+        )
+        deck_engine.stamp_slide_id(slide, "@@ID@@")
+
+        xml = slide.part.blob.decode("utf-8")
+        self.rels_xml = slide.part.rels.xml
+        xml = xml.replace(f'cy="{_FRAME_MARK}"', 'cy="@@FRAME@@"')
+        row = re.search(rf'<a:tr h="{_ROW_MARK}">.*?</a:tr>', xml, re.S)
+        self.head = _split(xml[:row.start()])
+        self.row = _split(row.group(0).replace(f'h="{_ROW_MARK}"', 'h="@@HEIGHT@@"'))
+        self.tail = _split(xml[row.end():])
+        self.available = self.slide_height - Inches(TABLE_TOP) - Inches(BOTTOM_MARGIN) - self.header_height
+
+    def fit_row(self, cells):
+        """截断过长单元格，返回 (单元格, 行高EMU)"""
+        fitted = [fit_cell(text, width, self.font_size, self.max_lines) for text, width in zip(cells, self.widths)]
+        lines = max(n for _, n in fitted)
+        return [text for text, _ in fitted], row_height(lines, self.font_size)
+
+    def render(self, slide_id, title, caption, rows):
+        """rows为 [(单元格, 行高)] -> 幻灯片XML字节"""
+        body = []
+        for cells, height in rows:
+            values = {f"CELL{i}": escape(text) for i, text in enumerate(cells)}
+            values["HEIGHT"] = str(height)
+            body.append(_fill(self.row, values))
+        values = {
+            "TITLE": escape(title), "RANGE": escape(caption), "ID": escape(slide_id, {'"': "&quot;"}),
+            "FRAME": str(self.header_height + sum(height for _, height in rows)),
+        }
+        return (_fill(self.head, values) + "".join(body) + _fill(self.tail, values)).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# 分页
+# ---------------------------------------------------------------------------
+
+def paginate(template, rows):
+    """按累计行高分页，逐页产出 [(单元格, 行高)]"""
+    page = []
+    used = 0
+    for cells in rows:
+        cells, height = template.fit_row(cells)
+        if page and used + height > template.available:
+            yield page
+            page = []
+            used = 0
+        page.append((cells, height))
+        used += height
+    if page:
+        yield page
+
+
+def table_pages(spec, table, data_dir):
+    """一张表的全部页面：(稳定ID, 幻灯片XML, 关系XML)；CSV不存在时不产出"""
+    path = os.path.join(data_dir, *table["ref"].split("/"))
+    if not os.path.exists(path):
+        print(f"警告：附录表 {table['id']} 的结果 {table['ref']} 不存在，已跳过", file=sys.stderr)
+        return
+    labels = spec.get("labels", {})
+    continued = labels.get("continued", "（续）")
+    rows_label = labels.get("rows", "第 {first}–{last} 行")
+    template = PageTemplate(spec, table)
+    first = 1
+    for n, page in enumerate(paginate(template, iter_rows(path, table["columns"], table.get("where"))), 1):
+        title = table["title"] if n == 1 else f"{table['title']}{continued}"
+        caption = rows_label.format(first=first, last=first + len(page) - 1)
+        slide_id = f"appendix-{table['id']}-{n}"
+        yield slide_id, template.render(slide_id, title, caption, page), template.rels_xml
+        first += len(page)
+
+
+# ---------------------------------------------------------------------------
+# 流式写出
+# ---------------------------------------------------------------------------
+
+class _HashingFile:
+    """写入时同时计算SHA256，用于判断输出是否与已有文件相同"""
+
+    def __init__(self, f):
+        self._file = f
+        self.hash = hashlib.sha256()
+
+    def write(self, data):
+        self.hash.update(data)
+        return self._file.write(data)
+
+
+def _slide_rel_ids(prs, count):
+    """为count张幻灯片分配presentation的关系ID（跳过已用的ID）"""
+    used = set(prs.part.rels)
+    ids = []
+    n = 1
+    while len(ids) < count:
+        if f"rId{n}" not in used:
+            ids.append(f"rId{n}")
+        n += 1
+    return ids
+
+
+def _register_slides(prs, data_by_name, slides):
+    """在 [Content_Types].xml、presentation.xml 及其关系中一次性登记已写出的幻灯片
+
+    逐页 relate_to / add_sldId 每次都要扫描全部已有关系，几千页时是平方复杂度；这里按页数一次拼接。
+    """
+    overrides = "".join(
+        f'<Override PartName="/{name}" ContentType="{CT.PML_SLIDE}"/>' for name, _ in slides
+    )
+    relationships = "".join(
+        f'<Relationship Id="{rId}" Type="{RT.SLIDE}" Target="{name[len("ppt/"):]}"/>' for name, rId in slides
+    )
+    return {
+        "[Content_Types].xml": data_by_name["[Content_Types].xml"].replace(
+            b"</Types>", overrides.encode("utf-8") + b"</Types>"),
+        "ppt/_rels/presentation.xml.rels": data_by_name["ppt/_rels/presentation.xml.rels"].replace(
+            b"</Relationships>", relationships.encode("utf-8") + b"</Relationships>"),
+    }
+
+
+def write_appendix(spec, output_path, data_dir, reproducible=True, level=pptx_writer.DEFLATE_LEVEL):
+    """生成附录PPT，返回 (是否写出了新内容, 页数)"""
+    prs = deck_engine.new_presentation(spec)
+    if reproducible:
+        pptx_writer.normalize_core_properties(prs)
+    else:
+        pptx_writer.stamp_core_properties(prs)
+    # 每页只记 部件名（几十字节），幻灯片内容写出后即释放
+    names = []
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            out = _HashingFile(f)
+            writer = pptx_writer.ZipStreamWriter(out)
+            for table in spec["tables"]:
+                for _, slide_xml, rels_xml in table_pages(spec, table, data_dir):
+                    partname = PackURI(f"/ppt/slides/slide{len(names) + 1}.xml")
+                    writer.write(partname.membername, slide_xml, level=level)
+                    writer.write(partname.rels_uri.membername, rels_xml, level=level)
+                    names.append(partname.membername)
+
+            slides = list(zip(names, _slide_rel_ids(prs, len(names))))
+            sld_id_lst = prs.part._element.get_or_add_sldIdLst()
+            for slide_id, (_, rId) in enumerate(slides, 256):
+                sld_id = OxmlElement("p:sldId")
+                sld_id.set("id", str(slide_id))
+                sld_id.set(qn("r:id"), rId)
+                sld_id_lst.append(sld_id)
+            entries = list(pptx_writer.package_entries(prs))
+            registered = _register_slides(prs, {name: data for name, data, _ in entries}, slides)
+            for name, data, stored in entries:
+                writer.write(name, registered.get(name, data), stored, level)
+            writer.close()
+        if reproducible and pptx_writer.file_digest(output_path) == out.hash.hexdigest():
+            return False, len(names)
+        os.replace(tmp_path, output_path)
+        return True, len(names)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="把大结果表分页生成附录PPT")
+    parser.add_argument("-l", "--langs", nargs="+", default=list(LANGS), choices=LANGS, help="要构建的语言")
+    parser.add_argument("--base-dir", default=BASE_DIR, help="项目根目录（含 analyses/ 与 PPT/）")
+    parser.add_argument("--date", default=MEETING_DATE, help="汇报日期 YYYYMMDD，输出到 PPT/<date>/")
+    parser.add_argument("--spec", help="描述文件（默认 decks/appendix_<语言>.json）")
+    parser.add_argument("--force", action="store_true", help="总是重写输出")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    data_dir = os.path.join(args.base_dir, "analyses", "data")
+    output_dir = os.path.join(args.base_dir, "PPT", args.date)
+    os.makedirs(output_dir, exist_ok=True)
+    for lang in args.langs:
+        spec = deck_engine.load_spec(args.spec or deck_engine.spec_path("appendix", lang))
+        output_path = os.path.join(output_dir, OUTPUT_NAMES[lang])
+        start = time.perf_counter()
+        changed, pages = write_appendix(spec, output_path, data_dir, reproducible=not args.force)
+        status = "已更新" if changed else "未变化"
+        print(f"{OUTPUT_NAMES[lang]}：{pages} 页，{time.perf_counter() - start:.2f}s，{status}")
+
+
+if __name__ == "__main__":
+    main()
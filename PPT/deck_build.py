@@ -0,0 +1,169 @@
+"""
+PC047组会PPT批量构建
+每个任务放入进程池并行生成，并记录每份PPT的耗时
+描述文件生成的版本各语言合为一个任务：版式只排一次，各语言只替换文字（见 deck_locale.py）；
+历史脚本每个 (版本, 语言) 一个任务
+
+用法：
+    python deck_build.py                      # 重建全部版本 × 中英文
+    python deck_build.py -v v6 -l cn -j 1     # 只构建v6中文版（串行）
+    python deck_build.py --changed-list changed.txt   # 把有变化的PPT路径写入文件，供下游同步使用
+
+描述文件生成的版本默认可复现构建：内容与已有文件一致时不重写，--force 则总是重写。
+历史脚本通过 prs.save 输出，总是视为有变化。
+"""
+
+import argparse
+import os
+import time
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(PPT_DIR)
+MEETING_DATE = "20260126"
+
+LANGS = ("cn", "en")
+OUTPUT_NAMES = {
+    "cn": "组会汇报_{version}.pptx",
+    "en": "GroupMeeting_{version}.pptx",
+}
+LEGACY_FUNCS = {
+    "cn": "generate_chinese_ppt",
+    "en": "generate_english_ppt",
+}
+
+# 版本 -> 构建来源："spec" 表示 decks/<版本>_<语言>.json，否则为历史脚本模块名
+# generate_ppt_v3.py / generate_ppt_v4.py 实际输出的是v4 / v5；v3没有保留脚本
+VERSIONS = {
+    "v1": "generate_ppt",
+    "v2": "generate_ppt_v2",
+    "v4": "generate_ppt_v3",
+    "v5": "generate_ppt_v4",
+    "v6": "spec",
+}
+
+
+def deck_jobs(versions, langs, output_dir, image_dir, reproducible=True):
+    """展开任务列表 (版本, 语言元组, {语言: 输出路径}, 图片目录, 是否可复现)"""
+    jobs = []
+    for version in versions:
+        if version not in VERSIONS:
+            raise ValueError(f"未知版本 {version!r}，可选：{', '.join(VERSIONS)}")
+        paths = {lang: os.path.join(output_dir, OUTPUT_NAMES[lang].format(version=version)) for lang in langs}
+        groups = [tuple(langs)] if VERSIONS[version] == "spec" else [(lang,) for lang in langs]
+        for group in groups:
+            jobs.append((version, group, {lang: paths[lang] for lang in group}, image_dir, reproducible))
+    return jobs
+
+
+def build_one(job):
+    """构建一个任务（在子进程中执行），返回每份PPT的耗时统计"""
+    version, langs, output_paths, image_dir, reproducible = job
+    start = time.perf_counter()
+
+    source = VERSIONS[version]
+    if source == "spec":
+        import deck_engine
+        specs = {lang: deck_engine.load_spec(deck_engine.spec_path(version, lang)) for lang in langs}
+        changed = deck_engine.build_decks(specs, output_paths, image_dir, reproducible=reproducible)
+    else:
+        import importlib
+        module = importlib.import_module(source)
+        for lang in langs:
+            getattr(module, LEGACY_FUNCS[lang])(output_paths[lang], image_dir)
+        changed = dict.fromkeys(langs, True)
+
+    # 各语言共用一次版式，耗时按语言均分
+    seconds = (time.perf_counter() - start) / len(langs)
+    return [
+        {
+            "version": version,
+            "lang": lang,
+            "path": output_paths[lang],
+            "seconds": seconds,
+            "bytes": os.path.getsize(output_paths[lang]),
+            "changed": changed[lang],
+        }
+        for lang in langs
+    ]
+
+
+def warm_media(jobs):
+    """在父进程预加载描述文件引用的图片，fork出的子进程直接共享这些blob"""
+    import deck_engine
+    import generate_ppt_v6 as v6
+    import media_store
+
+    for version, langs, _, image_dir, _ in jobs:
+        if VERSIONS[version] != "spec":
+            continue
+        for lang in langs:
+            spec = deck_engine.load_spec(deck_engine.spec_path(version, lang))
+            ctx = deck_engine.DeckContext(lang, image_dir)
+            for slide_spec in spec["slides"]:
+                path = ctx.resolve_image(slide_spec.get("image"))
+                if path and slide_spec["type"] in v6.IMAGE_WIDTHS:
+                    media_store.get_media(path, v6.IMAGE_WIDTHS[slide_spec["type"]])
+
+
+def build_all(jobs, max_workers=None):
+    """并行构建全部任务；max_workers=1 时在当前进程串行执行"""
+    if max_workers == 1:
+        return [r for job in jobs for r in build_one(job)]
+    # 进程池按需导入，列出版本等轻量命令不必加载multiprocessing
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if multiprocessing.get_start_method() == "fork":
+        warm_media(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return [r for results in pool.map(build_one, jobs) for r in results]
+
+
+def print_report(results, wall_seconds):
+    """打印每份PPT的耗时、大小与是否有变化"""
+    print(f"\n{'版本':<6}{'语言':<6}{'耗时(s)':>10}{'大小(KB)':>12}  {'状态':<6}文件")
+    for r in results:
+        status = "已更新" if r["changed"] else "未变化"
+        print(f"{r['version']:<6}{r['lang']:<6}{r['seconds']:>10.3f}{r['bytes'] / 1024:>12.1f}  {status:<6}{os.path.basename(r['path'])}")
+    serial = sum(r["seconds"] for r in results)
+    changed = sum(1 for r in results if r["changed"])
+    print(f"\n共 {len(results)} 份（{changed} 份有变化），总耗时 {wall_seconds:.3f}s（串行累计 {serial:.3f}s）")
+
+
+def write_changed_list(results, path):
+    """把有变化的PPT路径逐行写入path（无变化时写出空文件）"""
+    with open(path, "w", encoding="utf-8") as f:
+        for r in results:
+            if r["changed"]:
+                f.write(r["path"] + "\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="并行构建PC047组会PPT")
+    parser.add_argument("--base-dir", default=BASE_DIR, help="项目根目录（含 analyses/ 与 PPT/）")
+    parser.add_argument("--date", default=MEETING_DATE, help="汇报日期 YYYYMMDD，输出到 PPT/<date>/")
+    parser.add_argument("-v", "--versions", nargs="+", default=list(VERSIONS), help="要构建的版本")
+    parser.add_argument("-l", "--langs", nargs="+", default=list(LANGS), choices=LANGS, help="要构建的语言")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="进程数（默认CPU核数）")
+    parser.add_argument("--force", action="store_true", help="关闭可复现模式，总是重写输出")
+    parser.add_argument("--changed-list", help="把有变化的PPT路径写入该文件")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    image_dir = os.path.join(args.base_dir, "analyses", "data")
+    output_dir = os.path.join(args.base_dir, "PPT", args.date)
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = deck_jobs(args.versions, args.langs, output_dir, image_dir, reproducible=not args.force)
+    start = time.perf_counter()
+    results = build_all(jobs, args.jobs)
+    print_report(results, time.perf_counter() - start)
+    if args.changed_list:
+        write_changed_list(results, args.changed_list)
+    return results
+
+
+if __name__ == "__main__":
+    main()
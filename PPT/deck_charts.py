@@ -0,0 +1,253 @@
+"""
+PC047组会PPT原生图表
+模块度对比、成对PERMANOVA的 −log10(P)、Driver物种更替等柱状图原来在R中画好、存成300dpi PNG再贴进PPT。
+这里直接从 analyses/data 下的结果CSV生成python-pptx原生图表：
+- bar / stacked_bar：柱状图、堆叠柱状图（horizontal 为条形图）
+- scatter：散点图（如PCoA坐标，按分组列分系列）
+原生图表只有几KB的XML与内嵌数据表，在PowerPoint中可直接编辑，结果更新后不必经过R重新出图。
+
+描述文件中的用法（content页的 chart，或 boxes页的 charts 列表，后者需给出 left/top/width/height）：
+    "chart": {"kind": "bar", "ref": "01_alpha_beta_diversity_analysis/46_part4_pairwise_comparisons.csv",
+              "category": "comparison", "values": ["p_value"], "transform": "neg_log10", "horizontal": true}
+- category：分类列；或给 series（系列名所在列），此时 values 中的各列为分类，同名系列合并求和
+- rows / limit：只取这些分类（按给定顺序）/ 取合计最大的前n项
+- labels：列名 -> 显示名；title / value_title / category_title：图表与坐标轴标题
+- scatter 用 x、y、group 三列
+CSV不存在时退回到原来的图片。
+"""
+
+import math
+import os
+
+from pptx.chart.data import CategoryChartData, XyChartData
+from pptx.chart.xlsx import CategoryWorkbookWriter, XyWorkbookWriter
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_MARKER_STYLE
+from pptx.util import Inches, Pt
+
+import generate_ppt_v6 as v6
+import pptx_writer
+import results_store
+
+# 系列配色，按顺序取用
+SERIES_COLORS = ('primary_blue', 'orange', 'green', 'red', 'purple', 'teal', 'dark_blue', 'light_blue')
+
+FONT_SIZE = 10
+
+# 数值变换
+TRANSFORMS = {
+    "neg_log10": lambda v: -math.log10(v) if v and v > 0 else None,
+    "percent": lambda v: v * 100,
+}
+
+# 图表类型 -> builder(slide, chart_spec, rows, left, top, width, height)
+CHARTS = {}
+
+
+def chart_kind(name):
+    """注册图表类型"""
+    def register(func):
+        CHARTS[name] = func
+        return func
+    return register
+
+
+class _StampedWorkbook:
+    """内嵌数据表的创建时间固定为构建时间戳（XlsxWriter默认写当前时间，会破坏可复现构建）"""
+
+    def _populate_worksheet(self, workbook, worksheet):
+        workbook.set_properties({"created": pptx_writer.reproducible_timestamp()})
+        super()._populate_worksheet(workbook, worksheet)
+
+
+class _CategoryWorkbookWriter(_StampedWorkbook, CategoryWorkbookWriter):
+    pass
+
+
+class _XyWorkbookWriter(_StampedWorkbook, XyWorkbookWriter):
+    pass
+
+
+class CategoryData(CategoryChartData):
+    @property
+    def _workbook_writer(self):
+        return _CategoryWorkbookWriter(self)
+
+
+class XyData(XyChartData):
+    @property
+    def _workbook_writer(self):
+        return _XyWorkbookWriter(self)
+
+
+def load_rows(path):
+    """CSV -> [{列名: 值}]"""
+    header, rows = results_store.read_csv_rows(path)
+    return [{col: results_store.convert(value) for col, value in zip(header, row)} for row in rows]
+
+
+def chart_refs(slide_spec):
+    """一页描述中图表引用的CSV"""
+    charts = [slide_spec["chart"]] if slide_spec.get("chart") else []
+    charts.extend(slide_spec.get("charts", []))
+    return [chart["ref"] for chart in charts]
+
+
+def _value(chart_spec, value):
+    transform = chart_spec.get("transform")
+    if value is None or not isinstance(value, (int, float)):
+        return None
+    return TRANSFORMS[transform](value) if transform else value
+
+
+def _label(chart_spec, column):
+    return chart_spec.get("labels", {}).get(column, column)
+
+
+def category_data(chart_spec, rows):
+    """按分类列或系列列组织数据"""
+    values = chart_spec["values"]
+    data = CategoryData(number_format=chart_spec.get("number_format", "General"))
+    if "series" in chart_spec:
+        # 每行是一个系列，values中的列是分类；同名系列合并求和
+        totals = {}
+        for row in rows:
+            series = totals.setdefault(str(row[chart_spec["series"]]), [0.0] * len(values))
+            for i, column in enumerate(values):
+                series[i] += _value(chart_spec, row.get(column)) or 0.0
+        names = list(totals)
+        if chart_spec.get("rows"):
+            names = [name for name in chart_spec["rows"] if name in totals]
+        elif chart_spec.get("limit"):
+            names = sorted(names, key=lambda name: -sum(totals[name]))[:chart_spec["limit"]]
+        data.categories = [_label(chart_spec, column) for column in values]
+        for name in names:
+            data.add_series(name, totals[name])
+        return data
+
+    by_category = {str(row[chart_spec["category"]]): row for row in rows}
+    names = [name for name in chart_spec["rows"] if name in by_category] if chart_spec.get("rows") else list(by_category)
+    if chart_spec.get("limit"):
+        names = sorted(names, key=lambda n: -(_value(chart_spec, by_category[n].get(values[0])) or 0))[:chart_spec["limit"]]
+    data.categories = names
+    for column in values:
+        data.add_series(_label(chart_spec, column), [_value(chart_spec, by_category[n].get(column)) for n in names])
+    return data
+
+
+def _axis_title(axis, text):
+    axis.has_title = True
+    axis.axis_title.text_frame.text = text
+    font = axis.axis_title.text_frame.paragraphs[0].runs[0].font
+    font.size = Pt(FONT_SIZE)
+    font.bold = False
+    font.color.rgb = v6.COLORS['dark_gray']
+
+
+def style_chart(chart, chart_spec, n_series):
+    """统一字体、标题、图例与系列配色"""
+    chart.font.size = Pt(FONT_SIZE)
+    chart.font.color.rgb = v6.COLORS['dark_gray']
+    if chart_spec.get("title"):
+        chart.has_title = True
+        chart.chart_title.text_frame.text = chart_spec["title"]
+        title_font = chart.chart_title.text_frame.paragraphs[0].runs[0].font
+        title_font.size = Pt(FONT_SIZE + 2)
+        title_font.bold = True
+    else:
+        chart.has_title = False
+    chart.has_legend = n_series > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    for i, series in enumerate(chart.plots[0].series):
+        color = v6.COLORS[SERIES_COLORS[i % len(SERIES_COLORS)]]
+        if chart.chart_type == XL_CHART_TYPE.XY_SCATTER:
+            series.marker.style = XL_MARKER_STYLE.CIRCLE
+            series.marker.size = 7
+            series.marker.format.fill.solid()
+            series.marker.format.fill.fore_color.rgb = color
+            series.marker.format.line.color.rgb = v6.COLORS['white']
+        else:
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = color
+
+
+def _add(slide, chart_type, data, left, top, width, height):
+    return slide.shapes.add_chart(chart_type, Inches(left), Inches(top), Inches(width), Inches(height), data).chart
+
+
+@chart_kind("bar")
+def _bar(slide, chart_spec, rows, left, top, width, height, stacked=False):
+    data = category_data(chart_spec, rows)
+    if chart_spec.get("horizontal"):
+        chart_type = XL_CHART_TYPE.BAR_STACKED if stacked else XL_CHART_TYPE.BAR_CLUSTERED
+    else:
+        chart_type = XL_CHART_TYPE.COLUMN_STACKED if stacked else XL_CHART_TYPE.COLUMN_CLUSTERED
+    chart = _add(slide, chart_type, data, left, top, width, height)
+    style_chart(chart, chart_spec, len(data))
+    plot = chart.plots[0]
+    plot.gap_width = 60
+    if stacked:
+        plot.overlap = 100
+    if chart_spec.get("data_labels"):
+        plot.has_data_labels = True
+        plot.data_labels.number_format = chart_spec.get("number_format", "0.00")
+        plot.data_labels.number_format_is_linked = False
+        plot.data_labels.font.size = Pt(FONT_SIZE - 1)
+    chart.value_axis.has_major_gridlines = False
+    chart.value_axis.tick_labels.font.size = Pt(FONT_SIZE - 1)
+    chart.category_axis.tick_labels.font.size = Pt(FONT_SIZE - 1)
+    if chart_spec.get("value_title"):
+        _axis_title(chart.value_axis, chart_spec["value_title"])
+    if chart_spec.get("category_title"):
+        _axis_title(chart.category_axis, chart_spec["category_title"])
+    return chart
+
+
+@chart_kind("stacked_bar")
+def _stacked_bar(slide, chart_spec, rows, left, top, width, height):
+    return _bar(slide, chart_spec, rows, left, top, width, height, stacked=True)
+
+
+@chart_kind("scatter")
+def _scatter(slide, chart_spec, rows, left, top, width, height):
+    data = XyData(number_format=chart_spec.get("number_format", "General"))
+    groups = {}
+    for row in rows:
+        x, y = row.get(chart_spec["x"]), row.get(chart_spec["y"])
+        if isinstance(x, (int, float)) and isinstance(y, (int, float)):
+            name = str(row[chart_spec["group"]]) if chart_spec.get("group") else _label(chart_spec, chart_spec["y"])
+            groups.setdefault(name, []).append((x, y))
+    for name, points in groups.items():
+        series = data.add_series(name)
+        for x, y in points:
+            series.add_data_point(x, y)
+    chart = _add(slide, XL_CHART_TYPE.XY_SCATTER, data, left, top, width, height)
+    style_chart(chart, chart_spec, len(groups))
+    for axis in (chart.value_axis, chart.category_axis):
+        axis.has_major_gridlines = False
+        axis.tick_labels.font.size = Pt(FONT_SIZE - 1)
+    _axis_title(chart.category_axis, chart_spec.get("x_title", _label(chart_spec, chart_spec["x"])))
+    _axis_title(chart.value_axis, chart_spec.get("y_title", _label(chart_spec, chart_spec["y"])))
+    return chart
+
+
+def add_chart(slide, chart_spec, path, left, top, width, height):
+    """从CSV生成图表并放到slide上（单位英寸），返回Chart"""
+    kind = chart_spec.get("kind", "bar")
+    if kind not in CHARTS:
+        raise ValueError(f"未知的图表类型 {kind!r}，可用：{', '.join(sorted(CHARTS))}")
+    return CHARTS[kind](slide, chart_spec, load_rows(path), left, top, width, height)
+
+
+def chart_drawer(chart_spec, ctx):
+    """content页的图表绘制函数 draw(slide, left, top, width, height)；没有图表或CSV不存在时为None"""
+    if not chart_spec:
+        return None
+    path = ctx.image_path(chart_spec["ref"])
+    if not path or not os.path.exists(path):
+        return None
+
+    def draw(slide, left, top, width, height):
+        return add_chart(slide, chart_spec, path, left, top, width, height)
+    return draw
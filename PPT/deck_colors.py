@@ -0,0 +1,20 @@
+"""
+PC047组会PPT配色方案
+generate_ppt_v6.py 的构建函数与 deck_theme.py 的主题配色共用，单独成模块以免两者互相导入
+"""
+
+from pptx.dml.color import RGBColor
+
+COLORS = {
+    'primary_blue': RGBColor(0x14, 0x65, 0xC0),
+    'dark_blue': RGBColor(0x0D, 0x47, 0xA1),
+    'green': RGBColor(0x4C, 0xAF, 0x50),
+    'dark_gray': RGBColor(0x33, 0x33, 0x33),
+    'white': RGBColor(0xFF, 0xFF, 0xFF),
+    'light_gray': RGBColor(0xF5, 0xF5, 0xF5),
+    'light_blue': RGBColor(0xBB, 0xDE, 0xFB),
+    'orange': RGBColor(0xFF, 0x98, 0x00),
+    'red': RGBColor(0xE5, 0x39, 0x35),
+    'purple': RGBColor(0x7B, 0x1F, 0xA2),
+    'teal': RGBColor(0x00, 0x96, 0x88),
+}
@@ -0,0 +1,437 @@
+"""
+PC047组会PPT结构比较
+PPT/20260126 下有v1~v6两种语言的PPT，以前要打开两份逐页对照才知道版本之间改了什么。
+这里直接读取zip中的XML（不经过python-pptx），按形状比较两份PPT：
+- 规范化：去掉形状ID与自动命名（插入形状后会整体重新编号），关系ID换成所指部件内容的SHA1，再做C14N，
+  每个形状得到一个哈希；每页的哈希由版式名、各形状哈希与备注文字组成
+- 页对齐：以两页形状哈希、形状样式（不含文字与位置）的重合比例为相似度（稳定ID即 <p:cSld name> 相同时视为同一页），
+  按序列比对（Needleman-Wunsch，空位不计分）求相似度之和最大的对应关系，得到相同/修改/新增/删除的页
+- 对应页内先按哈希配对完全相同的形状，其余按 类型 + 文字/位置/名称/样式 配对，报告新增、删除的形状
+  与修改的方面（文字、位置大小、图片/图表、样式）
+两份20页的PPT只需几毫秒。
+
+用法：
+    python PPT/deck_diff.py PPT/20260126/组会汇报_v5.pptx PPT/20260126/组会汇报_v6.pptx
+    python PPT/deck_diff.py v5 v6 -l cn en            # 按版本名比较 PPT/<date>/ 下的输出
+"""
+
+import argparse
+import hashlib
+import os
+import posixpath
+import sys
+import time
+import zipfile
+
+from lxml import etree
+
+import slide_shapes
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 两页的相似度达到该值才视为同一页被修改，否则为删除 + 新增
+MIN_SIMILARITY = 0.3
+
+_A, _P, _R = slide_shapes.A, slide_shapes.P, slide_shapes.R
+_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_REL_ATTRS = (f"{_R}embed", f"{_R}link", f"{_R}id")
+_LINKED = etree.XPath("descendant-or-self::*[@r:embed or @r:link or @r:id]", namespaces={"r": _R[1:-1]})
+_ASPECTS = {"text": "文字", "geometry": "位置大小", "media": "图片/图表", "style": "样式"}
+_TEXT_PREVIEW = 40
+
+
+class ShapeInfo:
+    """一个形状：哈希（不含ID与自动命名）与用于报告的各方面"""
+
+    __slots__ = ("name", "kind", "hash", "text", "geometry", "media", "style")
+
+    def __init__(self, name, kind, hash, text, geometry, media, style):
+        self.name = name
+        self.kind = kind
+        self.hash = hash
+        self.text = text
+        self.geometry = geometry
+        self.media = media
+        self.style = style
+
+
+class SlideInfo:
+    """一页：序号、稳定ID、版式、形状与备注"""
+
+    __slots__ = ("number", "slide_id", "title", "layout", "shapes", "notes", "hash")
+
+    def __init__(self, number, slide_id, title, layout, shapes, notes):
+        self.number = number
+        self.slide_id = slide_id
+        self.title = title
+        self.layout = layout
+        self.shapes = shapes
+        self.notes = notes
+        self.hash = hashlib.sha1(repr((layout, [s.hash for s in shapes], notes)).encode()).hexdigest()
+
+    @property
+    def label(self):
+        return self.slide_id or _preview(self.title) or self.layout
+
+
+class SlideDiff:
+    """一对对应的页（新增/删除时另一侧为None）与其中形状的变化"""
+
+    __slots__ = ("old", "new", "added", "removed", "modified", "layout", "notes")
+
+    def __init__(self, old, new):
+        self.old = old
+        self.new = new
+        self.added, self.removed, self.modified = [], [], []
+        self.layout = self.notes = False
+        if old is not None and new is not None and old.hash != new.hash:
+            self.added, self.removed, self.modified = diff_shapes(old.shapes, new.shapes)
+            self.layout = old.layout != new.layout
+            self.notes = old.notes != new.notes
+
+    @property
+    def status(self):
+        if self.old is None:
+            return "added"
+        if self.new is None:
+            return "removed"
+        return "same" if self.old.hash == self.new.hash else "modified"
+
+
+# ---------------------------------------------------------------------------
+# 读取与规范化
+# ---------------------------------------------------------------------------
+
+class _Package:
+    """按部件名读取zip中的XML与部件内容（内容SHA1按部件缓存）"""
+
+    def __init__(self, path):
+        self.zip = zipfile.ZipFile(path)
+        self._hashes = {}
+
+    def xml(self, name):
+        return etree.fromstring(self.zip.read(name))
+
+    def rels(self, name):
+        """部件的关系 {rId: (类型, 目标部件名)}；外部链接的目标保持原样"""
+        folder, base = posixpath.split(name)
+        rels_name = posixpath.join(folder, "_rels", f"{base}.rels")
+        if rels_name not in self.zip.NameToInfo:
+            return {}
+        rels = {}
+        for rel in self.xml(rels_name).iterfind(f"{_RELS_NS}Relationship"):
+            target = rel.get("Target")
+            if rel.get("TargetMode") != "External":
+                target = posixpath.normpath(posixpath.join(folder, target))
+            rels[rel.get("Id")] = (rel.get("Type").rsplit("/", 1)[-1], target)
+        return rels
+
+    def content_hash(self, name):
+        if name not in self._hashes:
+            data = self.zip.read(name) if name in self.zip.NameToInfo else name.encode()
+            self._hashes[name] = hashlib.sha1(data).hexdigest()
+        return self._hashes[name]
+
+
+def _digest(element):
+    return hashlib.sha1(etree.tostring(element, method="c14n")).hexdigest()
+
+
+def _shape_text(element):
+    """形状中的文字：段落以换行分隔；表格单元格以 " | " 分隔、行以换行分隔"""
+    tbl = element.find(f".//{_A}tbl")
+    if tbl is not None:
+        return "\n".join(
+            " | ".join("\n".join(slide_shapes.paragraph_text(p) for p in tc.iter(f"{_A}p")) for tc in tr.iterfind(f"{_A}tc"))
+            for tr in tbl.iterfind(f"{_A}tr")
+        )
+    return "\n".join(slide_shapes.paragraph_text(p) for p in element.iterfind(f"{_P}txBody/{_A}p"))
+
+
+def _kind(element):
+    """形状类型：预设形状名 / 占位符类型 / 图片 / 表格 / 图表 / 组合 / 连线"""
+    keys = slide_shapes.placeholder_keys(element) if element.tag == slide_shapes.SP else None
+    if keys:
+        return f"占位符:{keys[0]}"
+    prst = element.find(f"{_P}spPr/{_A}prstGeom")
+    if element.tag == slide_shapes.GRAPHIC_FRAME:
+        return "表格" if element.find(f".//{_A}tbl") is not None else "图表"
+    return {
+        slide_shapes.PIC: "图片",
+        slide_shapes.GRP_SP: "组合",
+        slide_shapes.CXN_SP: f"连线:{prst.get('prst') if prst is not None else 'line'}",
+    }.get(element.tag, prst.get("prst") if prst is not None else "custom")
+
+
+def shape_info(element, rels, package):
+    """规范化一个形状：去掉ID与自动命名，关系ID换成所指部件内容的SHA1（直接修改 element，调用方不再使用它）"""
+    name, kind, text, geometry = slide_shapes.shape_name(element)[1], _kind(element), _shape_text(element), slide_shapes.geometry(element)
+    c_nv_pr = next(element.iter(f"{_P}cNvPr"))
+    c_nv_pr.attrib.pop("id", None)
+    c_nv_pr.attrib.pop("name", None)
+    media = []
+    linked = _LINKED(element)
+    for node in linked:
+        for attr in _REL_ATTRS:
+            rid = node.get(attr)
+            if rid in rels:
+                content = package.content_hash(rels[rid][1])
+                node.set(attr, content)
+                media.append((posixpath.basename(rels[rid][1]), content))
+    shape_hash = _digest(element)
+    # 样式哈希：再去掉坐标、文字与关系
+    xfrm = element.find(slide_shapes.XFRM_PATHS[element.tag])
+    if xfrm is not None:
+        xfrm.getparent().remove(xfrm)
+    for node in element.iter(f"{_A}t"):
+        node.text = ""
+    for node in linked:
+        for attr in _REL_ATTRS:
+            node.attrib.pop(attr, None)
+    return ShapeInfo(name, kind, shape_hash, text, geometry, tuple(media), _digest(element))
+
+
+def _notes_text(package, rels):
+    notes = next((target for kind, target in rels.values() if kind == "notesSlide"), None)
+    if notes is None:
+        return ""
+    tree = package.xml(notes).find(f"{_P}cSld/{_P}spTree")
+    return "\n".join(
+        _shape_text(sp) for sp in tree.iterfind(f"{_P}sp")
+        if (slide_shapes.placeholder_keys(sp) or ("",))[0] == "body"
+    )
+
+
+def read_deck(path):
+    """读取一份PPT的每页形状，返回 [SlideInfo]"""
+    package = _Package(path)
+    presentation = "ppt/presentation.xml"
+    pres_rels = package.rels(presentation)
+    layouts = {}
+    slides = []
+    for number, sld_id in enumerate(package.xml(presentation).iterfind(f"{_P}sldIdLst/{_P}sldId"), 1):
+        part = pres_rels[sld_id.get(f"{_R}id")][1]
+        root = package.xml(part)
+        rels = package.rels(part)
+        layout_part = next((target for kind, target in rels.values() if kind == "slideLayout"), None)
+        if layout_part and layout_part not in layouts:
+            layouts[layout_part] = package.xml(layout_part).find(f"{_P}cSld").get("name", "")
+        c_sld = root.find(f"{_P}cSld")
+        shapes = [
+            shape_info(element, rels, package)
+            for element in c_sld.find(f"{_P}spTree") if element.tag in slide_shapes.XFRM_PATHS
+        ]
+        # 标题：标题占位符，没有时（历史脚本用文本框写标题）取第一段文字
+        title = next((s.text for s in shapes if s.kind in ("占位符:title", "占位符:ctrTitle")), "") or next(
+            (s.text for s in shapes if s.text.strip()), "")
+        slides.append(SlideInfo(number, c_sld.get("name"), title, layouts.get(layout_part, ""), shapes, _notes_text(package, rels)))
+    return slides
+
+
+# ---------------------------------------------------------------------------
+# 对齐与比较
+# ---------------------------------------------------------------------------
+
+def _jaccard(old_keys, new_keys):
+    """两个多重集合的Jaccard系数"""
+    counts = {}
+    for key in old_keys:
+        counts[key] = counts.get(key, 0) + 1
+    common = 0
+    for key in new_keys:
+        if counts.get(key):
+            counts[key] -= 1
+            common += 1
+    total = len(old_keys) + len(new_keys) - common
+    return common / total if total else 1.0
+
+
+def similarity(old, new):
+    """两页的相似度：形状哈希与形状样式（不含文字与位置）重合比例的平均；稳定ID相同时为1"""
+    if old.hash == new.hash or (old.slide_id and old.slide_id == new.slide_id):
+        return 1.0
+    return (
+        _jaccard([s.hash for s in old.shapes], [s.hash for s in new.shapes])
+        + _jaccard([s.style for s in old.shapes], [s.style for s in new.shapes])
+    ) / 2
+
+
+def align(old_slides, new_slides):
+    """序列比对：相似度不低于 MIN_SIMILARITY 的页才能对应，空位不计分，求相似度之和最大；
+    返回按顺序的 [(旧页或None, 新页或None)]。首尾哈希相同的页直接对应，只比对中间部分"""
+    head = 0
+    while head < min(len(old_slides), len(new_slides)) and old_slides[head].hash == new_slides[head].hash:
+        head += 1
+    tail = 0
+    while (tail < min(len(old_slides), len(new_slides)) - head
+           and old_slides[-1 - tail].hash == new_slides[-1 - tail].hash):
+        tail += 1
+    old = old_slides[head:len(old_slides) - tail]
+    new = new_slides[head:len(new_slides) - tail]
+    n, m = len(old), len(new)
+    sim = [[similarity(a, b) for b in new] for a in old]
+    score = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            best = max(score[i - 1][j], score[i][j - 1])
+            if sim[i - 1][j - 1] >= MIN_SIMILARITY:
+                best = max(best, score[i - 1][j - 1] + sim[i - 1][j - 1])
+            score[i][j] = best
+    pairs, i, j = [], n, m
+    while i or j:
+        if i and j and sim[i - 1][j - 1] >= MIN_SIMILARITY and score[i][j] == score[i - 1][j - 1] + sim[i - 1][j - 1]:
+            pairs.append((old[i - 1], new[j - 1]))
+            i, j = i - 1, j - 1
+        elif i and (not j or score[i][j] == score[i - 1][j]):
+            pairs.append((old[i - 1], None))
+            i -= 1
+        else:
+            pairs.append((None, new[j - 1]))
+            j -= 1
+    matched = list(zip(old_slides[:head], new_slides[:head]))
+    return matched + pairs[::-1] + list(zip(old_slides[len(old_slides) - tail:], new_slides[len(new_slides) - tail:]))
+
+
+def _pair_score(old, new):
+    """未完全相同的两个形状的配对分：类型须相同；文字、位置相同各2分，名称、样式、媒体相同各1分；低于2不配对"""
+    if old.kind != new.kind:
+        return 0
+    return (
+        2 * (old.text == new.text and bool(old.text)) + 2 * (old.geometry == new.geometry)
+        + (old.name == new.name) + (old.style == new.style) + (old.media == new.media and bool(old.media))
+    )
+
+
+def diff_shapes(old_shapes, new_shapes):
+    """对应页内的形状变化：(新增, 删除, [(旧, 新, [变化的方面])])"""
+    unmatched = {}
+    for shape in old_shapes:
+        unmatched.setdefault(shape.hash, []).append(shape)
+    rest_new = []
+    for shape in new_shapes:
+        if unmatched.get(shape.hash):
+            unmatched[shape.hash].pop(0)
+        else:
+            rest_new.append(shape)
+    remaining = {id(shape) for group in unmatched.values() for shape in group}
+    rest_old = [shape for shape in old_shapes if id(shape) in remaining]
+    modified, added = [], []
+    for new in rest_new:
+        scored = [(_pair_score(old, new), -k, old) for k, old in enumerate(rest_old)]
+        best = max(scored, default=None, key=lambda item: item[:2])
+        if best is None or best[0] < 2:
+            added.append(new)
+            continue
+        old = best[2]
+        rest_old.remove(old)
+        aspects = [key for key in ("text", "geometry", "media", "style") if getattr(old, key) != getattr(new, key)]
+        modified.append((old, new, aspects))
+    return added, rest_old, modified
+
+
+def diff_decks(old_path, new_path):
+    """比较两份PPT，返回 [SlideDiff]（按对齐后的顺序）"""
+    return [SlideDiff(old, new) for old, new in align(read_deck(old_path), read_deck(new_path))]
+
+
+# ---------------------------------------------------------------------------
+# 报告
+# ---------------------------------------------------------------------------
+
+def _preview(text):
+    text = " ".join(text.split())
+    return text if len(text) <= _TEXT_PREVIEW else f"{text[:_TEXT_PREVIEW - 1]}…"
+
+
+def _describe(old, new, aspects):
+    details = []
+    for aspect in aspects:
+        if aspect == "text":
+            details.append(f"文字「{_preview(old.text)}」->「{_preview(new.text)}」")
+        elif aspect == "media":
+            details.append(f"{_ASPECTS[aspect]} {', '.join(h[:8] for _, h in old.media) or '无'} -> {', '.join(h[:8] for _, h in new.media) or '无'}")
+        else:
+            details.append(_ASPECTS[aspect])
+    return "；".join(details)
+
+
+def print_report(old_path, new_path, diffs, seconds=None, file=sys.stdout):
+    """打印每页的状态与形状变化，返回是否有差异"""
+    counts = {}
+    for d in diffs:
+        counts[d.status] = counts.get(d.status, 0) + 1
+    old_count = sum(d.old is not None for d in diffs)
+    new_count = sum(d.new is not None for d in diffs)
+    timing = f"（{seconds * 1000:.1f} ms）" if seconds is not None else ""
+    print(
+        f"{os.path.basename(old_path)} -> {os.path.basename(new_path)}：{old_count} -> {new_count} 页，"
+        f"相同 {counts.get('same', 0)}，修改 {counts.get('modified', 0)}，"
+        f"新增 {counts.get('added', 0)}，删除 {counts.get('removed', 0)}{timing}",
+        file=file,
+    )
+    for d in diffs:
+        if d.status == "added":
+            print(f"+ 第{d.new.number}页 {d.new.label}（{len(d.new.shapes)} 个形状）", file=file)
+        elif d.status == "removed":
+            print(f"- 第{d.old.number}页 {d.old.label}（{len(d.old.shapes)} 个形状）", file=file)
+        elif d.status == "modified":
+            print(f"~ 第{d.old.number}页 -> 第{d.new.number}页 {d.new.label}", file=file)
+            if d.layout:
+                print(f"    版式 {d.old.layout} -> {d.new.layout}", file=file)
+            if d.notes:
+                print(f"    备注「{_preview(d.old.notes)}」->「{_preview(d.new.notes)}」", file=file)
+            for old, new, aspects in d.modified:
+                print(f"    ~ {new.name}（{new.kind}）{_describe(old, new, aspects)}", file=file)
+            for shape in d.added:
+                print(f"    + {shape.name}（{shape.kind}）{_preview(shape.text)}", file=file)
+            for shape in d.removed:
+                print(f"    - {shape.name}（{shape.kind}）{_preview(shape.text)}", file=file)
+    return any(d.status != "same" for d in diffs)
+
+
+# ---------------------------------------------------------------------------
+# 命令行
+# ---------------------------------------------------------------------------
+
+def parse_args(argv=None):
+    import deck_build
+
+    parser = argparse.ArgumentParser(description="按形状比较两份PPT（页对齐后报告新增、删除、修改的形状、文字与媒体）")
+    parser.add_argument("old", help="旧PPT路径，或版本名（如 v5，对应 PPT/<date>/ 下的输出）")
+    parser.add_argument("new", help="新PPT路径，或版本名")
+    parser.add_argument("--base-dir", default=deck_build.BASE_DIR, help="项目根目录（含 analyses/ 与 PPT/）")
+    parser.add_argument("--date", default=deck_build.MEETING_DATE, help="汇报日期 YYYYMMDD")
+    parser.add_argument("-l", "--langs", nargs="+", default=list(deck_build.LANGS), choices=deck_build.LANGS,
+                        help="按版本名比较时的语言")
+    return parser.parse_args(argv)
+
+
+def _deck_paths(args, name):
+    """版本名按语言展开为 PPT/<date>/ 下的输出路径；其它视为PPT路径"""
+    import deck_build
+
+    if name in deck_build.VERSIONS and not os.path.exists(name):
+        output_dir = os.path.join(args.base_dir, "PPT", args.date)
+        return [os.path.join(output_dir, deck_build.OUTPUT_NAMES[lang].format(version=name)) for lang in args.langs]
+    return [name]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    old_paths, new_paths = _deck_paths(args, args.old), _deck_paths(args, args.new)
+    if len(old_paths) != len(new_paths):
+        # 一侧为版本名、一侧为路径：路径与每种语言的版本输出比较
+        old_paths, new_paths = old_paths * len(new_paths), new_paths * len(old_paths)
+    changed = False
+    for old_path, new_path in zip(old_paths, new_paths):
+        missing = [p for p in (old_path, new_path) if not os.path.exists(p)]
+        if missing:
+            raise SystemExit(f"找不到 {', '.join(missing)}")
+        start = time.perf_counter()
+        diffs = diff_decks(old_path, new_path)
+        changed |= print_report(old_path, new_path, diffs, time.perf_counter() - start)
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+PC047组会PPT引擎
+把声明式的幻灯片描述（JSON/YAML）编译为Presentation
+- 幻灯片组件复用 generate_ppt_v6.py 中的构建函数
+- 图片以相对 analyses/data 的路径或 @标签 引用（见 figure_catalog.py）
+- 新版本只需新增 decks/*.json，不再复制整份脚本
+- 结果页可用 chart 从结果CSV直接生成原生图表（见 deck_charts.py）
+- 文本中的 {{名称}} 按描述的 bindings 从分析结果CSV取值（见 results_store.py）
+- 同一版本的多种语言只排一次版式，再按语言替换文字（见 deck_locale.py）
+"""
+
+import json
+import os
+import sys
+
+from pptx import Presentation
+from pptx.util import Inches
+
+import deck_charts
+import deck_lint
+import deck_locale
+import deck_theme
+import generate_ppt_v6 as v6
+import pptx_writer
+import results_store
+import slide_cache
+
+DECK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "decks")
+
+# 组件注册表：slide type -> builder(prs, slide_spec, ctx)
+COMPONENTS = {}
+
+
+def component(name):
+    """注册幻灯片组件"""
+    def register(func):
+        COMPONENTS[name] = func
+        return func
+    return register
+
+
+class DeckContext:
+    """单次构建的上下文（语言、图片目录）"""
+
+    def __init__(self, lang, image_dir):
+        self.lang = lang
+        self.image_dir = image_dir
+        self._catalog = None
+
+    @property
+    def catalog(self):
+        """analyses目录的图片索引（首次用到时增量扫描）"""
+        if self._catalog is None:
+            import figure_catalog
+            self._catalog = figure_catalog.open_catalog(os.path.dirname(os.path.abspath(self.image_dir or ".")))
+        return self._catalog
+
+    def image_path(self, ref):
+        """图片引用 -> 路径（不检查是否存在）；@标签 在图片索引中查找，找不到时为None"""
+        if ref.startswith("@"):
+            return self.catalog.path(ref)
+        return ref if os.path.isabs(ref) else os.path.join(self.image_dir or "", *ref.split("/"))
+
+    def resolve_image(self, ref):
+        """图片引用 -> 路径；路径失效时按文件名标签查找移动后的图片，仍找不到时警告并返回None"""
+        if not ref:
+            return None
+        path = self.image_path(ref)
+        if path and os.path.exists(path):
+            return path
+        if not ref.startswith("@"):
+            import figure_catalog
+            path = self.catalog.path(figure_catalog.figure_label(ref))
+            if path:
+                print(f"图片 {ref} 已移动，使用 {path}", file=sys.stderr)
+                return path
+        print(f"警告：找不到图片 {ref}，该页不放图", file=sys.stderr)
+        return None
+
+
+def load_spec(path):
+    """读取幻灯片描述文件（.json，或安装了PyYAML时的.yaml/.yml）"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def spec_path(version, lang):
+    """decks目录下某版本某语言的描述文件路径"""
+    return os.path.join(DECK_DIR, f"{version}_{lang}.json")
+
+
+def new_presentation(spec):
+    """按描述中的页面尺寸创建Presentation，并按COLORS生成主题与标题版式"""
+    prs = Presentation()
+    width, height = spec.get("slide_size", (10, 5.625))
+    prs.slide_width = Inches(width)
+    prs.slide_height = Inches(height)
+    deck_theme.apply_theme(prs)
+    return prs
+
+
+def build_presentation(spec, image_dir, lint=True):
+    """把描述编译为Presentation对象；lint时检查出界、重叠与溢出的形状并打印警告（见 deck_lint.py）"""
+    spec = results_store.bind_spec(spec, image_dir)
+    ctx = DeckContext(spec.get("lang", "cn"), image_dir)
+    prs = new_presentation(spec)
+    for idx, (slide_spec, slide_id) in enumerate(zip(spec["slides"], slide_ids(spec)), 1):
+        stamp_slide_id(add_slide(prs, slide_spec, ctx, idx), slide_id)
+    apply_page_numbers(prs, spec)
+    if lint:
+        deck_lint.report(prs)
+    return prs
+
+
+def slide_ids(spec):
+    """每页的稳定ID：描述中的 id，否则为类型名（同类型多页时加序号，如 boxes-2）"""
+    counts = {}
+    for slide_spec in spec["slides"]:
+        counts[slide_spec["type"]] = counts.get(slide_spec["type"], 0) + 1
+    ids, seen = [], {}
+    for slide_spec in spec["slides"]:
+        slide_type = slide_spec["type"]
+        seen[slide_type] = seen.get(slide_type, 0) + 1
+        slide_id = slide_spec.get("id") or (slide_type if counts[slide_type] == 1 else f"{slide_type}-{seen[slide_type]}")
+        if slide_id in ids:
+            raise ValueError(f"幻灯片ID重复：{slide_id!r}")
+        ids.append(slide_id)
+    return ids
+
+
+def stamp_slide_id(slide, slide_id):
+    """把稳定ID写入 <p:cSld name>（PowerPoint中可见于选择窗格，增量更新时据此识别页面）"""
+    slide._element.cSld.set("name", slide_id)
+    return slide
+
+
+def add_slide(prs, slide_spec, ctx, idx=None):
+    """按组件类型添加一页，返回slide"""
+    slide_type = slide_spec["type"]
+    if slide_type not in COMPONENTS:
+        raise ValueError(f"第{idx}页：未知的幻灯片类型 {slide_type!r}")
+    COMPONENTS[slide_type](prs, slide_spec, ctx)
+    return prs.slides[-1]
+
+
+def apply_page_numbers(prs, spec):
+    """按描述中的 page_numbers 设置添加页码"""
+    page_numbers = spec.get("page_numbers")
+    if page_numbers is not None:
+        v6.add_page_numbers_to_presentation(
+            prs,
+            skip_first=page_numbers.get("skip_first", False),
+            skip_last=page_numbers.get("skip_last", False),
+        )
+
+
+def slide_image_refs(slide_spec):
+    """一页描述中引用的全部图片"""
+    refs = [slide_spec["image"]] if slide_spec.get("image") else []
+    refs.extend(image["ref"] for image in slide_spec.get("images", []))
+    return refs
+
+
+def build_deck(spec, output_path, image_dir, parallel=False, reproducible=True):
+    """编译并流式写出（媒体原样存储，XML可并行压缩），返回文件是否有变化
+
+    可复现模式下内容与已有文件一致时不重写
+    """
+    prs = build_presentation(spec, image_dir)
+    return pptx_writer.save(prs, output_path, parallel=parallel, reproducible=reproducible)
+
+
+def build_decks(specs, output_paths, image_dir, parallel=False, reproducible=True):
+    """同一版本的多种语言：版式只编译一次，打包后按语言替换文字并写出，返回 {语言: 文件是否有变化}
+
+    specs / output_paths 以语言为键；各语言描述的结构不一致时退回逐语言构建
+    """
+    if len(specs) < 2:
+        return {lang: build_deck(spec, output_paths[lang], image_dir, parallel, reproducible) for lang, spec in specs.items()}
+    try:
+        deck_locale.layout_catalog()
+        bound = {lang: results_store.bind_spec(spec, image_dir) for lang, spec in specs.items()}
+        layout, texts = deck_locale.merge_specs(bound)
+        deck_locale.begin_layout(specs, texts)
+        # 文字适配后各语言字号不同时同样不能共用版式
+        prs = build_presentation(layout, image_dir)
+    except deck_locale.LocaleMismatch as e:
+        print(f"各语言无法共用版式（{e}），逐语言构建", file=sys.stderr)
+        return {lang: build_deck(spec, output_paths[lang], image_dir, parallel, reproducible) for lang, spec in specs.items()}
+
+    if reproducible:
+        pptx_writer.normalize_core_properties(prs)
+    else:
+        pptx_writer.stamp_core_properties(prs)
+    entries = list(pptx_writer.package_entries(prs))
+    return {
+        lang: pptx_writer.save_entries(
+            deck_locale.localize_entries(entries, lang, texts), output_paths[lang],
+            parallel=parallel, reproducible=reproducible,
+        )
+        for lang in specs
+    }
+
+
+# ---------------------------------------------------------------------------
+# 组件：v6幻灯片（背景、假说、流程图为静态页，走片段缓存）
+# 各页的 results 为该页文字引用的统计结果（如 {"beta_p": "{{beta_p}}"}），绑定后为数值
+# ---------------------------------------------------------------------------
+
+@component("title")
+def _title(prs, s, ctx):
+    return v6.add_title_slide(prs, s["title"], s["subtitle"], s["date"], s["presenter"])
+
+
+@component("background_1")
+def _background_1(prs, s, ctx):
+    return slide_cache.add_cached_slide(prs, v6.add_background_slide_1, ctx.lang)
+
+
+@component("background_2")
+def _background_2(prs, s, ctx):
+    return slide_cache.add_cached_slide(prs, v6.add_background_slide_2, ctx.lang, s.get("results"))
+
+
+@component("hypothesis")
+def _hypothesis(prs, s, ctx):
+    return slide_cache.add_cached_slide(prs, v6.add_hypothesis_slide, ctx.lang, s.get("results"))
+
+
+@component("analysis_pipeline")
+def _analysis_pipeline(prs, s, ctx):
+    return slide_cache.add_cached_slide(prs, v6.add_analysis_pipeline_slide, ctx.lang, s.get("results"))
+
+
+@component("content")
+def _content(prs, s, ctx):
+    # 结果CSV存在时画原生图表，否则使用图片
+    chart = deck_charts.chart_drawer(s.get("chart"), ctx)
+    return v6.add_content_slide(
+        prs, s["title"], s["bullets"], notes=s.get("notes", ""),
+        image_path=None if chart else ctx.resolve_image(s.get("image")), chart=chart,
+    )
+
+
+@component("bacteria_vs_virus")
+def _bacteria_vs_virus(prs, s, ctx):
+    return v6.add_bacteria_vs_virus_slide(prs, ctx.lang, results=s.get("results"))
+
+
+@component("functional_redundancy")
+def _functional_redundancy(prs, s, ctx):
+    chart = deck_charts.chart_drawer(s.get("chart"), ctx)
+    return v6.add_functional_redundancy_slide(
+        prs, ctx.lang, image_path=None if chart else ctx.resolve_image(s.get("image")), chart=chart,
+        results=s.get("results"),
+    )
+
+
+@component("network_analysis")
+def _network_analysis(prs, s, ctx):
+    return v6.add_network_analysis_slide(prs, ctx.lang, stats=s.get("stats"))
+
+
+@component("phage_coordination")
+def _phage_coordination(prs, s, ctx):
+    return v6.add_phage_coordination_slide(
+        prs, ctx.lang, image_path=ctx.resolve_image(s.get("image")), results=s.get("results"),
+    )
+
+
+@component("conclusion")
+def _conclusion(prs, s, ctx):
+    items = [tuple(item) for item in s["items"]]
+    return v6.add_conclusion_slide(prs, s["title"], items, notes=s.get("notes", ""))
+
+
+@component("thanks")
+def _thanks(prs, s, ctx):
+    return v6.add_thanks_slide(prs, s["text"], s.get("subtext", ""))
+
+
+@component("boxes")
+def _boxes(prs, s, ctx):
+    """通用页：标题栏 + 方框 + 图片 + 图表 + 备注，坐标单位为英寸"""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    if s.get("title"):
+        v6.add_header(slide, prs, s["title"])
+
+    for box in s.get("boxes", []):
+        v6.add_box_with_text(
+            slide, box["left"], box["top"], box["width"], box["height"], box["text"],
+            v6.COLORS[box.get("fill", "light_gray")],
+            v6.COLORS[box["text_color"]] if box.get("text_color") else None,
+            font_size=box.get("font_size", 14), bold=box.get("bold", False),
+        )
+
+    for image in s.get("images", []):
+        path = ctx.resolve_image(image["ref"])
+        if path:
+            v6.add_picture(slide, path, image["left"], image["top"], image["width"], image.get("max_height"))
+
+    for chart in s.get("charts", []):
+        draw = deck_charts.chart_drawer(chart, ctx)
+        if draw:
+            draw(slide, chart["left"], chart["top"], chart["width"], chart["height"])
+        else:
+            print(f"警告：找不到图表数据 {chart['ref']}，该图表跳过", file=sys.stderr)
+
+    if s.get("notes"):
+        slide.notes_slide.notes_text_frame.text = s["notes"]
+    return slide
@@ -0,0 +1,270 @@
+"""
+PC047组会PPT版式检查
+v6构建函数在10×5.625英寸的画布上用手写的 Inches() 坐标放置几百个形状，重叠、出界的方框以前要打开PPT才看得到。
+这里检查构建好的Presentation（每次构建后自动运行，也可单独检查已有的.pptx）：
+- 出界：形状（含自动调整大小的文本框按估算文字撑开后的范围）超出页面
+- 重叠：两个形状部分重叠；一个完全包含另一个视为有意的叠放（方框上的文字、标题栏上的标题），连线不参与
+- 文字溢出：固定大小的方框中，按 text_fit.py 估算的文字高度超过方框
+版式上的非占位符形状（如标题栏）也参与重叠检查；位置继承自母版的页码占位符不参与。
+重叠检查按x方向扫描：形状按左边排序，活动集合按右边放在最小堆中，扫描线越过右边即出堆，
+新形状与活动集合中的每个形状比较y方向。复杂度为 O(n log n + m)，m为x方向相交的形状对数，
+最坏情况（如上下排成一列的等宽方框）仍是 O(n²)。每页只有几十个形状，100页的PPT也只需几十毫秒。
+
+用法：
+    python PPT/deck_lint.py                                     # 在内存中构建v6中英文版并检查
+    python PPT/deck_lint.py PPT/20260126/组会汇报_v6.pptx       # 检查已有PPT
+"""
+
+import argparse
+import heapq
+import os
+import sys
+
+from pptx.util import Emu, Inches
+
+import deck_locale
+import slide_shapes
+import text_fit
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 小于该距离（英寸）的出界/重叠/溢出视为贴边或估算误差，不报告
+TOLERANCE = 0.05
+# 没有写字号时的默认字号（PowerPoint默认18pt）
+DEFAULT_FONT_SIZE = 18
+
+_TOL = Inches(TOLERANCE)
+_A = slide_shapes.A
+_P = slide_shapes.P
+_LABELS = {"off_canvas": "超出页面", "overlap": "形状重叠", "overflow": "文字溢出"}
+
+
+class Box:
+    """一个形状的外框（EMU）"""
+
+    __slots__ = ("slide", "shape_id", "name", "left", "top", "right", "bottom")
+
+    def __init__(self, slide, shape_id, name, left, top, right, bottom):
+        self.slide = slide
+        self.shape_id = shape_id
+        self.name = name
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def contains(self, other):
+        return (
+            self.left - _TOL <= other.left and other.right <= self.right + _TOL
+            and self.top - _TOL <= other.top and other.bottom <= self.bottom + _TOL
+        )
+
+
+class Issue:
+    """一条检查结果：kind 为 off_canvas / overlap / overflow"""
+
+    __slots__ = ("kind", "slide", "shapes", "detail")
+
+    def __init__(self, kind, slide, shapes, detail):
+        self.kind = kind
+        self.slide = slide
+        self.shapes = shapes
+        self.detail = detail
+
+    def __str__(self):
+        return f"第{self.slide}页 {_LABELS[self.kind]}：{'、'.join(self.shapes)}（{self.detail}）"
+
+
+def _inches(emu):
+    return f"{Emu(emu).inches:.2f}"
+
+
+# ---------------------------------------------------------------------------
+# 形状外框与文字范围（按 slide_shapes.py 直接读XML）
+# ---------------------------------------------------------------------------
+
+def _font(txbody):
+    """文字中第一个写明的字号与是否有加粗"""
+    props = list(txbody.iter(f"{_A}rPr", f"{_A}defRPr"))
+    size = next((int(r.get("sz")) / 100 for r in props if r.get("sz")), DEFAULT_FONT_SIZE)
+    return size, any(r.get("b") == "1" for r in props)
+
+
+def _space_before(p):
+    """段前距（磅）"""
+    spc = p.find(f"{_A}pPr/{_A}spcBef/{_A}spcPts")
+    return int(spc.get("val")) / 100 if spc is not None else 0
+
+
+def _variants(paragraphs):
+    """各语言的段落列表（版式构建时文字为占位标记，按各语言展开；普通文字只有一种）"""
+    expanded = [deck_locale.expand(p) for p in paragraphs]
+    langs = next((list(e) for e in expanded if e), [None])
+    return [[e[lang] if e else p for p, e in zip(paragraphs, expanded)] for lang in langs]
+
+
+def text_extent(txbody, width):
+    """估算文字本身的宽、高（英寸，不含内边距）；width为可用宽度（英寸），没有文字时为None
+
+    不自动换行的文字宽度取最长一行，自动换行的按可用宽度折行；多语言版式取各语言的最大值
+    """
+    ps = txbody.findall(f"{_A}p")
+    paragraphs = [slide_shapes.paragraph_text(p) for p in ps]
+    if not "".join(paragraphs).strip():
+        return None
+    size, bold = _font(txbody)
+    spacing = sum(_space_before(p) for p in ps[1:]) / 72
+    wrap = txbody.find(f"{_A}bodyPr").get("wrap") != "none"
+    widths, heights = [], []
+    for variant in _variants(paragraphs):
+        if wrap:
+            widths.append(width)
+            heights.append(text_fit.text_height(variant, width, size, bold) + spacing)
+        else:
+            lines = [line for p in variant for line in text_fit.plain_text(p).replace("\v", "\n").split("\n")]
+            widths.append(max(text_fit.text_width(line, bold) for line in lines) * size / 72)
+            heights.append(len(lines) * size * text_fit.LINE_SPACING / 72 + spacing)
+    return max(widths), max(heights)
+
+
+def shape_box(slide_no, element, geometry):
+    """形状外框；自动调整大小的文本框按文字加内边距撑开（对齐方式决定向哪边扩展），
+    并返回固定大小方框的溢出高度（英寸，与 text_fit.py 一致按文字高度与框高比较）"""
+    left, top, width, height = geometry
+    shape_id, name = slide_shapes.shape_name(element)
+    overflow = 0
+    txbody = element.find(f"{_P}txBody")
+    if txbody is not None and slide_shapes.placeholder_keys(element) is None:
+        body_pr = txbody.find(f"{_A}bodyPr")
+        insets = {key: int(body_pr.get(key, default)) for key, default in slide_shapes.DEFAULT_INSETS.items()}
+        extent = text_extent(txbody, Emu(width - insets["lIns"] - insets["rIns"]).inches)
+        if extent is not None:
+            text_w, text_h = (Inches(v) for v in extent)
+            if body_pr.find(f"{_A}spAutoFit") is not None:
+                text_w += insets["lIns"] + insets["rIns"]
+                text_h += insets["tIns"] + insets["bIns"]
+                if text_w > width:
+                    ppr = txbody.find(f"{_A}p/{_A}pPr")
+                    align = ppr.get("algn", "l") if ppr is not None else "l"
+                    left -= {"ctr": (text_w - width) // 2, "r": text_w - width}.get(align, 0)
+                    width = text_w
+                height = max(height, text_h)
+            elif text_h > height + _TOL:
+                overflow = Emu(text_h - height).inches
+    box = Box(slide_no, shape_id, name, left, top, left + width, top + height)
+    return box, overflow
+
+
+def _inherited_slide_number(element, chain):
+    """位置继承自母版的页码占位符"""
+    keys = slide_shapes.placeholder_keys(element)
+    return bool(chain) and keys is not None and keys[0] == "sldNum" and slide_shapes.geometry(element) is None
+
+
+def _boxes(slide_no, slide, layouts):
+    """一页中参与检查的形状：版式上的非占位符形状（如标题栏）+ 幻灯片上的形状
+
+    连线不参与；位置继承自母版的页码占位符也不参与（右下角的固定位置，右对齐的页码只占框的右端，
+    与伸到右下角的方框重叠是版式本身的安排）。layouts 为 slide_shapes.iter_shapes 的版式缓存
+    """
+    for element, geometry, chain in slide_shapes.iter_shapes(slide, layouts):
+        if element.tag != slide_shapes.CXN_SP and not _inherited_slide_number(element, chain):
+            yield shape_box(slide_no, element, geometry)
+
+
+# ---------------------------------------------------------------------------
+# 检查
+# ---------------------------------------------------------------------------
+
+def overlaps(boxes):
+    """按x方向扫描，产出部分重叠的形状对（只省去x方向不相交的比较）"""
+    active = []
+    for i, box in enumerate(sorted(boxes, key=lambda b: b.left)):
+        while active and active[0][0] <= box.left + _TOL:
+            heapq.heappop(active)
+        for _, _, other in active:
+            if min(box.bottom, other.bottom) - max(box.top, other.top) <= _TOL:
+                continue
+            if min(box.right, other.right) - box.left <= _TOL:
+                continue
+            if not (box.contains(other) or other.contains(box)):
+                yield other, box
+        heapq.heappush(active, (box.right, i, box))
+
+
+def lint_slide(slide_no, slide, slide_width, slide_height, layouts=None):
+    """检查一页，返回 [Issue]"""
+    issues, boxes = [], []
+    for box, overflow in _boxes(slide_no, slide, {} if layouts is None else layouts):
+        boxes.append(box)
+        if overflow:
+            issues.append(Issue("overflow", slide_no, [box.name], f"约超出 {overflow:.2f} 英寸"))
+        out = max(-box.left, -box.top, box.right - slide_width, box.bottom - slide_height)
+        if out > _TOL:
+            issues.append(Issue("off_canvas", slide_no, [box.name], f"超出 {_inches(out)} 英寸"))
+    for a, b in overlaps(boxes):
+        w = min(a.right, b.right) - max(a.left, b.left)
+        h = min(a.bottom, b.bottom) - max(a.top, b.top)
+        issues.append(Issue("overlap", slide_no, [a.name, b.name], f"{_inches(w)}×{_inches(h)} 英寸"))
+    return issues
+
+
+def lint_presentation(prs):
+    """检查整份PPT，返回 [Issue]"""
+    issues, layouts = [], {}
+    for slide_no, slide in enumerate(prs.slides, 1):
+        issues.extend(lint_slide(slide_no, slide, prs.slide_width, prs.slide_height, layouts))
+    return issues
+
+
+def report(prs, file=sys.stderr):
+    """构建后调用：有问题时打印一行汇总（详情用 pc047 deck lint 查看），返回问题数"""
+    issues = lint_presentation(prs)
+    if issues:
+        counts = {}
+        for issue in issues:
+            counts[issue.kind] = counts.get(issue.kind, 0) + 1
+        summary = "，".join(f"{_LABELS[kind]} {n}" for kind, n in counts.items())
+        print(f"版式检查：{summary}（pc047 deck lint 查看详情）", file=file)
+    return len(issues)
+
+
+# ---------------------------------------------------------------------------
+# 命令行
+# ---------------------------------------------------------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="检查PPT中超出页面、重叠的形状与溢出的文字")
+    parser.add_argument("paths", nargs="*", help="要检查的.pptx；不给时在内存中按描述文件构建后检查")
+    parser.add_argument("-v", "--version", default="v6")
+    parser.add_argument("-l", "--langs", nargs="+", default=["cn", "en"], help="按描述文件构建时的语言")
+    parser.add_argument("--image-dir", default=os.path.join(os.path.dirname(PPT_DIR), "analyses", "data"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.paths:
+        from pptx import Presentation
+
+        decks = ((path, Presentation(path)) for path in args.paths)
+    else:
+        import deck_engine
+
+        decks = (
+            (f"{args.version}_{lang}", deck_engine.build_presentation(
+                deck_engine.load_spec(deck_engine.spec_path(args.version, lang)), args.image_dir, lint=False))
+            for lang in args.langs
+        )
+    total = 0
+    for name, prs in decks:
+        issues = lint_presentation(prs)
+        for issue in issues:
+            print(f"{name} {issue}")
+        print(f"{name}：{len(prs.slides)} 页，{len(issues)} 个问题")
+        total += len(issues)
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+PC047组会PPT多语言：版式只排一次，各语言只替换文字
+v6构建函数原来在版式代码里逐处 if lang == 'cn' 分支，每种语言都要把整份PPT重新排一遍。
+现在分两步：
+- 版式：构建函数的文字取自 locales/<语言>.json 消息表（messages(lang, 页面)），
+  以 LAYOUT 语言构建时得到的是占位标记，形状、坐标、字体样式只计算一次；
+- 文字：localize() 在打包好的XML里把占位标记换成各语言的字符串。
+描述文件（decks/<版本>_<语言>.json）中各语言不同的文字由 merge_specs() 合并为同一份版式描述。
+
+占位标记按换行与 **加粗** 标记切段，各语言的段结构（换行位置、空行、加粗位置）必须一致，
+这样python-pptx生成的段落/换行/文本run在各语言间完全对应；不一致时抛出 LocaleMismatch，调用方退回逐语言构建。
+"""
+
+import json
+import os
+import re
+from xml.sax.saxutils import escape, unescape
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCALE_DIR = os.path.join(PPT_DIR, "locales")
+
+# 版式语言：构建出的文字为占位标记
+LAYOUT = "layout"
+
+# 描述中不能随语言变化的字段（变化时不能共用版式）
+STRUCTURAL_KEYS = {"type", "id", "image", "ref", "kind", "fill", "text_color", "category", "series", "values", "x", "y", "group"}
+# 图表中可随语言变化的文字字段（其余字段决定数据，须一致）
+CHART_TEXT_KEYS = {"title", "value_title", "category_title", "x_title", "y_title"}
+
+# 占位标记：\ue000 种类 \ue002 名称 \ue002 段号 [\ue002 格式化参数JSON] \ue001（Unicode私用区字符，正文里不会出现）
+_OPEN, _CLOSE, _SEP = "\ue000", "\ue001", "\ue002"
+_TOKEN = re.compile(f"{_OPEN}([^{_OPEN}{_CLOSE}]*){_CLOSE}")
+_TOKEN_PREFIX = _OPEN.encode("utf-8")
+# 切段：换行与加粗标记在各语言间位置一致
+_SEGMENT = re.compile(r"(\n|\*\*)")
+
+
+class LocaleMismatch(ValueError):
+    """各语言的消息表或描述结构不一致，不能共用一份版式"""
+
+
+def segments(text):
+    """按换行与 ** 切段：[文字, 分隔符, 文字, ...]"""
+    return _SEGMENT.split(text)
+
+
+def text_shape(text):
+    """段结构：分隔符原样保留，文字段只记是否为空"""
+    return [part if i % 2 else bool(part) for i, part in enumerate(segments(text))]
+
+
+def tokenize(kind, name, text, kwargs=None):
+    """把文字换成同样段结构的占位标记（空段保持为空）"""
+    suffix = _SEP + json.dumps(kwargs, ensure_ascii=False, sort_keys=True) if kwargs else ""
+    return "".join(
+        part if i % 2 or not part else f"{_OPEN}{kind}{_SEP}{name}{_SEP}{i}{suffix}{_CLOSE}"
+        for i, part in enumerate(segments(text))
+    )
+
+
+class _NotAvailable:
+    """没有值的参数（如基数为0的百分比）：任何格式都显示为 —"""
+
+    def __format__(self, spec):
+        return "—"
+
+
+def _format(text, kwargs):
+    if not kwargs:
+        return text
+    return text.format(**{key: _NotAvailable() if value is None else value for key, value in kwargs.items()})
+
+
+# ---------------------------------------------------------------------------
+# 消息表
+# ---------------------------------------------------------------------------
+
+_catalogs = {}
+
+
+def available_locales():
+    """locales目录下的语言"""
+    return sorted(name[:-5] for name in os.listdir(LOCALE_DIR) if name.endswith(".json"))
+
+
+def load_catalog(lang):
+    """某语言的消息表 {页面: {键: 字符串或字符串列表}}"""
+    if lang not in _catalogs:
+        path = os.path.join(LOCALE_DIR, f"{lang}.json")
+        if not os.path.exists(path):
+            raise KeyError(f"没有语言 {lang!r} 的消息表（{path}）")
+        with open(path, encoding="utf-8") as f:
+            _catalogs[lang] = json.load(f)
+    return _catalogs[lang]
+
+
+def _flatten(catalog):
+    flat = {}
+    for section, entries in catalog.items():
+        for key, value in entries.items():
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    flat[f"{section}/{key}/{i}"] = item
+            else:
+                flat[f"{section}/{key}"] = value
+    return flat
+
+
+def check_catalogs(langs=None):
+    """检查各语言消息表的键与段结构一致，返回参照语言的消息表"""
+    langs = langs or available_locales()
+    flats = {lang: _flatten(load_catalog(lang)) for lang in langs}
+    reference = flats[langs[0]]
+    problems = []
+    for lang in langs[1:]:
+        missing = reference.keys() ^ flats[lang].keys()
+        problems.extend(f"{lang}: 键 {key} 只在一方出现" for key in sorted(missing))
+        problems.extend(
+            f"{lang}: {key} 的换行/加粗结构与 {langs[0]} 不同"
+            for key in sorted(reference.keys() & flats[lang].keys())
+            if text_shape(reference[key]) != text_shape(flats[lang][key])
+        )
+    if problems:
+        raise LocaleMismatch("；".join(problems))
+    return load_catalog(langs[0])
+
+
+def layout_catalog():
+    """版式构建用的消息表（首次使用时检查各语言一致）"""
+    if LAYOUT not in _catalogs:
+        _catalogs[LAYOUT] = check_catalogs()
+    return _catalogs[LAYOUT]
+
+
+class Messages:
+    """某页的消息：t(键, **格式化参数) -> 字符串或字符串列表"""
+
+    def __init__(self, lang, section):
+        self.lang = lang
+        self.section = section
+        catalog = layout_catalog() if lang == LAYOUT else load_catalog(lang)
+        self.entries = catalog[section]
+
+    def __call__(self, key, **kwargs):
+        value = self.entries[key]
+        if self.lang != LAYOUT:
+            return [_format(item, kwargs) for item in value] if isinstance(value, list) else _format(value, kwargs)
+        name = f"{self.section}/{key}"
+        if isinstance(value, list):
+            return [tokenize("m", f"{name}/{i}", item, kwargs) for i, item in enumerate(value)]
+        return tokenize("m", name, value, kwargs)
+
+
+def messages(lang, section):
+    """构建函数取文字用：t = messages(lang, 'background_1'); t('title')"""
+    return Messages(lang, section)
+
+
+# ---------------------------------------------------------------------------
+# 描述合并
+# ---------------------------------------------------------------------------
+
+def merge_specs(specs):
+    """{语言: 已绑定的描述} -> (版式描述, {路径: {语言: 文字}})
+
+    各语言相同的值原样保留，不同的文字换成占位标记；结构、数值、图片等不一致时抛出 LocaleMismatch
+    """
+    langs = list(specs)
+    texts = {}
+
+    def merge(values, path, field, in_chart):
+        first = values[0]
+        if any(type(value) is not type(first) for value in values):
+            raise LocaleMismatch(f"{path} 的类型各语言不同")
+        if isinstance(first, dict):
+            if any(value.keys() != first.keys() for value in values):
+                raise LocaleMismatch(f"{path} 的字段各语言不同")
+            return {
+                key: merge([value[key] for value in values], f"{path}/{key}", key, in_chart or key in ("chart", "charts"))
+                for key in first
+            }
+        if isinstance(first, (list, tuple)):
+            if any(len(value) != len(first) for value in values):
+                raise LocaleMismatch(f"{path} 的长度各语言不同")
+            return [merge([value[i] for value in values], f"{path}/{i}", field, in_chart) for i in range(len(first))]
+        if all(value == first for value in values):
+            return first
+        if not isinstance(first, str) or field in STRUCTURAL_KEYS or (in_chart and field not in CHART_TEXT_KEYS):
+            raise LocaleMismatch(f"{path} 各语言取值不同")
+        if any(text_shape(value) != text_shape(first) for value in values):
+            raise LocaleMismatch(f"{path} 的换行/加粗结构各语言不同")
+        texts[path] = dict(zip(langs, values))
+        return tokenize("s", path, first)
+
+    first = specs[langs[0]]
+    for key in ("slide_size", "page_numbers"):
+        if any(spec.get(key) != first.get(key) for spec in specs.values()):
+            raise LocaleMismatch(f"{key} 各语言不同")
+    layout = {key: value for key, value in first.items() if key != "bindings"}
+    layout["lang"] = LAYOUT
+    layout["slides"] = merge([spec["slides"] for spec in specs.values()], "slides", None, False)
+    return layout, texts
+
+
+# ---------------------------------------------------------------------------
+# 文字替换
+# ---------------------------------------------------------------------------
+
+# 当前版式构建的语言与描述文字（build_decks设置；文字适配按语言展开占位标记时使用）
+_layout = {"langs": None, "texts": {}}
+
+
+def begin_layout(langs, texts):
+    """开始以LAYOUT构建某版本的各语言"""
+    _layout["langs"] = list(langs)
+    _layout["texts"] = texts
+
+
+def _resolve(body, lang, texts):
+    kind, name, index, *rest = body.split(_SEP)
+    if kind == "m":
+        section, key, *item = name.split("/")
+        value = load_catalog(lang)[section][key]
+        if item:
+            value = value[int(item[0])]
+    else:
+        value = texts[name][lang]
+    return _format(segments(value)[int(index)], json.loads(rest[0]) if rest else None)
+
+
+def expand(text):
+    """版式文字 -> {语言: 文字}；不含占位标记时返回None"""
+    if _OPEN not in text:
+        return None
+    langs = _layout["langs"] or available_locales()
+    return {lang: _TOKEN.sub(lambda m: _resolve(m.group(1), lang, _layout["texts"]), text) for lang in langs}
+
+
+def localize(data, lang, texts):
+    """把一个XML部件中的占位标记换成某语言的文字（没有占位标记的部件原样返回）"""
+    if _TOKEN_PREFIX not in data:
+        return data
+    xml = data.decode("utf-8")
+    return _TOKEN.sub(lambda m: escape(_resolve(unescape(m.group(1)), lang, texts)), xml).encode("utf-8")
+
+
+def localize_entries(entries, lang, texts):
+    """对打包条目 (条目名, 字节, 是否原样存储) 逐个替换文字"""
+    for name, data, stored in entries:
+        yield name, localize(data, lang, texts) if name.endswith(".xml") else data, stored
@@ -0,0 +1,166 @@
+"""
+PC047组会PPT增量更新
+小改动（如修正第6页要点里的P值）不必整份重写：在内存中重新编译描述文件后，与已有PPT逐条目比较，
+- 内容相同（CRC32与大小一致）的条目直接复制原zip中的压缩数据，不解压、不重新压缩
+- 只有变化的幻灯片/备注/媒体部件重新写入
+幻灯片按构建时写入 <p:cSld name> 的稳定ID识别（见 deck_engine.slide_ids），报告哪些页变化、新增、删除或移动。
+已有文件没有稳定ID（旧版本或历史脚本生成）时整份重写。
+
+用法：
+    python PPT/deck_patch.py -l cn              # 更新 PPT/<date>/组会汇报_v6.pptx
+    python PPT/deck_patch.py -v v6 -l cn en
+"""
+
+import argparse
+import io
+import os
+import re
+import zlib
+
+import deck_engine
+import pptx_writer
+
+_SLIDE_PART = re.compile(r"^ppt/slides/slide\d+\.xml$")
+_CSLD_NAME = re.compile(rb'<p:cSld name="([^"]*)"')
+
+
+def slide_id_of(xml):
+    """幻灯片XML中的稳定ID；没有时返回None"""
+    match = _CSLD_NAME.search(xml)
+    return match.group(1).decode("utf-8") if match else None
+
+
+def _inflate(entry):
+    """解压单个原始条目（只用于读取幻灯片XML中的ID）"""
+    if entry.method == pptx_writer.METHOD_STORED:
+        return entry.raw
+    return zlib.decompress(entry.raw, -15)
+
+
+def _slide_ids(items):
+    """(部件名, XML) -> {稳定ID: 部件名}"""
+    ids = {}
+    for name, xml in items:
+        if _SLIDE_PART.match(name):
+            slide_id = slide_id_of(xml)
+            if slide_id:
+                ids[slide_id] = name
+    return ids
+
+
+def _full_rewrite(entries, path, level):
+    buffer = io.BytesIO()
+    pptx_writer.write_entries(buffer, entries, level=level)
+    pptx_writer.write_file(path, buffer.getvalue())
+
+
+def patch_deck(prs, path, level=pptx_writer.DEFLATE_LEVEL):
+    """把prs增量写入已有的path，返回更新报告"""
+    pptx_writer.normalize_core_properties(prs)
+    entries = list(pptx_writer.package_entries(prs))
+    new_ids = _slide_ids((name, data) for name, data, _ in entries)
+    report = {
+        "path": path, "mode": "patch", "copied": 0, "written": [], "removed": [],
+        "changed": [], "added": [], "deleted": [], "moved": [],
+    }
+
+    old_entries = pptx_writer.read_raw_entries(path) if os.path.exists(path) else []
+    old = {e.name: e for e in old_entries}
+    old_ids = _slide_ids((e.name, _inflate(e)) for e in old_entries if _SLIDE_PART.match(e.name))
+    if not old_ids:
+        _full_rewrite(entries, path, level)
+        report.update(mode="rewrite", written=[name for name, _, _ in entries], added=list(new_ids))
+        return report
+
+    plan = []
+    for name, data, stored in entries:
+        entry = old.get(name)
+        if entry is not None and entry.size == len(data) and entry.crc == zlib.crc32(data):
+            plan.append((name, entry, data, stored))
+            report["copied"] += 1
+        else:
+            plan.append((name, None, data, stored))
+            report["written"].append(name)
+    names = {name for name, _, _ in entries}
+    report["removed"] = [e.name for e in old_entries if e.name not in names]
+
+    # 以稳定ID归纳变化的页：内容变化（含对应备注）、新增、删除、换了位置
+    written = set(report["written"])
+    for slide_id, name in new_ids.items():
+        if slide_id not in old_ids:
+            report["added"].append(slide_id)
+        elif old_ids[slide_id] != name:
+            report["moved"].append(slide_id)
+        elif name in written:
+            report["changed"].append(slide_id)
+    report["deleted"] = [slide_id for slide_id in old_ids if slide_id not in new_ids]
+
+    if not written and not report["removed"] and [e.name for e in old_entries] == [n for n, _, _ in entries]:
+        report["mode"] = "unchanged"
+        return report
+
+    buffer = io.BytesIO()
+    writer = pptx_writer.ZipStreamWriter(buffer)
+    for name, entry, data, stored in plan:
+        if entry is not None:
+            writer.write_raw(name, entry.raw, entry.crc, entry.size, entry.method)
+        else:
+            writer.write(name, data, stored, level)
+    writer.close()
+    pptx_writer.write_file(path, buffer.getvalue())
+    return report
+
+
+def update_deck(spec, path, image_dir):
+    """按描述重新编译，并增量更新已有PPT"""
+    return patch_deck(deck_engine.build_presentation(spec, image_dir), path)
+
+
+def print_report(report):
+    name = os.path.basename(report["path"])
+    if report["mode"] == "unchanged":
+        print(f"{name}：内容未变化")
+        return
+    if report["mode"] == "rewrite":
+        print(f"{name}：已有文件没有稳定ID，整份重写（{len(report['written'])} 个条目）")
+        return
+    print(f"{name}：复制 {report['copied']} 个条目，重写 {len(report['written'])} 个，删除 {len(report['removed'])} 个")
+    for key, label in (("changed", "内容变化"), ("added", "新增"), ("deleted", "删除"), ("moved", "位置变化")):
+        if report[key]:
+            print(f"  {label}：{', '.join(report[key])}")
+    for part in report["written"]:
+        print(f"  写入 {part}")
+
+
+def parse_args(argv=None):
+    import deck_build
+
+    parser = argparse.ArgumentParser(description="增量更新已有的PC047组会PPT")
+    parser.add_argument("--base-dir", default=deck_build.BASE_DIR, help="项目根目录（含 analyses/ 与 PPT/）")
+    parser.add_argument("--date", default=deck_build.MEETING_DATE, help="汇报日期 YYYYMMDD")
+    parser.add_argument("-v", "--version", default="v6", help="描述文件版本")
+    parser.add_argument("-l", "--langs", nargs="+", default=list(deck_build.LANGS), choices=deck_build.LANGS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import deck_build
+
+    args = parse_args(argv)
+    if deck_build.VERSIONS.get(args.version) != "spec":
+        raise SystemExit(f"增量更新只支持描述文件生成的版本，{args.version!r} 是历史脚本")
+    image_dir = os.path.join(args.base_dir, "analyses", "data")
+    output_dir = os.path.join(args.base_dir, "PPT", args.date)
+    os.makedirs(output_dir, exist_ok=True)
+    reports = []
+    for lang in args.langs:
+        path = os.path.join(output_dir, deck_build.OUTPUT_NAMES[lang].format(version=args.version))
+        spec = deck_engine.load_spec(deck_engine.spec_path(args.version, lang))
+        report = update_deck(spec, path, image_dir)
+        print_report(report)
+        reports.append(report)
+    return reports
+
+
+if __name__ == "__main__":
+    main()
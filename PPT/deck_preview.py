@@ -0,0 +1,680 @@
+"""
+PC047组会PPT缩略图
+检查生成的PPT以前要用PowerPoint或LibreOffice打开，每份要几秒。这里只实现构建脚本用到的子集，用Pillow把每页直接画成PNG：
+- 形状：矩形、圆角矩形、椭圆、四向箭头（其它预设形状按矩形画）、连线；颜色按主题配色、母版clrMap与 p:style 解析
+- 文字：按 text_fit.py 折行（与版式检查一致），全角字符用中文字体、其余用拉丁字体；支持对齐、垂直锚点与随文字调整大小
+- 图片；表格画单元格底色与文字，图表只画占位框；组合形状不绘制
+主进程把每页提取为只含数据的绘制列表（坐标、颜色、文字、图片SHA1），按 绘制列表 + 渲染器源码 + 字体 + 宽度 的哈希
+缓存在 PPT/.cache/thumbnails/<哈希>.png；只有未命中的页放入进程池绘制（2倍超采样后按块平均缩小抗锯齿）。
+重新构建后再预览只需解析XML与计算哈希，12页的PPT几十毫秒即可完成。
+
+用法：
+    python PPT/deck_preview.py PPT/20260126/组会汇报_v6.pptx    # -> PPT/20260126/组会汇报_v6_preview/slide01.png ...
+    python PPT/deck_preview.py                                  # 在内存中构建v6中英文版 -> PPT/preview/v6_<语言>/
+"""
+
+import argparse
+import colorsys
+import hashlib
+import io
+import os
+import shutil
+import sys
+import unicodedata
+from functools import lru_cache
+
+import slide_shapes
+import text_fit
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(PPT_DIR, ".cache", "thumbnails")
+
+DEFAULT_WIDTH = 960
+SUPERSAMPLE = 2
+# 未命中缓存的页少于该数时在当前进程绘制（启动进程池本身约需0.1秒）
+MIN_POOL_SLIDES = 4
+
+# 找不到 text_fit.py 测量用的字体（Calibri/微软雅黑）时的替代字体，只影响外观
+FALLBACK_FONT_FILES = {
+    "latin": ("DejaVuSans.ttf", "LiberationSans-Regular.ttf", "arial.ttf", "Arial.ttf"),
+    "bold": ("DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf", "arialbd.ttf", "Arial Bold.ttf"),
+    "ea": ("NotoSansCJK-Regular.ttc", "NotoSansSC-Regular.otf", "wqy-microhei.ttc", "wqy-zenhei.ttc",
+           "simhei.ttf", "PingFang.ttc", "DroidSansFallbackFull.ttf"),
+}
+_FONT_NAMES = {"latin": text_fit.LATIN_FONT, "bold": f"{text_fit.LATIN_FONT} Bold", "ea": text_fit.EA_FONT}
+
+DEFAULT_FONT_SIZE = 18
+# 主题线条样式 lnRef idx -> 线宽（EMU，与Office默认主题一致）
+_LINE_WIDTHS = {1: 6350, 2: 12700, 3: 19050}
+_PRESET_COLORS = {"black": "000000", "white": "FFFFFF", "red": "FF0000", "green": "008000", "blue": "0000FF", "gray": "808080"}
+_TABLE_LINE = ("BFBFBF", 6350)
+_FRAME = ("F2F2F2", "BFBFBF", 9525)
+_EMU_PER_PT = 12700
+_EMU_PER_INCH = 914400
+
+_A, _P, _R = slide_shapes.A, slide_shapes.P, slide_shapes.R
+_FILLS = {f"{_A}noFill", f"{_A}solidFill", f"{_A}gradFill", f"{_A}pattFill", f"{_A}blipFill", f"{_A}grpFill"}
+_COLORS = {f"{_A}srgbClr", f"{_A}schemeClr", f"{_A}sysClr", f"{_A}prstClr", f"{_A}scrgbClr", f"{_A}hslClr"}
+
+
+# ---------------------------------------------------------------------------
+# 绘制列表：在主进程中从XML提取
+# ---------------------------------------------------------------------------
+
+def _scheme(master, themes):
+    """母版的主题配色 {槽位: "RRGGBB"}，含 clrMap 映射的 bg1/tx1/bg2/tx2（themes 为按母版部件的缓存）"""
+    if master.part not in themes:
+        from lxml import etree
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+        theme = etree.fromstring(master.part.part_related_by(RT.THEME).blob)
+        scheme = {}
+        for slot in theme.find(f".//{_A}clrScheme"):
+            color = slot[0]
+            scheme[slot.tag[len(_A):]] = color.get("lastClr") or color.get("val")
+        clr_map = master._element.find(f"{_P}clrMap")
+        for key, slot in (clr_map.attrib.items() if clr_map is not None else ()):
+            scheme[key] = scheme.get(slot, "000000")
+        themes[master.part] = scheme
+    return themes[master.part]
+
+
+def _color(element, scheme):
+    """颜色元素 -> "RRGGBB"，按 lumMod/lumOff 调整亮度"""
+    name, value = element.tag[len(_A):], element.get("val")
+    if name == "srgbClr":
+        rgb = value
+    elif name == "schemeClr":
+        rgb = scheme.get(value, "000000")
+    elif name == "sysClr":
+        rgb = element.get("lastClr", "000000")
+    elif name == "prstClr":
+        rgb = _PRESET_COLORS.get(value, "000000")
+    else:
+        rgb = "000000"
+    mods = {child.tag[len(_A):]: int(child.get("val", 0)) / 100000 for child in element}
+    if "lumMod" in mods or "lumOff" in mods:
+        h, l, s = colorsys.rgb_to_hls(*(int(rgb[i:i + 2], 16) / 255 for i in (0, 2, 4)))
+        l = min(max(l * mods.get("lumMod", 1) + mods.get("lumOff", 0), 0), 1)
+        rgb = "".join(f"{round(c * 255):02X}" for c in colorsys.hls_to_rgb(h, l, s))
+    return rgb.upper()
+
+
+def _first_color(element, scheme):
+    """元素的第一个颜色子元素；没有时为None"""
+    color = next((c for c in element if c.tag in _COLORS), None) if element is not None else None
+    return _color(color, scheme) if color is not None else None
+
+
+def _fill_color(fill, scheme):
+    """填充元素 -> 颜色；无填充/图片填充为None，渐变取第一个色标，图案取前景色"""
+    if fill.tag == f"{_A}gradFill":
+        return _first_color(fill.find(f".//{_A}gs"), scheme)
+    if fill.tag == f"{_A}pattFill":
+        return _first_color(fill.find(f"{_A}fgClr"), scheme)
+    if fill.tag == f"{_A}solidFill":
+        return _first_color(fill, scheme)
+    return None
+
+
+def _own_fill(parent):
+    return next((c for c in parent if c.tag in _FILLS), None) if parent is not None else None
+
+
+def _style(elements):
+    """形状或其继承的占位符上的 p:style"""
+    return next((s for s in (e.find(f"{_P}style") for e in elements) if s is not None), None)
+
+
+def _style_ref(style, name, scheme):
+    """p:style 中 fillRef/lnRef/fontRef 的 (idx, 颜色)"""
+    ref = style.find(f"{_A}{name}") if style is not None else None
+    if ref is None:
+        return 0, None
+    idx = ref.get("idx", "0")
+    return (int(idx) if idx.isdigit() else 1), _first_color(ref, scheme)
+
+
+def _shape_fill(elements, scheme):
+    """填充颜色：spPr（含继承的占位符）> p:style 的 fillRef；无填充为None"""
+    for element in elements:
+        fill = _own_fill(element.find(f"{_P}spPr"))
+        if fill is not None:
+            return _fill_color(fill, scheme)
+    idx, color = _style_ref(_style(elements), "fillRef", scheme)
+    return color if idx else None
+
+
+def _shape_line(elements, scheme):
+    """线条 (颜色, 宽度EMU)：spPr/ln（含继承的占位符）> p:style 的 lnRef；无线条时颜色为None"""
+    width = None
+    for element in elements:
+        ln = element.find(f"{_P}spPr/{_A}ln")
+        if ln is None:
+            continue
+        width = width or (int(ln.get("w")) if ln.get("w") else None)
+        fill = _own_fill(ln)
+        if fill is not None:
+            return _fill_color(fill, scheme), width or 9525
+    idx, color = _style_ref(_style(elements), "lnRef", scheme)
+    return (color, width or _LINE_WIDTHS.get(idx, 9525)) if idx else (None, 0)
+
+
+def _adjustments(element):
+    """预设形状的调整值 {名称: 值}"""
+    return tuple(
+        (gd.get("name"), int(gd.get("fmla").split()[-1]))
+        for gd in element.iterfind(f"{_P}spPr/{_A}prstGeom/{_A}avLst/{_A}gd")
+        if gd.get("fmla", "").startswith("val ")
+    )
+
+
+def _run_style(nodes, default_color, scheme):
+    """(字号, 加粗, 颜色)：按 nodes（rPr > 段落defRPr > 各级lstStyle的defRPr）依次查找"""
+    size = next((int(n.get("sz")) / 100 for n in nodes if n.get("sz")), DEFAULT_FONT_SIZE)
+    bold = next((n.get("b") in ("1", "true") for n in nodes if n.get("b")), False)
+    color = next((c for c in (_first_color(n.find(f"{_A}solidFill"), scheme) for n in nodes) if c), default_color)
+    return size, bold, color
+
+
+def _paragraphs(txbody, levels, default_color, scheme):
+    """段落列表 ((对齐, 段前距磅, ((文字, 样式), ...)), ...)；levels 为继承的第一级段落样式（lvl1pPr）"""
+    own = txbody.find(f"{_A}lstStyle/{_A}lvl1pPr")
+    levels = [level for level in (own, *levels) if level is not None]
+    paragraphs = []
+    for p in txbody.iterfind(f"{_A}p"):
+        ppr = p.find(f"{_A}pPr")
+        props = [e for e in (ppr, *levels) if e is not None]
+        align = next((e.get("algn") for e in props if e.get("algn")), "l")
+        spc = ppr.find(f"{_A}spcBef/{_A}spcPts") if ppr is not None else None
+        defaults = [d for d in (e.find(f"{_A}defRPr") for e in props) if d is not None]
+        style = _run_style(defaults, default_color, scheme)
+        runs = []
+        for child in p:
+            if child.tag == f"{_A}br":
+                text = "\v"
+            elif child.tag in (f"{_A}r", f"{_A}fld"):
+                text = "".join(t.text or "" for t in child.iter(f"{_A}t"))
+                rpr = child.find(f"{_A}rPr")
+                style = _run_style([rpr, *defaults] if rpr is not None else defaults, default_color, scheme)
+            else:
+                continue
+            if runs and runs[-1][1] == style:
+                runs[-1] = (runs[-1][0] + text, style)
+            else:
+                runs.append((text, style))
+        paragraphs.append((align, int(spc.get("val")) / 100 if spc is not None else 0, tuple(runs) or (("", style),)))
+    return tuple(paragraphs)
+
+
+def _has_text(paragraphs):
+    return any(text.strip() for _, _, runs in paragraphs for text, _ in runs)
+
+
+def _body(elements):
+    """文本框属性：(内边距(l, t, r, b), 垂直锚点, 是否自动换行, 是否随文字调整大小)，未写的按继承的占位符"""
+    bodies = [b for b in (e.find(f"{_P}txBody/{_A}bodyPr") for e in elements) if b is not None]
+
+    def attr(name, default):
+        return next((b.get(name) for b in bodies if b.get(name) is not None), default)
+
+    insets = tuple(int(attr(key, slide_shapes.DEFAULT_INSETS[key])) for key in ("lIns", "tIns", "rIns", "bIns"))
+    autofit = next((b.find(f"{_A}spAutoFit") is not None for b in bodies if len(b)), False)
+    return insets, attr("anchor", "t"), attr("wrap", "square") != "none", autofit
+
+
+def _shape_items(elements, geometry, scheme):
+    """p:sp -> 形状 + 文字"""
+    element = elements[0]
+    items = []
+    prst = element.find(f"{_P}spPr/{_A}prstGeom")
+    fill = _shape_fill(elements, scheme)
+    line, line_width = _shape_line(elements, scheme)
+    if fill or line:
+        kind = prst.get("prst") if prst is not None else "rect"
+        items.append(("shape", kind, geometry, fill, line, line_width, _adjustments(element)))
+    txbody = element.find(f"{_P}txBody")
+    if txbody is not None:
+        _, font_color = _style_ref(_style(elements), "fontRef", scheme)
+        levels = [e.find(f"{_P}txBody/{_A}lstStyle/{_A}lvl1pPr") for e in elements[1:]]
+        paragraphs = _paragraphs(txbody, levels, font_color or scheme.get("tx1", "000000"), scheme)
+        if _has_text(paragraphs):
+            items.append(("text", geometry, *_body(elements), paragraphs))
+    return items
+
+
+def _connector_item(elements, geometry, scheme):
+    """p:cxnSp -> 连线（起止点按 flipH/flipV 确定）"""
+    element = elements[0]
+    xfrm = element.find(slide_shapes.XFRM_PATHS[element.tag])
+    line, width = _shape_line(elements, scheme)
+    prst = element.find(f"{_P}spPr/{_A}prstGeom")
+    ln = element.find(f"{_P}spPr/{_A}ln")
+    ends = tuple(
+        ln is not None and ln.find(f"{_A}{end}") is not None and ln.find(f"{_A}{end}").get("type", "none") != "none"
+        for end in ("headEnd", "tailEnd")
+    )
+    return ("line", prst.get("prst") if prst is not None else "line", geometry,
+            xfrm.get("flipH") == "1", xfrm.get("flipV") == "1", line or scheme.get("tx1", "000000"), width or 9525, ends)
+
+
+def _picture_item(part, element, geometry, images, hashes):
+    """p:pic -> 图片（按SHA1引用，字节写入 images）"""
+    blip = element.find(f"{_P}blipFill/{_A}blip")
+    rid = blip.get(f"{_R}embed") if blip is not None else None
+    if not rid:
+        return None
+    image_part = part.related_part(rid)
+    if image_part not in hashes:
+        hashes[image_part] = hashlib.sha1(image_part.blob).hexdigest()
+    images[hashes[image_part]] = image_part.blob
+    return ("picture", geometry, hashes[image_part])
+
+
+def _table_items(tbl, geometry, scheme):
+    """a:tbl -> 单元格底色 + 网格 + 文字；行高取声明值与文字所需高度的较大者"""
+    x, y = geometry[:2]
+    cols = [int(c.get("w")) for c in tbl.iterfind(f"{_A}tblGrid/{_A}gridCol")]
+    tx1 = scheme.get("tx1", "000000")
+    items = []
+    for tr in tbl.iterfind(f"{_A}tr"):
+        cells, col, height = [], 0, int(tr.get("h", 0))
+        for tc in tr.iterfind(f"{_A}tc"):
+            span = int(tc.get("gridSpan", 1))
+            left, width = x + sum(cols[:col]), sum(cols[col:col + span])
+            col += span
+            if tc.get("hMerge") == "1" or tc.get("vMerge") == "1":
+                continue
+            tc_pr = tc.find(f"{_A}tcPr")
+            margins = tuple(
+                int(tc_pr.get(key, default)) if tc_pr is not None else default
+                for key, default in (("marL", 91440), ("marT", 45720), ("marR", 91440), ("marB", 45720))
+            )
+            fill = _own_fill(tc_pr)
+            paragraphs = _paragraphs(tc.find(f"{_A}txBody"), [], tx1, scheme)
+            text_width = (width - margins[0] - margins[2]) / _EMU_PER_INCH
+            needed = sum(
+                text_fit.text_height(["".join(t for t, _ in runs)], text_width, runs[0][1][0], runs[0][1][1]) + spc / 72
+                for _, spc, runs in paragraphs
+            ) * _EMU_PER_INCH + margins[1] + margins[3]
+            height = max(height, int(needed))
+            anchor = tc_pr.get("anchor", "t") if tc_pr is not None else "t"
+            cells.append((left, width, fill, margins, anchor, paragraphs))
+        for left, width, fill, margins, anchor, paragraphs in cells:
+            box = (left, y, width, height)
+            items.append(("shape", "rect", box, _fill_color(fill, scheme) if fill is not None else None, *_TABLE_LINE, ()))
+            if _has_text(paragraphs):
+                items.append(("text", box, margins, anchor, True, False, paragraphs))
+        y += height
+    return items
+
+
+def _background(slide, scheme):
+    """背景颜色：幻灯片 > 版式 > 母版的 p:bg，默认 bg1"""
+    for source in (slide, slide.slide_layout, slide.slide_layout.slide_master):
+        bg = source._element.find(f"{_P}cSld/{_P}bg")
+        if bg is None:
+            continue
+        fill = _own_fill(bg.find(f"{_P}bgPr"))
+        color = _fill_color(fill, scheme) if fill is not None else _first_color(bg.find(f"{_P}bgRef"), scheme)
+        if color:
+            return color
+    return scheme.get("bg1", "FFFFFF")
+
+
+def display_list(slide, layouts, themes, images, hashes):
+    """一页的绘制列表（只含数据，可哈希、可传给子进程）；用到的图片 {SHA1: 字节} 写入 images
+
+    layouts、themes、hashes 为整份PPT共用的 版式/主题配色/图片SHA1 缓存
+    """
+    scheme = _scheme(slide.slide_layout.slide_master, themes)
+    items = [("background", _background(slide, scheme))]
+    for element, geometry, chain in slide_shapes.iter_shapes(slide, layouts):
+        elements = [element, *chain]
+        if element.tag == slide_shapes.SP:
+            items.extend(_shape_items(elements, geometry, scheme))
+        elif element.tag == slide_shapes.CXN_SP:
+            items.append(_connector_item(elements, geometry, scheme))
+        elif element.tag == slide_shapes.PIC:
+            # 版式上的图片按版式部件的关系查找
+            part = slide.part if element.getroottree().getroot() is slide._element else slide.slide_layout.part
+            item = _picture_item(part, element, geometry, images, hashes)
+            if item:
+                items.append(item)
+        elif element.tag == slide_shapes.GRAPHIC_FRAME:
+            tbl = element.find(f".//{_A}tbl")
+            items.extend(_table_items(tbl, geometry, scheme) if tbl is not None else [("frame", geometry, *_FRAME)])
+    return tuple(items)
+
+
+# ---------------------------------------------------------------------------
+# 绘制（在子进程中执行，只依赖绘制列表与图片字节）
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def font_files():
+    """渲染用字体文件 {"latin"/"bold"/"ea": 路径}，找不到时为None；没有中文字体时提示一次"""
+    files = {
+        kind: text_fit.find_font_file(name) or text_fit.find_font_file(name, FALLBACK_FONT_FILES[kind])
+        for kind, name in _FONT_NAMES.items()
+    }
+    if files["ea"] is None:
+        searched = dict.fromkeys(text_fit.FONT_FILES.get(text_fit.EA_FONT, ()) + FALLBACK_FONT_FILES["ea"])
+        print(
+            f"警告：找不到中文字体（已查找 {'、'.join(searched)}），缩略图中的中文将显示为方框；"
+            "可用环境变量 PC047_FONT_DIR 指定字体目录",
+            file=sys.stderr,
+        )
+    return files
+
+
+@lru_cache(maxsize=256)
+def _load_font(path, px):
+    from PIL import ImageFont
+
+    if path:
+        return ImageFont.truetype(path, px)
+    try:
+        return ImageFont.load_default(px)
+    except TypeError:  # Pillow < 10.1 的默认字体不能缩放
+        return ImageFont.load_default()
+
+
+def _font(fonts, wide, bold, px):
+    path = fonts["ea"] if wide else (fonts["bold"] if bold else None) or fonts["latin"]
+    return _load_font(path, max(int(px), 1))
+
+
+def _pieces(text):
+    """按全角/半角把文字切成片段 [(是否全角, 文字)]"""
+    pieces = []
+    for ch in text:
+        wide = unicodedata.east_asian_width(ch) in "WF"
+        if pieces and pieces[-1][0] == wide:
+            pieces[-1][1] += ch
+        else:
+            pieces.append([wide, ch])
+    return pieces
+
+
+def _hex(color):
+    return f"#{color}" if color else None
+
+
+def _arrow_points(kind, x0, y0, x1, y1, adj):
+    """四向箭头的多边形顶点：沿箭头方向为 u、横向为 v 计算后映射到页面坐标"""
+    horizontal = kind in ("rightArrow", "leftArrow")
+    length, across = (x1 - x0, y1 - y0) if horizontal else (y1 - y0, x1 - x0)
+    shaft = across * adj.get("adj1", 50000) / 100000
+    head = min(x1 - x0, y1 - y0) * adj.get("adj2", 50000) / 100000
+    s0, s1, neck = (across - shaft) / 2, (across + shaft) / 2, length - head
+    local = [(0, s0), (neck, s0), (neck, 0), (length, across / 2), (neck, across), (neck, s1), (0, s1)]
+    place = {
+        "rightArrow": lambda u, v: (x0 + u, y0 + v),
+        "leftArrow": lambda u, v: (x1 - u, y0 + v),
+        "downArrow": lambda u, v: (x0 + v, y0 + u),
+        "upArrow": lambda u, v: (x0 + v, y1 - u),
+    }[kind]
+    return [place(u, v) for u, v in local]
+
+
+def _draw_shape(draw, item, scale):
+    _, kind, (x, y, cx, cy), fill, line, line_width, adj = item
+    x0, y0, x1, y1 = x * scale, y * scale, (x + cx) * scale, (y + cy) * scale
+    width = max(round(line_width * scale), 1) if line else 0
+    style = {"fill": _hex(fill), "outline": _hex(line), "width": width}
+    adj = dict(adj)
+    if kind == "roundRect":
+        radius = adj.get("adj", 16667) / 100000 * min(x1 - x0, y1 - y0)
+        draw.rounded_rectangle((x0, y0, x1, y1), radius, **style)
+    elif kind == "ellipse":
+        draw.ellipse((x0, y0, x1, y1), **style)
+    elif kind in ("rightArrow", "leftArrow", "downArrow", "upArrow"):
+        draw.polygon(_arrow_points(kind, x0, y0, x1, y1, adj), **style)
+    elif kind == "triangle":
+        draw.polygon([((x0 + x1) / 2, y0), (x1, y1), (x0, y1)], **style)
+    elif kind == "diamond":
+        draw.polygon([((x0 + x1) / 2, y0), (x1, (y0 + y1) / 2), ((x0 + x1) / 2, y1), (x0, (y0 + y1) / 2)], **style)
+    else:
+        draw.rectangle((x0, y0, x1, y1), **style)
+
+
+def _draw_arrowhead(draw, tip, tail, width, color):
+    """在 tip 处画指向 tip 的三角箭头（大小随线宽）"""
+    (tx, ty), (sx, sy) = tip, tail
+    length = max(((tx - sx) ** 2 + (ty - sy) ** 2) ** 0.5, 1e-6)
+    ux, uy = (tx - sx) / length, (ty - sy) / length
+    size = max(width * 3, 6)
+    base = (tx - ux * size, ty - uy * size)
+    draw.polygon([tip, (base[0] - uy * size / 2, base[1] + ux * size / 2), (base[0] + uy * size / 2, base[1] - ux * size / 2)], fill=color)
+
+
+def _draw_line(draw, item, scale):
+    _, kind, (x, y, cx, cy), flip_h, flip_v, color, line_width, (head, tail) = item
+    x0, y0, x1, y1 = x * scale, y * scale, (x + cx) * scale, (y + cy) * scale
+    if flip_h:
+        x0, x1 = x1, x0
+    if flip_v:
+        y0, y1 = y1, y0
+    points = [(x0, y0), (x1, y1)]
+    if kind.startswith("bentConnector"):
+        points[1:1] = [((x0 + x1) / 2, y0), ((x0 + x1) / 2, y1)]
+    width = max(round(line_width * scale), 1)
+    draw.line(points, fill=_hex(color), width=width, joint="curve")
+    if head:
+        _draw_arrowhead(draw, points[0], points[1], width, _hex(color))
+    if tail:
+        _draw_arrowhead(draw, points[-1], points[-2], width, _hex(color))
+
+
+def _wrap_runs(runs, width_in, wrap):
+    """把段落折成行：[[(文字, 样式), ...], ...]；折行按 text_fit.py，样式按字符位置对应回原来的run"""
+    text = "".join(t for t, _ in runs)
+    styles = [style for t, style in runs for _ in t]
+    size, bold = runs[0][1][:2]
+    lines = text_fit.wrap(text, width_in, size, bold) if wrap else text.replace("\v", "\n").split("\n")
+    result, pos = [], 0
+    for line in lines:
+        start = text.find(line, pos) if line else -1
+        if start < 0:
+            result.append([(line, styles[min(pos, len(styles) - 1)] if styles else runs[0][1])])
+            continue
+        segments = []
+        for i, ch in enumerate(line, start):
+            if segments and segments[-1][1] == styles[i]:
+                segments[-1][0] += ch
+            else:
+                segments.append([ch, styles[i]])
+        result.append([tuple(s) for s in segments])
+        pos = start + len(line)
+    return result
+
+
+def _draw_text(draw, item, scale, fonts):
+    _, (x, y, cx, cy), (l_ins, t_ins, r_ins, b_ins), anchor, wrap, autofit, paragraphs = item
+    pt = _EMU_PER_PT * scale
+    lines = []  # (对齐, 行首的段前距px, 行高px, [(文字, 样式)])
+    for align, space_before, runs in paragraphs:
+        width_in = max(cx - l_ins - r_ins, 0) / _EMU_PER_INCH
+        for i, segments in enumerate(_wrap_runs(runs, width_in, wrap)):
+            size = max(style[0] for _, style in segments) if segments else runs[0][1][0]
+            gap = space_before * pt if i == 0 and lines else 0
+            lines.append((align, gap, size * text_fit.LINE_SPACING * pt, segments))
+    measured = []
+    for align, gap, height, segments in lines:
+        pieces = [
+            (text, _font(fonts, wide, style[1], style[0] * pt), style)
+            for chunk, style in segments for wide, text in _pieces(chunk)
+        ]
+        measured.append((align, gap, height, pieces, sum(font.getlength(text) for text, font, _ in pieces)))
+
+    left, top, right, bottom = x * scale, y * scale, (x + cx) * scale, (y + cy) * scale
+    text_height = sum(gap + height for _, gap, height, _, _ in measured)
+    if autofit:
+        bottom = max(bottom, top + text_height + (t_ins + b_ins) * scale)
+        if not wrap:
+            # 不换行、随文字调整大小的文本框按对齐方式向两侧/一侧扩展
+            needed = max(width for *_, width in measured) + (l_ins + r_ins) * scale
+            grow = max(needed - (right - left), 0)
+            shift = {"ctr": grow / 2, "r": grow}.get(measured[0][0], 0)
+            left, right = left - shift, right + grow - shift
+    inner_top, inner_bottom = top + t_ins * scale, bottom - b_ins * scale
+    cursor = {"ctr": (inner_top + inner_bottom - text_height) / 2, "b": inner_bottom - text_height}.get(anchor, inner_top)
+    for align, gap, height, pieces, width in measured:
+        cursor += gap
+        pen = {"ctr": (left + l_ins * scale + right - r_ins * scale - width) / 2, "r": right - r_ins * scale - width}.get(
+            align, left + l_ins * scale)
+        for text, font, style in pieces:
+            # 基线放在行顶下方1倍字号处（行高1.2倍，余下留给下伸部）
+            draw.text((pen, cursor + height / text_fit.LINE_SPACING), text, font=font, fill=_hex(style[2]), anchor="ls")
+            pen += font.getlength(text)
+        cursor += height
+
+
+def _draw_picture(canvas, item, scale, images):
+    from PIL import Image
+
+    _, (x, y, cx, cy), sha1 = item
+    size = (max(round(cx * scale), 1), max(round(cy * scale), 1))
+    with Image.open(io.BytesIO(images[sha1])) as image:
+        picture = image.convert("RGBA").resize(size, Image.LANCZOS)
+    canvas.paste(picture, (round(x * scale), round(y * scale)), picture)
+
+
+def render_slide(job):
+    """按绘制列表画一页并写入缓存路径（在子进程中执行）；job 为 (绘制列表, 图片, 页面尺寸, 宽度, 字体, 路径)"""
+    from PIL import Image, ImageDraw
+
+    items, images, (slide_width, slide_height), width, fonts, path = job
+    scale = width * SUPERSAMPLE / slide_width
+    size = (width * SUPERSAMPLE, round(slide_height * width / slide_width) * SUPERSAMPLE)
+    canvas = Image.new("RGB", size, _hex(items[0][1]))
+    draw = ImageDraw.Draw(canvas)
+    for item in items[1:]:
+        kind = item[0]
+        if kind == "shape":
+            _draw_shape(draw, item, scale)
+        elif kind == "line":
+            _draw_line(draw, item, scale)
+        elif kind == "text":
+            _draw_text(draw, item, scale, fonts)
+        elif kind == "picture":
+            _draw_picture(canvas, item, scale, images)
+        elif kind == "frame":
+            _, (x, y, cx, cy), fill, line, line_width = item
+            box = (x * scale, y * scale, (x + cx) * scale, (y + cy) * scale)
+            draw.rectangle(box, fill=_hex(fill), outline=_hex(line), width=max(round(line_width * scale), 1))
+            draw.line(box, fill=_hex(line), width=max(round(line_width * scale), 1))
+            draw.line((box[0], box[3], box[2], box[1]), fill=_hex(line), width=max(round(line_width * scale), 1))
+    # 超采样画布按块平均缩小（比LANCZOS快10倍，2倍超采样下效果相同）；缩略图只在本地查看，用最快的压缩级别
+    thumbnail = canvas.reduce(SUPERSAMPLE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    thumbnail.save(tmp_path, "PNG", compress_level=1)
+    os.replace(tmp_path, path)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# 缓存与并行
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def renderer_key():
+    """影响绘制结果的渲染器源码与字体（改动后缓存自动失效）"""
+    digest = hashlib.sha1()
+    for module in (__file__, text_fit.__file__):
+        with open(module, "rb") as f:
+            digest.update(f.read())
+    digest.update(repr((sorted(font_files().items()), text_fit.metrics_key(), SUPERSAMPLE)).encode())
+    return digest.hexdigest()
+
+
+def slide_key(items, slide_size, width):
+    """缩略图的缓存键：绘制列表（图片以SHA1表示）+ 页面尺寸 + 宽度 + 渲染器"""
+    return hashlib.sha1(repr((renderer_key(), slide_size, width, items)).encode()).hexdigest()
+
+
+def render_presentation(prs, out_dir, width=DEFAULT_WIDTH, workers=None, cache_dir=CACHE_DIR):
+    """把每页画成 out_dir/slideNN.png，返回 (路径列表, 新绘制的页数)；命中缓存的页直接复制"""
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(out_dir, exist_ok=True)
+    slide_size = (prs.slide_width, prs.slide_height)
+    layouts, themes, hashes = {}, {}, {}
+    fonts = font_files()
+    cached, jobs = [], {}
+    for slide in prs.slides:
+        images = {}
+        items = display_list(slide, layouts, themes, images, hashes)
+        path = os.path.join(cache_dir, f"{slide_key(items, slide_size, width)}.png")
+        if not os.path.exists(path) and path not in jobs:
+            jobs[path] = (items, images, slide_size, width, fonts, path)
+        cached.append(path)
+
+    if len(jobs) < MIN_POOL_SLIDES or workers == 1:
+        for job in jobs.values():
+            render_slide(job)
+    else:
+        # 进程池按需导入（同 deck_build.py）
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(render_slide, jobs.values()))
+
+    digits = max(len(str(len(cached))), 2)
+    paths = []
+    for slide_no, path in enumerate(cached, 1):
+        paths.append(os.path.join(out_dir, f"slide{slide_no:0{digits}d}.png"))
+        shutil.copyfile(path, paths[-1])
+    # 删除页数减少后多出的旧缩略图
+    for name in os.listdir(out_dir):
+        if name.startswith("slide") and name.endswith(".png") and os.path.join(out_dir, name) not in paths:
+            os.remove(os.path.join(out_dir, name))
+    return paths, len(jobs)
+
+
+# ---------------------------------------------------------------------------
+# 命令行
+# ---------------------------------------------------------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="把PPT每页画成PNG缩略图（按内容哈希缓存）")
+    parser.add_argument("paths", nargs="*", help="要预览的.pptx；不给时在内存中按描述文件构建后预览")
+    parser.add_argument("-o", "--output-dir", help="输出目录（默认 <PPT名>_preview/，按描述文件构建时为 PPT/preview/<版本>_<语言>/）")
+    parser.add_argument("-v", "--version", default="v6")
+    parser.add_argument("-l", "--langs", nargs="+", default=["cn", "en"], help="按描述文件构建时的语言")
+    parser.add_argument("--image-dir", default=os.path.join(os.path.dirname(PPT_DIR), "analyses", "data"))
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="缩略图宽度（像素）")
+    parser.add_argument("-j", "--jobs", type=int, help="进程数（默认CPU核数）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import time
+
+    args = parse_args(argv)
+    if args.paths:
+        from pptx import Presentation
+
+        decks = (
+            (path, Presentation(path), os.path.join(args.output_dir, os.path.splitext(os.path.basename(path))[0])
+             if args.output_dir and len(args.paths) > 1 else args.output_dir or f"{os.path.splitext(path)[0]}_preview")
+            for path in args.paths
+        )
+    else:
+        import deck_engine
+
+        decks = (
+            (f"{args.version}_{lang}", deck_engine.build_presentation(
+                deck_engine.load_spec(deck_engine.spec_path(args.version, lang)), args.image_dir, lint=False),
+             os.path.join(args.output_dir or os.path.join(PPT_DIR, "preview"), f"{args.version}_{lang}"))
+            for lang in args.langs
+        )
+    for name, prs, out_dir in decks:
+        start = time.perf_counter()
+        paths, rendered = render_presentation(prs, out_dir, args.width, args.jobs)
+        print(f"{name}：{len(paths)} 页，新绘制 {rendered} 页，{time.perf_counter() - start:.2f}s -> {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+PC047组会PPT逐页构建剖析
+generate_ppt_v6.py 中的 add_*_slide 构建函数用 @slide_builder 注册；启用剖析时记录每一页：
+- 构建耗时，其中图片加载（读盘/预处理）与XML构建各占多少
+- 形状数、幻灯片XML字节数、引用的媒体字节数
+输出汇总表与Chrome trace JSON（chrome://tracing 或 https://ui.perfetto.dev 打开）。
+未启用剖析时装饰器只多一次全局变量判断。
+
+用法：
+    python PPT/deck_profile.py                                  # v6中文版，打印汇总表
+    python PPT/deck_profile.py -l en --trace trace.json         # 英文版，另存Chrome trace
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import tempfile
+import time
+
+# 构建函数名 -> 包装后的函数
+BUILDERS = {}
+
+# 当前启用的剖析器（None表示未启用）
+_active = None
+
+
+class SlideRecord:
+    """单页的构建记录"""
+
+    __slots__ = ("name", "cached", "start", "end", "image_s", "slide")
+
+    def __init__(self, name, cached=False):
+        self.name = name
+        self.cached = cached
+        self.start = self.end = 0.0
+        self.image_s = 0.0
+        self.slide = None
+
+    @property
+    def seconds(self):
+        return self.end - self.start
+
+    def metrics(self):
+        """形状数、XML字节数、媒体字节数（在构建结束后统计，包含页码等后续添加的内容）"""
+        if self.slide is None:
+            return {"shapes": 0, "xml_bytes": 0, "media_bytes": 0}
+        media = [
+            rel.target_part for rel in self.slide.part.rels.values()
+            if not rel.is_external and rel.target_part.content_type.startswith("image/")
+        ]
+        return {
+            "shapes": len(self.slide.shapes),
+            "xml_bytes": len(self.slide.part.blob),
+            "media_bytes": sum(len(part.blob) for part in media),
+        }
+
+
+class Profiler:
+    """收集逐页记录与trace事件"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.records = []
+        # (名称, 类别, 开始, 时长, 参数)
+        self.events = []
+        self.current = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """记录一个构建阶段（如 build / save）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((name, "phase", start, time.perf_counter() - start, {}))
+
+    def rows(self):
+        """逐页汇总：记录 + 指标"""
+        rows = []
+        for idx, record in enumerate(self.records, 1):
+            row = {
+                "index": idx,
+                "name": record.name,
+                "cached": record.cached,
+                "seconds": record.seconds,
+                "image_seconds": record.image_s,
+                "xml_seconds": record.seconds - record.image_s,
+            }
+            row.update(record.metrics())
+            rows.append(row)
+        return rows
+
+    def trace(self):
+        """Chrome trace格式（ph=X 完整事件，时间单位微秒）"""
+        def us(t):
+            return round((t - self.origin) * 1e6, 1)
+
+        events = []
+        for name, cat, start, duration, args in self.events:
+            events.append({
+                "name": name, "cat": cat, "ph": "X", "pid": 1, "tid": 1,
+                "ts": us(start), "dur": round(duration * 1e6, 1), "args": args,
+            })
+        for row, record in zip(self.rows(), self.records):
+            args = {k: row[k] for k in ("index", "cached", "shapes", "xml_bytes", "media_bytes")}
+            args["image_ms"] = round(record.image_s * 1e3, 3)
+            events.append({
+                "name": record.name, "cat": "slide", "ph": "X", "pid": 1, "tid": 1,
+                "ts": us(record.start), "dur": round(record.seconds * 1e6, 1), "args": args,
+            })
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f, ensure_ascii=False)
+        return path
+
+    def print_summary(self):
+        """打印逐页汇总表，按耗时与体积标出占比"""
+        rows = self.rows()
+        total_s = sum(r["seconds"] for r in rows) or 1.0
+        total_bytes = sum(r["xml_bytes"] + r["media_bytes"] for r in rows) or 1
+        print(
+            f"{'#':>3} {'构建函数':<34}{'耗时(ms)':>10}{'图片(ms)':>10}{'XML(ms)':>10}{'占比':>7}"
+            f"{'形状':>6}{'XML(KB)':>10}{'媒体(KB)':>10}{'体积占比':>9}"
+        )
+        for r in rows:
+            name = r["name"] + (" [缓存]" if r["cached"] else "")
+            size = r["xml_bytes"] + r["media_bytes"]
+            print(
+                f"{r['index']:>3} {name:<34}{r['seconds'] * 1e3:>10.2f}{r['image_seconds'] * 1e3:>10.2f}"
+                f"{r['xml_seconds'] * 1e3:>10.2f}{r['seconds'] / total_s:>7.1%}{r['shapes']:>6}"
+                f"{r['xml_bytes'] / 1024:>10.1f}{r['media_bytes'] / 1024:>10.1f}{size / total_bytes:>9.1%}"
+            )
+        for name, _, _, duration, _ in self.events:
+            if name in ("build", "save"):
+                print(f"{name}: {duration * 1e3:.2f} ms")
+        if rows:
+            slowest = max(rows, key=lambda r: r["seconds"])
+            largest = max(rows, key=lambda r: r["xml_bytes"] + r["media_bytes"])
+            print(f"最耗时：第{slowest['index']}页 {slowest['name']}；体积最大：第{largest['index']}页 {largest['name']}")
+
+
+@contextlib.contextmanager
+def profiling():
+    """在with块内启用剖析，返回Profiler"""
+    global _active
+    previous = _active
+    _active = profiler = Profiler()
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+@contextlib.contextmanager
+def track(name, cached=False):
+    """记录一页的构建；未启用剖析或已在另一页内部（如编译缓存片段）时不记录"""
+    profiler = _active
+    if profiler is None or profiler.current is not None:
+        yield None
+        return
+    record = profiler.current = SlideRecord(name, cached)
+    record.start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.end = time.perf_counter()
+        profiler.current = None
+        profiler.records.append(record)
+
+
+@contextlib.contextmanager
+def image_load(path):
+    """记录一次图片加载，耗时计入当前页"""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        if profiler.current is not None:
+            profiler.current.image_s += duration
+        profiler.events.append((f"load {os.path.basename(path)}", "image", start, duration, {"path": path}))
+
+
+def slide_builder(func):
+    """注册幻灯片构建函数；启用剖析时记录其返回的slide"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active is None:
+            return func(*args, **kwargs)
+        with track(func.__name__) as record:
+            slide = func(*args, **kwargs)
+            if record is not None:
+                record.slide = slide
+        return slide
+
+    BUILDERS[func.__name__] = wrapper
+    return wrapper
+
+
+def profile_deck(spec, output_path, image_dir):
+    """剖析一次完整构建（编译 + 写出），返回Profiler"""
+    import deck_engine
+    import pptx_writer
+
+    with profiling() as profiler:
+        with profiler.phase("build"):
+            prs = deck_engine.build_presentation(spec, image_dir)
+        with profiler.phase("save"):
+            pptx_writer.save(prs, output_path, reproducible=False)
+    return profiler
+
+
+def parse_args(argv=None):
+    ppt_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="逐页剖析PC047组会PPT构建")
+    parser.add_argument("-v", "--version", default="v6", help="描述文件版本（decks/<版本>_<语言>.json）")
+    parser.add_argument("-l", "--lang", default="cn", choices=("cn", "en"))
+    parser.add_argument("--image-dir", default=os.path.join(os.path.dirname(ppt_dir), "analyses", "data"))
+    parser.add_argument("-o", "--output", help="输出PPT路径（默认写到临时目录）")
+    parser.add_argument("--trace", help="Chrome trace JSON输出路径")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import deck_engine
+
+    args = parse_args(argv)
+    spec = deck_engine.load_spec(deck_engine.spec_path(args.version, args.lang))
+    with tempfile.TemporaryDirectory(prefix="pc047_profile_") as tmp:
+        output = args.output or os.path.join(tmp, "deck.pptx")
+        profiler = profile_deck(spec, output, args.image_dir)
+        profiler.print_summary()
+    if args.trace:
+        print(f"trace已保存：{profiler.write_trace(args.trace)}")
+    return profiler
+
+
+if __name__ == "__main__":
+    # 以脚本运行时本文件是 __main__，构建函数注册在导入的 deck_profile 模块上，需经由它启用剖析
+    import deck_profile
+    deck_profile.main()
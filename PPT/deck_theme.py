@@ -0,0 +1,154 @@
+"""
+PC047组会PPT主题与母版
+原来每页都建在空白版式（slide_layouts[6]）上，再逐页重复画一个 primary_blue 标题栏矩形、一个28pt白色标题文本框，
+页码也是逐页的文本框，颜色都是写死在每个形状、每个文本run上的RGB。
+这里在新建Presentation时按 COLORS 生成一次主题与母版：
+- 主题配色：COLORS 写入主题的 clrScheme（accent1 = primary_blue 等），东亚字体设为微软雅黑（与 text_fit.py 的测量一致）
+- 母版的页码占位符：右下角、14pt加粗、accent1
+- 标题版式（改写默认模板的"Title Only"）：版式上画标题栏，标题占位符为28pt加粗、bg1（白色）
+add_header 只把该页的版式改为标题版式并添加一个空样式的标题占位符，add_page_number 只添加页码占位符，
+位置与样式都继承自版式/母版，每页少一个形状，标题与页码的XML也只剩文字。
+"""
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.util import Inches
+
+import fast_shapes
+from deck_colors import COLORS
+
+HEADER_LAYOUT = "PC047 Header"
+# 被改写为标题版式的默认模板版式
+_TEMPLATE_LAYOUT = "Title Only"
+
+# 主题配色槽位 -> COLORS中的颜色
+SCHEME = (
+    ("dk1", "dark_gray"),
+    ("lt1", "white"),
+    ("dk2", "dark_blue"),
+    ("lt2", "light_gray"),
+    ("accent1", "primary_blue"),
+    ("accent2", "orange"),
+    ("accent3", "green"),
+    ("accent4", "red"),
+    ("accent5", "purple"),
+    ("accent6", "teal"),
+    ("hlink", "primary_blue"),
+    ("folHlink", "purple"),
+)
+EA_FONT = "Microsoft YaHei"
+
+# 标题栏与占位符位置（英寸）；页码位置相对右下角
+HEADER_HEIGHT = 1.1
+TITLE_BOX = (0.5, 0.3, 9, 0.6)
+TITLE_SIZE = 28
+PAGE_NUMBER_BOX = (1.0, 0.6, 0.8, 0.4)
+PAGE_NUMBER_SIZE = 14
+
+_NSDECLS = nsdecls("p", "a", "r")
+# 与原文本框一致：不自动换行、随文字调整大小
+_BODY_PR = '<a:bodyPr wrap="none" rtlCol="0"><a:spAutoFit/></a:bodyPr>'
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+
+def _xfrm(x, y, cx, cy):
+    return f'<a:xfrm><a:off x="{int(x)}" y="{int(y)}"/><a:ext cx="{int(cx)}" cy="{int(cy)}"/></a:xfrm>'
+
+
+def _text_style(size, bold, color, align):
+    """占位符的第一级段落样式"""
+    return (
+        f'<a:lstStyle><a:lvl1pPr algn="{align}"><a:defRPr sz="{size * 100}" b="{int(bold)}">'
+        f'<a:solidFill><a:schemeClr val="{color}"/></a:solidFill></a:defRPr></a:lvl1pPr></a:lstStyle>'
+    )
+
+
+def _placeholder(shape_id, name, ph, sp_pr="<p:spPr/>", body_pr="<a:bodyPr/>", lst_style="<a:lstStyle/>", paragraph="<a:p/>"):
+    return (
+        f'<p:sp {_NSDECLS}><p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"/>'
+        f'<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr><p:nvPr>{ph}</p:nvPr></p:nvSpPr>'
+        f'{sp_pr}<p:txBody>{body_pr}{lst_style}{paragraph}</p:txBody></p:sp>'
+    )
+
+
+def _apply_colors(prs):
+    """把COLORS写入主题配色与字体"""
+    theme_part = prs.slide_master.part.part_related_by(RT.THEME)
+    theme = etree.fromstring(theme_part.blob)
+    scheme = theme.find(f".//{_A}clrScheme")
+    scheme.set("name", "PC047")
+    for slot, color in SCHEME:
+        element = scheme.find(f"{_A}{slot}")
+        for child in list(element):
+            element.remove(child)
+        etree.SubElement(element, f"{_A}srgbClr").set("val", str(COLORS[color]))
+    for font in theme.iterfind(f".//{_A}fontScheme/*/{_A}ea"):
+        font.set("typeface", EA_FONT)
+    theme_part._blob = etree.tostring(theme, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _style_page_number(prs):
+    """母版的页码占位符：右下角、加粗、accent1（各版式的页码占位符不覆盖位置与样式）"""
+    right, bottom, width, height = (Inches(v) for v in PAGE_NUMBER_BOX)
+    sptree = prs.slide_master.shapes._spTree
+    for sp in list(sptree.iter(qn("p:sp"))):
+        ph = sp.find(f".//{qn('p:ph')}")
+        if ph is None or ph.get("type") != "sldNum":
+            continue
+        sptree.replace(sp, parse_xml(_placeholder(
+            sp.nvSpPr.cNvPr.id, sp.nvSpPr.cNvPr.name, etree.tostring(ph, encoding="unicode"),
+            sp_pr=f"<p:spPr>{_xfrm(prs.slide_width - right, prs.slide_height - bottom, width, height)}</p:spPr>",
+            body_pr=_BODY_PR,
+            lst_style=_text_style(PAGE_NUMBER_SIZE, True, "accent1", "r"),
+            paragraph=f"<a:p>{fast_shapes.field_xml('slidenum', '‹#›')}</a:p>",
+        )))
+
+
+def _build_header_layout(prs):
+    """把默认模板的"Title Only"版式改写为标题版式：标题栏 + 标题占位符 + 页码占位符"""
+    layout = prs.slide_layouts.get_by_name(_TEMPLATE_LAYOUT)
+    layout._element.cSld.set("name", HEADER_LAYOUT)
+    sptree = layout.shapes._spTree
+    for sp in list(sptree.iter(qn("p:sp"))):
+        sptree.remove(sp)
+    bar = (
+        f'<p:sp {_NSDECLS}><p:nvSpPr><p:cNvPr id="2" name="Header Bar"/><p:cNvSpPr/><p:nvPr userDrawn="1"/></p:nvSpPr>'
+        f'<p:spPr>{_xfrm(0, 0, prs.slide_width, Inches(HEADER_HEIGHT))}<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+        f'<a:solidFill><a:schemeClr val="accent1"/></a:solidFill><a:ln><a:noFill/></a:ln></p:spPr>'
+        f'<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/><a:p><a:endParaRPr lang="en-US"/></a:p></p:txBody></p:sp>'
+    )
+    title = _placeholder(
+        3, "Title 2", '<p:ph type="title"/>',
+        sp_pr=f"<p:spPr>{_xfrm(*(Inches(v) for v in TITLE_BOX))}</p:spPr>",
+        body_pr=_BODY_PR,
+        lst_style=_text_style(TITLE_SIZE, True, "bg1", "l"),
+    )
+    page_number = _placeholder(4, "Slide Number Placeholder 3", '<p:ph type="sldNum" sz="quarter" idx="12"/>')
+    for xml in (bar, title, page_number):
+        sptree.append(parse_xml(xml))
+    return layout
+
+
+def ensure_theme(prs):
+    """返回标题版式；该Presentation还没有应用主题时先应用"""
+    layout = prs.slide_layouts.get_by_name(HEADER_LAYOUT)
+    return layout if layout is not None else apply_theme(prs)
+
+
+def apply_theme(prs):
+    """按COLORS生成主题配色、母版页码样式与标题版式（页面尺寸确定后调用），返回标题版式"""
+    _apply_colors(prs)
+    _style_page_number(prs)
+    return _build_header_layout(prs)
+
+
+def use_layout(slide, layout):
+    """把已创建的幻灯片改为使用另一版式"""
+    part = slide.part
+    for rId, rel in list(part.rels.items()):
+        if rel.reltype == RT.SLIDE_LAYOUT:
+            part.rels.pop(rId)
+    part.relate_to(layout.part, RT.SLIDE_LAYOUT)
+    return slide
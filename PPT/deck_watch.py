@@ -0,0 +1,196 @@
+"""
+PC047组会PPT监视模式
+监视描述文件（decks/*.json）与其引用的图片、结果CSV（analyses/data/*），有变化时增量重建：
+- 每页按 (描述内容, 语言, 页面尺寸, 构建源码哈希, 引用图片与图表CSV的修改时间与大小) 计算输入哈希
+- 输入未变的页直接拼接上次捕获的幻灯片XML片段（含图片关系），只重新构建变化的页
+- 采用轮询（默认0.2秒），不依赖第三方文件监视库；改动构建脚本源码后需重新启动
+
+用法：
+    python PPT/deck_watch.py                    # 监视v6中英文版
+    python PPT/deck_watch.py -l cn --once       # 只增量构建一次（调试用）
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import deck_charts
+import deck_engine
+import pptx_writer
+import results_store
+import slide_cache
+
+POLL_INTERVAL = 0.2
+# 检测到变化后等待文件写完（R保存图片、编辑器保存文本都可能分多次写入）
+SETTLE_DELAY = 0.1
+
+
+def file_signature(path):
+    """(修改时间, 大小)；文件不存在（或@标签未找到，path为None）时为None"""
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class IncrementalDeck:
+    """一份描述文件对应的PPT，保存上次构建的逐页片段"""
+
+    def __init__(self, spec_file, output_path, image_dir):
+        self.spec_file = spec_file
+        self.output_path = output_path
+        self.image_dir = image_dir
+        # 输入哈希 -> SlideFragment
+        self.fragments = {}
+        self.spec = None
+
+    def slide_key(self, slide_spec, ctx, prs):
+        """一页的输入哈希"""
+        h = hashlib.sha1(slide_cache.source_digest().encode())
+        h.update(f"{ctx.lang}|{prs.slide_width}x{prs.slide_height}|".encode())
+        h.update(json.dumps(slide_spec, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        for ref in deck_engine.slide_image_refs(slide_spec) + deck_charts.chart_refs(slide_spec):
+            h.update(f"|{ref}|{file_signature(ctx.image_path(ref))}".encode("utf-8"))
+        return h.hexdigest()
+
+    def watched_paths(self):
+        """需要监视的文件：描述文件 + 引用的图片、图表数据与结果CSV（包括尚不存在的）"""
+        paths = [self.spec_file]
+        if self.spec is not None:
+            paths.extend(results_store.binding_files(self.spec.get("bindings") or {}, self.image_dir))
+            ctx = deck_engine.DeckContext(self.spec.get("lang", "cn"), self.image_dir)
+            for slide_spec in self.spec["slides"]:
+                refs = deck_engine.slide_image_refs(slide_spec) + deck_charts.chart_refs(slide_spec)
+                paths.extend(filter(None, (ctx.image_path(ref) for ref in refs)))
+        return paths
+
+    def build(self):
+        """增量构建并写出，返回统计"""
+        start = time.perf_counter()
+        self.spec = spec = deck_engine.load_spec(self.spec_file)
+        # 先代入结果值，页的输入哈希随之覆盖绑定的数字
+        spec = results_store.bind_spec(spec, self.image_dir)
+        ctx = deck_engine.DeckContext(spec.get("lang", "cn"), self.image_dir)
+        prs = deck_engine.new_presentation(spec)
+
+        fragments = {}
+        rebuilt = 0
+        for idx, (slide_spec, slide_id) in enumerate(zip(spec["slides"], deck_engine.slide_ids(spec)), 1):
+            key = self.slide_key(slide_spec, ctx, prs)
+            fragment = fragments.get(key) or self.fragments.get(key)
+            if fragment is None:
+                slide = deck_engine.add_slide(prs, slide_spec, ctx, idx)
+                fragment = slide_cache.capture_fragment(slide)
+                rebuilt += 1
+            else:
+                slide = slide_cache.splice_fragment(prs, fragment)
+            deck_engine.stamp_slide_id(slide, slide_id)
+            fragments[key] = fragment
+        # 只保留当前各页的片段，旧版本随之释放
+        self.fragments = fragments
+
+        deck_engine.apply_page_numbers(prs, spec)
+        changed = pptx_writer.save(prs, self.output_path)
+        return {
+            "rebuilt": rebuilt,
+            "reused": len(spec["slides"]) - rebuilt,
+            "changed": changed,
+            "seconds": time.perf_counter() - start,
+        }
+
+
+def report(deck, result):
+    status = "已写出" if result["changed"] else "内容未变化"
+    print(
+        f"[{datetime.now():%H:%M:%S}] {os.path.basename(deck.output_path)}：重建 {result['rebuilt']} 页，"
+        f"复用 {result['reused']} 页，{result['seconds']:.2f}s，{status}"
+    )
+
+
+def build_safely(deck):
+    """构建一次；描述文件编辑到一半（JSON不完整）等错误只打印，不退出监视"""
+    try:
+        report(deck, deck.build())
+    except Exception as exc:  # noqa: BLE001 - 监视循环需要继续运行
+        print(f"[{datetime.now():%H:%M:%S}] {os.path.basename(deck.output_path)} 构建失败：{exc}")
+
+
+def snapshot(decks):
+    """当前各文件签名"""
+    return {path: file_signature(path) for deck in decks for path in deck.watched_paths()}
+
+
+def watch(decks, interval=POLL_INTERVAL):
+    """首次完整构建后持续轮询，文件变化时只重建受影响的PPT"""
+    for deck in decks:
+        build_safely(deck)
+    signatures = snapshot(decks)
+    print(f"正在监视 {len(signatures)} 个文件（Ctrl+C 退出）")
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(decks)
+            if current == signatures:
+                continue
+            time.sleep(SETTLE_DELAY)
+            changed = {path for path, sig in snapshot(decks).items() if signatures.get(path) != sig}
+            for deck in decks:
+                if changed.intersection(deck.watched_paths()):
+                    build_safely(deck)
+            # 重建后描述可能引用了新的图片，重新取签名
+            signatures = snapshot(decks)
+    except KeyboardInterrupt:
+        print("\n已停止监视")
+
+
+def make_decks(base_dir, date, version, langs):
+    """为描述文件生成的版本创建增量构建对象"""
+    import deck_build
+
+    if deck_build.VERSIONS.get(version) != "spec":
+        raise ValueError(f"监视模式只支持描述文件生成的版本，{version!r} 是历史脚本")
+    image_dir = os.path.join(base_dir, "analyses", "data")
+    output_dir = os.path.join(base_dir, "PPT", date)
+    os.makedirs(output_dir, exist_ok=True)
+    return [
+        IncrementalDeck(
+            deck_engine.spec_path(version, lang),
+            os.path.join(output_dir, deck_build.OUTPUT_NAMES[lang].format(version=version)),
+            image_dir,
+        )
+        for lang in langs
+    ]
+
+
+def parse_args(argv=None):
+    import deck_build
+
+    parser = argparse.ArgumentParser(description="监视描述文件与图片，增量重建PC047组会PPT")
+    parser.add_argument("--base-dir", default=deck_build.BASE_DIR, help="项目根目录（含 analyses/ 与 PPT/）")
+    parser.add_argument("--date", default=deck_build.MEETING_DATE, help="汇报日期 YYYYMMDD，输出到 PPT/<date>/")
+    parser.add_argument("-v", "--version", default="v6", help="描述文件版本")
+    parser.add_argument("-l", "--langs", nargs="+", default=list(deck_build.LANGS), choices=deck_build.LANGS)
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="轮询间隔（秒）")
+    parser.add_argument("--once", action="store_true", help="只构建一次后退出")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    decks = make_decks(args.base_dir, args.date, args.version, args.langs)
+    if args.once:
+        for deck in decks:
+            report(deck, deck.build())
+        return decks
+    watch(decks, args.interval)
+    return decks
+
+
+if __name__ == "__main__":
+    main()
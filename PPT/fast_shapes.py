@@ -0,0 +1,168 @@
+"""
+PC047组会PPT快速形状生成
+python-pptx每创建一个形状都要经过 add_shape -> fill.solid -> line.color -> text_frame -> paragraphs[0] -> font
+一连串代理对象，每一步都在XML树里查找、插入节点；分配形状ID时还要扫描整页所有id。
+这里根据形状描述一次性拼出完整的 <p:sp> 元素再解析为lxml节点，输出与python-pptx逐步设置的结果一致。
+"""
+
+import weakref
+from xml.sax.saxutils import escape, quoteattr
+
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+
+_NSDECLS = nsdecls("p", "a", "r")
+
+# 预设几何 -> python-pptx默认形状名
+SHAPE_NAMES = {
+    "rect": "Rectangle",
+    "roundRect": "Rounded Rectangle",
+    "ellipse": "Oval",
+    "rightArrow": "Right Arrow",
+    "downArrow": "Down Arrow",
+}
+
+# 占位符类型 -> python-pptx默认形状名
+PLACEHOLDER_NAMES = {"title": "Title", "sldNum": "Slide Number Placeholder"}
+# 字段ID（PowerPoint以此区分同一页中的字段，固定值保证可复现构建）
+FIELD_ID = "{B6F15528-21DE-4FAA-801E-634DDDAF4B2B}"
+
+ALIGN = {"left": "l", "center": "ctr", "right": "r", "justify": "just"}
+
+# 自选图形的默认主题样式（与python-pptx的add_shape一致）
+_AUTOSHAPE_STYLE = (
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+)
+
+# spTree -> (子节点数, 下一个可用ID)；子节点数变化说明有其它代码插入了形状，需要重新扫描
+_next_ids = weakref.WeakKeyDictionary()
+
+
+def _next_shape_id(sptree):
+    """下一个可用形状ID（连续添加时不再重复扫描整页）"""
+    cached = _next_ids.get(sptree)
+    if cached is not None and cached[0] == len(sptree):
+        return cached[1]
+    ids = [int(v) for v in sptree.xpath("//@id") if v.isdigit()]
+    return max(ids, default=0) + 1
+
+
+def _color(rgb):
+    """RGBColor -> <a:solidFill>"""
+    return f'<a:solidFill><a:srgbClr val="{rgb}"/></a:solidFill>'
+
+
+def _paragraph_xml(text, font_size=None, bold=None, italic=None, color=None, align=None, tight=False):
+    """单个段落：段落默认字体 + 按换行拆分的文本段"""
+    ppr_attrs = f' algn="{ALIGN[align]}"' if align else ""
+    spacing = ""
+    if tight:
+        spacing = '<a:spcBef><a:spcPts val="0"/></a:spcBef><a:spcAft><a:spcPts val="0"/></a:spcAft>'
+
+    rpr_attrs = ""
+    if font_size is not None:
+        rpr_attrs += f' sz="{int(font_size * 100)}"'
+    if bold is not None:
+        rpr_attrs += f' b="{int(bool(bold))}"'
+    if italic is not None:
+        rpr_attrs += f' i="{int(bool(italic))}"'
+    def_rpr = ""
+    if rpr_attrs or color is not None:
+        fill = _color(color) if color is not None else ""
+        def_rpr = f"<a:defRPr{rpr_attrs}>{fill}</a:defRPr>" if fill else f"<a:defRPr{rpr_attrs}/>"
+
+    ppr = ""
+    if ppr_attrs or spacing or def_rpr:
+        inner = spacing + def_rpr
+        ppr = f"<a:pPr{ppr_attrs}>{inner}</a:pPr>" if inner else f"<a:pPr{ppr_attrs}/>"
+
+    runs = []
+    for i, line in enumerate(text.replace("\v", "\n").split("\n")):
+        if i:
+            runs.append("<a:br/>")
+        if line:
+            runs.append(f"<a:r><a:t>{escape(line)}</a:t></a:r>")
+    return f"<a:p>{ppr}{''.join(runs)}</a:p>"
+
+
+def shape_xml(shape_id, x, y, cx, cy, geometry="rect", adj=None, fill=None, line=None, line_width=None,
+              no_line=False, textbox=False, text="", font_size=None, bold=None, italic=None, color=None,
+              align=None, word_wrap=None, tight=False):
+    """根据形状描述生成完整的 <p:sp> XML（坐标与线宽单位EMU）"""
+    if textbox:
+        name = f"TextBox {shape_id - 1}"
+        nv = f'<p:nvSpPr><p:cNvPr id="{shape_id}" name={quoteattr(name)}/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+        geom = '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/>'
+        style = ""
+        wrap = ' wrap="square"' if word_wrap else ' wrap="none"'
+        body_pr = f"<a:bodyPr{wrap}><a:spAutoFit/></a:bodyPr>"
+    else:
+        name = f"{SHAPE_NAMES.get(geometry, geometry)} {shape_id - 1}"
+        nv = f'<p:nvSpPr><p:cNvPr id="{shape_id}" name={quoteattr(name)}/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+        av = f'<a:avLst><a:gd name="adj" fmla="val {int(round(adj * 100000))}"/></a:avLst>' if adj is not None else "<a:avLst/>"
+        geom = f'<a:prstGeom prst="{geometry}">{av}</a:prstGeom>'
+        if fill is not None:
+            geom += _color(fill)
+        if no_line:
+            geom += "<a:ln><a:noFill/></a:ln>"
+        elif line is not None or line_width is not None:
+            w = f' w="{int(line_width)}"' if line_width is not None else ""
+            geom += f"<a:ln{w}>{_color(line) if line is not None else ''}</a:ln>"
+        style = _AUTOSHAPE_STYLE
+        wrap = ' wrap="square"' if word_wrap else (' wrap="none"' if word_wrap is False else "")
+        body_pr = f'<a:bodyPr rtlCol="0" anchor="ctr"{wrap}/>'
+        # 自选图形的段落默认居中（与python-pptx模板一致）
+        align = align or "center"
+
+    sp_pr = (
+        f'<p:spPr><a:xfrm><a:off x="{int(x)}" y="{int(y)}"/><a:ext cx="{int(cx)}" cy="{int(cy)}"/></a:xfrm>'
+        f"{geom}</p:spPr>"
+    )
+    paragraph = _paragraph_xml(text, font_size, bold, italic, color, align, tight)
+    return (
+        f"<p:sp {_NSDECLS}>{nv}{sp_pr}{style}"
+        f"<p:txBody>{body_pr}<a:lstStyle/>{paragraph}</p:txBody></p:sp>"
+    )
+
+
+def field_xml(kind, text):
+    """文本字段（如页码 slidenum），text为保存时的显示值"""
+    return f'<a:fld id="{FIELD_ID}" type="{kind}"><a:t>{escape(text)}</a:t></a:fld>'
+
+
+def placeholder_xml(shape_id, ph_type, text="", idx=None, sz=None, field=None):
+    """版式占位符 <p:sp>：位置与样式都继承自版式/母版，只写文字（field为字段类型时写为字段）"""
+    name = f"{PLACEHOLDER_NAMES.get(ph_type, ph_type)} {shape_id - 1}"
+    attrs = f' type="{ph_type}"'
+    if sz is not None:
+        attrs += f' sz="{sz}"'
+    if idx is not None:
+        attrs += f' idx="{idx}"'
+    paragraph = f"<a:p>{field_xml(field, text)}</a:p>" if field else _paragraph_xml(text)
+    return (
+        f'<p:sp {_NSDECLS}><p:nvSpPr><p:cNvPr id="{shape_id}" name={quoteattr(name)}/>'
+        f'<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr><p:nvPr><p:ph{attrs}/></p:nvPr></p:nvSpPr>'
+        f"<p:spPr/><p:txBody><a:bodyPr/><a:lstStyle/>{paragraph}</p:txBody></p:sp>"
+    )
+
+
+def _append(slide, make_xml):
+    sptree = slide.shapes._spTree
+    shape_id = _next_shape_id(sptree)
+    sp = parse_xml(make_xml(shape_id))
+    sptree.append(sp)
+    _next_ids[sptree] = (len(sptree), shape_id + 1)
+    return slide.shapes._shape_factory(sp)
+
+
+def add_sp(slide, x, y, cx, cy, **desc):
+    """一次性生成 <p:sp> 并追加到slide，返回python-pptx形状对象"""
+    return _append(slide, lambda shape_id: shape_xml(shape_id, x, y, cx, cy, **desc))
+
+
+def add_placeholder(slide, ph_type, text="", **desc):
+    """添加继承版式位置与样式的占位符，返回python-pptx形状对象"""
+    return _append(slide, lambda shape_id: placeholder_xml(shape_id, ph_type, text, **desc))
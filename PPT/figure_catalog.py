@@ -0,0 +1,252 @@
+"""
+PC047分析图片目录
+构建脚本原来用 os.path.join + os.path.exists 拼路径找图，图片换了位置就静默丢失。
+这里扫描 analyses/data/** 与 analyses/_freeze/*/figure-html/*.png，把每张图的
+路径、标签、像素尺寸、字节数、内容SHA1 记入 PPT/.cache/figures.sqlite：
+- 标签为文件名去掉扩展名：ggsave导出的 47_part4_summary_figure，Quarto代码块图 part4-summary-1
+- 按文件的修改时间与大小增量扫描，未变化的图片不再读取
+- 载入后按 标签 / 分析名/标签 建内存字典，查找为O(1)
+
+描述文件中以 "@part4-summary-1" 或 "@01_alpha_beta_diversity_analysis/part4-summary-1" 引用；
+同名标签出现在多处时 analyses/data 优先于 _freeze，同一来源内重名则需写全分析名。
+
+用法：
+    python PPT/figure_catalog.py                 # 扫描并列出全部图片
+    python PPT/figure_catalog.py part4-summary-1 # 查找某个标签
+"""
+
+import argparse
+import os
+import sqlite3
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(PPT_DIR, ".cache", "figures.sqlite")
+
+# (来源, 相对analyses的目录)；排在前面的来源在标签重名时优先
+SOURCES = (
+    ("data", "data"),
+    ("freeze", "_freeze"),
+)
+FIGURE_EXTS = (".png", ".jpg", ".jpeg", ".svg", ".pdf")
+# Pillow能读出尺寸的格式
+RASTER_EXTS = (".png", ".jpg", ".jpeg")
+# 同一目录下只有扩展名不同的同名图片（R脚本同时导出SVG与PNG）按该顺序选用：矢量图优先，PDF不能嵌入
+EXT_PREFERENCE = (".svg", ".png", ".jpg", ".jpeg", ".pdf")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS figures (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    source TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    label TEXT NOT NULL,
+    rel TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS figures_by_root ON figures (root);
+"""
+
+_COLUMNS = "path, source, analysis, label, rel, width, height, bytes, mtime_ns, sha1"
+
+
+class Figure:
+    """目录中的一张图片"""
+
+    __slots__ = ("path", "source", "analysis", "label", "rel", "width", "height", "bytes", "mtime_ns", "sha1")
+
+    def __init__(self, path, source, analysis, label, rel, width, height, bytes, mtime_ns, sha1):
+        self.path = path
+        self.source = source
+        self.analysis = analysis
+        self.label = label
+        self.rel = rel
+        self.width = width
+        self.height = height
+        self.bytes = bytes
+        self.mtime_ns = mtime_ns
+        self.sha1 = sha1
+
+    @property
+    def key(self):
+        """分析名/标签"""
+        return f"{self.analysis}/{self.label}"
+
+    def to_json(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != "mtime_ns"}
+
+
+def figure_label(path):
+    """文件名去掉扩展名"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def image_size(path):
+    """像素尺寸；矢量图等读不出时为 (None, None)"""
+    if not path.lower().endswith(RASTER_EXTS):
+        return None, None
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            return image.size
+    except OSError:
+        return None, None
+
+
+def scan(analyses_dir):
+    """全部分析图片：(来源, 分析名, 相对analyses的路径, 绝对路径)"""
+    for source, subdir in SOURCES:
+        top = os.path.join(analyses_dir, subdir)
+        if not os.path.isdir(top):
+            continue
+        for analysis in sorted(os.listdir(top)):
+            analysis_dir = os.path.join(top, analysis)
+            if not os.path.isdir(analysis_dir):
+                continue
+            if source == "freeze":
+                # Quarto冻结结果中只有 figure-html 下是代码块输出的图
+                figure_dir = os.path.join(analysis_dir, "figure-html")
+                if os.path.isdir(figure_dir):
+                    for filename in sorted(os.listdir(figure_dir)):
+                        if filename.lower().endswith(".png"):
+                            path = os.path.join(figure_dir, filename)
+                            yield source, analysis, os.path.relpath(path, analyses_dir).replace(os.sep, "/"), path
+                continue
+            for dirpath, dirnames, filenames in os.walk(analysis_dir):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(FIGURE_EXTS):
+                        path = os.path.join(dirpath, filename)
+                        yield source, analysis, os.path.relpath(path, analyses_dir).replace(os.sep, "/"), path
+
+
+class FigureCatalog:
+    """一个 analyses 目录的图片索引"""
+
+    def __init__(self, analyses_dir, db_path=DB_PATH):
+        self.analyses_dir = os.path.abspath(analyses_dir)
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path, timeout=30)
+        self._db.executescript(_SCHEMA)
+        self.figures = []
+        # 分析名/标签 -> Figure；标签 -> [Figure, ...]（按来源优先级排序）
+        self._by_key = {}
+        self._by_label = {}
+
+    def close(self):
+        self._db.close()
+
+    def refresh(self):
+        """增量扫描：新增或变化的图片重新读取尺寸与哈希，已删除的移出索引；返回重新读取的图片数"""
+        from image_cache import source_sha1
+
+        known = {
+            row[0]: row
+            for row in self._db.execute(f"SELECT {_COLUMNS} FROM figures WHERE root = ?", (self.analyses_dir,))
+        }
+        rows = []
+        measured = 0
+        with self._db:
+            for source, analysis, rel, path in scan(self.analyses_dir):
+                stat = os.stat(path)
+                row = known.pop(path, None)
+                if row is None or (row[8], row[7]) != (stat.st_mtime_ns, stat.st_size):
+                    width, height = image_size(path)
+                    row = (
+                        path, source, analysis, figure_label(path), rel,
+                        width, height, stat.st_size, stat.st_mtime_ns, source_sha1(path),
+                    )
+                    self._db.execute(
+                        f"INSERT OR REPLACE INTO figures (root, {_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (self.analyses_dir, *row),
+                    )
+                    measured += 1
+                rows.append(row)
+            self._db.executemany("DELETE FROM figures WHERE path = ?", ((path,) for path in known))
+        self._load(rows)
+        return measured
+
+    def _load(self, rows):
+        self.figures = [Figure(*row) for row in rows]
+        self._by_key = {}
+        self._by_label = {}
+        for figure in self.figures:
+            self._by_key.setdefault(figure.key, figure)
+            self._by_label.setdefault(figure.label, []).append(figure)
+
+    def candidates(self, label):
+        """某标签的全部图片"""
+        label = label.lstrip("@")
+        figure = self._by_key.get(label)
+        if figure is not None:
+            return [figure]
+        return self._by_label.get(label, [])
+
+    def lookup(self, label):
+        """标签（可带 @ 与 分析名/ 前缀）-> Figure；找不到时为None，无法区分的重名报错"""
+        found = self.candidates(label)
+        if len(found) > 1:
+            preferred = [f for f in found if f.source == found[0].source]
+            if len(preferred) > 1 and len({os.path.splitext(f.path)[0] for f in preferred}) == 1:
+                preferred = [min(preferred, key=lambda f: EXT_PREFERENCE.index(os.path.splitext(f.path)[1].lower()))]
+            if len(preferred) > 1:
+                keys = ", ".join(f.key for f in preferred)
+                raise ValueError(f"图片标签 {label!r} 对应多张图片（{keys}），请写成 @分析名/标签")
+            found = preferred
+        return found[0] if found else None
+
+    def path(self, label):
+        """标签 -> 绝对路径；找不到时为None"""
+        figure = self.lookup(label)
+        return figure.path if figure else None
+
+
+_catalogs = {}
+
+
+def open_catalog(analyses_dir, db_path=DB_PATH):
+    """进程内共享的图片目录；每次打开做一次增量扫描（未变化的图片只需stat）"""
+    key = (os.path.abspath(analyses_dir), db_path)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = _catalogs[key] = FigureCatalog(analyses_dir, db_path)
+    catalog.refresh()
+    return catalog
+
+
+def print_figures(figures):
+    print(f"{'标签':<44}{'尺寸':>12}{'大小(KB)':>10}  路径")
+    for figure in figures:
+        size = f"{figure.width}x{figure.height}" if figure.width else "-"
+        print(f"{figure.label:<44}{size:>12}{figure.bytes / 1024:>10.1f}  {figure.rel}")
+    print(f"\n共 {len(figures)} 张图片，{sum(f.bytes for f in figures) / 1024 / 1024:.1f} MB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="扫描并查找PC047分析图片")
+    parser.add_argument("labels", nargs="*", help="要查找的标签（不给则列出全部）")
+    parser.add_argument("--analyses-dir", default=os.path.join(os.path.dirname(PPT_DIR), "analyses"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    catalog = open_catalog(args.analyses_dir)
+    if not args.labels:
+        print_figures(catalog.figures)
+        return catalog
+    for label in args.labels:
+        found = catalog.candidates(label)
+        print(f"@{label.lstrip('@')}：" + ("未找到" if not found else ""))
+        for figure in found:
+            print(f"  {figure.path}  {figure.width}x{figure.height}  {figure.sha1[:12]}")
+    return catalog
+
+
+if __name__ == "__main__":
+    main()
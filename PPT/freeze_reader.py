@@ -0,0 +1,370 @@
+"""
+PC047 Quarto冻结结果读取
+analyses/_freeze/<分析>/execute-results/html.json 保存了渲染后的全部代码块输出（打印的统计量、表格、图片引用），
+整份文档是 result.markdown 这一个JSON字符串（02_functional_profiling 约585 KB）。
+这里不整份 json.load，而是按块流式扫描文件中的转义字符串：
+- 逐行切分 markdown，把顶层 ::: {.cell} 代码单元的字节区间（在html.json中的偏移）记入 PPT/.cache/freeze.sqlite
+- 单元标签取自输出图片名（figure-html/part2-stats-barplot-1.png -> part2-stats-barplot），
+  否则按代码开头几行对应到 analyses/<分析>.qmd 中的 #| label；都没有时为 cell-<序号>
+- html.json 或 qmd 未变化时直接使用缓存的索引；读取一个单元只需 seek + 解码该区间
+
+用法：
+    python PPT/freeze_reader.py                                             # 列出各分析的单元标签
+    python PPT/freeze_reader.py 04_network_analysis part2-bootstrap-stability  # 打印该单元的输出
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYSES_DIR = os.path.join(os.path.dirname(PPT_DIR), "analyses")
+DB_PATH = os.path.join(PPT_DIR, ".cache", "freeze.sqlite")
+
+BLOCK_SIZE = 1 << 16
+# 索引规则变化时递增，已缓存的索引随之失效
+INDEX_VERSION = 1
+
+_MARKDOWN_KEY = re.compile(rb'"markdown"\s*:\s*"')
+# JSON字符串中的转义序列或结束引号（UTF-8多字节字符的字节都不小于0x80，不会误匹配）
+_ESCAPE = re.compile(rb'\\.|"', re.S)
+_FIGURE = re.compile(r"!\[[^\]]*\]\(([^)\s]+)\)")
+_FIGURE_INDEX = re.compile(r"-\d+$")
+_CHUNK_HEADER = re.compile(r"^```\{r[ ,]*([^,}\s=]*)")
+_CHUNK_LABEL = re.compile(r"^#\|\s*label:\s*(\S+)")
+_SEPARATOR = re.compile(r"^#+\s*[-=#*~]*\s*$")
+# 以代码开头几行对应qmd中的代码块
+SIGNATURE_LINES = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    path TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    PRIMARY KEY (path, seq)
+);
+"""
+
+
+def decode(raw):
+    """html.json中一段转义文本 -> 字符串"""
+    return json.loads(b'"' + raw + b'"')
+
+
+def iter_markdown_lines(f):
+    """流式读取 result.markdown，逐行生成 (起始偏移, 结束偏移, 行文本)；偏移为该行转义文本在文件中的字节位置"""
+    buf = b""
+    base = 0
+    # 先找到 "markdown": " ，之前的内容（hash、engine）丢弃
+    while True:
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            return
+        buf += block
+        match = _MARKDOWN_KEY.search(buf)
+        if match:
+            line_start = base + match.end()
+            break
+        # 保留末尾，防止键名跨块
+        keep = min(len(buf), 32)
+        base += len(buf) - keep
+        buf = buf[-keep:]
+
+    while True:
+        pos = line_start - base
+        for match in _ESCAPE.finditer(buf, pos):
+            token = match.group()
+            if token == b"\\n" or token == b'"':
+                end = base + match.start()
+                yield line_start, end, decode(buf[line_start - base:match.start()])
+                line_start = base + match.end()
+                if token == b'"':
+                    return
+        # 未结束的行留到下一块（行首总在转义序列边界上，从这里重新扫描是安全的）
+        buf = buf[line_start - base:]
+        base = line_start
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            raise ValueError("html.json 中的 markdown 字符串不完整")
+        buf += block
+
+
+def iter_cells(lines):
+    """把markdown行分组为顶层代码单元，生成 (起始偏移, 结束偏移, 行列表)"""
+    depth = 0
+    fenced = False
+    start = None
+    cell = []
+    for line_start, line_end, line in lines:
+        stripped = line.strip()
+        if depth:
+            cell.append(line)
+            if stripped.startswith("```"):
+                fenced = not fenced
+            elif not fenced and stripped.startswith(":::"):
+                depth += -1 if stripped == ":::" else 1
+                if not depth:
+                    yield start, line_end, cell
+        elif stripped.startswith("::: {.cell"):
+            depth = 1
+            fenced = False
+            start = line_start
+            cell = [line]
+
+
+class Chunk:
+    """一个代码单元的内容"""
+
+    __slots__ = ("analysis", "label", "code", "output", "figures")
+
+    def __init__(self, analysis, label, code, output, figures):
+        self.analysis = analysis
+        self.label = label
+        self.code = code
+        self.output = output
+        self.figures = figures
+
+    @property
+    def text(self):
+        """打印输出（#> 行、cell-output块、表格）"""
+        return "\n".join(self.output)
+
+    def to_json(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def parse_cell(lines):
+    """单元行 -> (代码行, 输出行, 图片路径)"""
+    code, output, figures = [], [], []
+    mode = None
+    for line in lines[1:-1]:
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            mode = None if mode else ("code" if "cell-code" in stripped else "output")
+        elif mode == "code":
+            if line.startswith("#>"):
+                output.append(line[3:] if line.startswith("#> ") else line[2:])
+            else:
+                code.append(line)
+        elif mode == "output":
+            output.append(line)
+        elif not stripped.startswith(":::"):
+            found = _FIGURE.findall(line)
+            if found:
+                figures.extend(found)
+            elif stripped:
+                output.append(line)
+    # 去掉首尾空行
+    while output and not output[-1].strip():
+        output.pop()
+    while output and not output[0].strip():
+        output.pop(0)
+    return code, output, figures
+
+
+def code_signature(code):
+    """代码的前几个有效行（跳过空行、#| 选项行与 # ----- 之类的分隔注释）"""
+    lines = []
+    for line in code:
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#|") and not _SEPARATOR.match(stripped):
+            lines.append(stripped)
+            if len(lines) == SIGNATURE_LINES:
+                break
+    return "\n".join(lines) or None
+
+
+def qmd_labels(path):
+    """qmd源文件：{代码开头: 代码块标签}（开头相同的块无法区分，不收录）"""
+    if not os.path.exists(path):
+        return {}
+    labels, seen = {}, set()
+    label = code = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if code is None:
+                match = _CHUNK_HEADER.match(line)
+                if match:
+                    label, code = match.group(1) or None, []
+                continue
+            if line.startswith("```"):
+                signature = code_signature(code)
+                if label and signature:
+                    if signature in seen:
+                        labels.pop(signature, None)
+                    else:
+                        labels[signature] = label
+                    seen.add(signature)
+                label = code = None
+                continue
+            match = _CHUNK_LABEL.match(line)
+            if match:
+                label = match.group(1)
+            else:
+                code.append(line)
+    return labels
+
+
+def index_file(path, qmd_path):
+    """扫描一个html.json，返回 [(序号, 标签, 起始偏移, 结束偏移)]"""
+    labels = qmd_labels(qmd_path)
+    rows, used = [], set()
+    with open(path, "rb") as f:
+        for seq, (start, end, lines) in enumerate(iter_cells(iter_markdown_lines(f)), 1):
+            code, _, figures = parse_cell(lines)
+            label = None
+            for figure in figures:
+                if "figure-html/" in figure:
+                    label = _FIGURE_INDEX.sub("", os.path.splitext(os.path.basename(figure))[0])
+                    break
+            label = label or labels.get(code_signature(code)) or f"cell-{seq}"
+            # 同一标签对应多个单元（如一个块拆成多段输出）时，后面的加序号
+            if label in used:
+                label = f"{label}#{seq}"
+            used.add(label)
+            rows.append((seq, label, start, end))
+    return rows
+
+
+class FreezeReader:
+    """analyses/_freeze 下全部冻结结果的单元索引"""
+
+    def __init__(self, analyses_dir=ANALYSES_DIR, db_path=DB_PATH):
+        self.analyses_dir = os.path.abspath(analyses_dir)
+        self.freeze_dir = os.path.join(self.analyses_dir, "_freeze")
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path, timeout=30)
+        self._db.executescript(_SCHEMA)
+        # 分析名 -> {标签: (起始偏移, 结束偏移)}
+        self._index = {}
+
+    def close(self):
+        self._db.close()
+
+    def results_path(self, analysis):
+        return os.path.join(self.freeze_dir, analysis, "execute-results", "html.json")
+
+    def analyses(self):
+        """有冻结结果的分析"""
+        if not os.path.isdir(self.freeze_dir):
+            return []
+        return [name for name in sorted(os.listdir(self.freeze_dir)) if os.path.exists(self.results_path(name))]
+
+    def _signature(self, analysis):
+        parts = [str(INDEX_VERSION)]
+        for path in (self.results_path(analysis), os.path.join(self.analyses_dir, f"{analysis}.qmd")):
+            try:
+                stat = os.stat(path)
+                parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                parts.append("-")
+        return "|".join(parts)
+
+    def refresh(self):
+        """html.json或qmd有变化的分析重新建索引；返回重新索引的文件数"""
+        indexed = 0
+        self._index = {}
+        with self._db:
+            for analysis in self.analyses():
+                path = self.results_path(analysis)
+                signature = self._signature(analysis)
+                row = self._db.execute("SELECT signature FROM files WHERE path = ?", (path,)).fetchone()
+                if row is None or row[0] != signature:
+                    rows = index_file(path, os.path.join(self.analyses_dir, f"{analysis}.qmd"))
+                    self._db.execute("DELETE FROM chunks WHERE path = ?", (path,))
+                    self._db.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?, ?)", ((path, *r) for r in rows))
+                    self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?)", (path, signature))
+                    indexed += 1
+        return indexed
+
+    def labels(self, analysis):
+        """{标签: (起始偏移, 结束偏移)}，按文档顺序"""
+        index = self._index.get(analysis)
+        if index is None:
+            index = self._index[analysis] = {
+                label: (start, end)
+                for label, start, end in self._db.execute(
+                    "SELECT label, start, end FROM chunks WHERE path = ? ORDER BY seq", (self.results_path(analysis),)
+                )
+            }
+        return index
+
+    def raw(self, analysis, label):
+        """单元的markdown原文"""
+        try:
+            start, end = self.labels(analysis)[label]
+        except KeyError:
+            raise KeyError(f"冻结结果 {analysis} 中没有单元 {label!r}") from None
+        with open(self.results_path(analysis), "rb") as f:
+            f.seek(start)
+            return decode(f.read(end - start))
+
+    def chunk(self, analysis, label):
+        """按标签读取单元"""
+        code, output, figures = parse_cell(self.raw(analysis, label).split("\n"))
+        return Chunk(analysis, label, code, output, figures)
+
+
+_readers = {}
+
+
+def open_reader(analyses_dir=ANALYSES_DIR, db_path=DB_PATH):
+    """进程内共享的读取器；每次打开检查一次文件是否变化"""
+    key = (os.path.abspath(analyses_dir), db_path)
+    reader = _readers.get(key)
+    if reader is None:
+        reader = _readers[key] = FreezeReader(analyses_dir, db_path)
+    reader.refresh()
+    return reader
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="按标签读取Quarto冻结结果中的代码块输出")
+    parser.add_argument("analysis", nargs="?", help="分析名，如 04_network_analysis")
+    parser.add_argument("labels", nargs="*", help="单元标签，如 part2-bootstrap-stability")
+    parser.add_argument("--analyses-dir", default=ANALYSES_DIR)
+    parser.add_argument("--code", action="store_true", help="同时打印代码")
+    parser.add_argument("--json", action="store_true", help="以JSON输出")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    reader = open_reader(args.analyses_dir)
+    if not args.labels:
+        for analysis in [args.analysis] if args.analysis else reader.analyses():
+            labels = reader.labels(analysis)
+            print(f"{analysis}（{len(labels)} 个单元）")
+            for label in labels:
+                print(f"  {label}")
+        return reader
+    try:
+        chunks = [reader.chunk(args.analysis, label) for label in args.labels]
+    except KeyError as exc:
+        raise SystemExit(exc.args[0]) from None
+    if args.json:
+        print(json.dumps([c.to_json() for c in chunks], ensure_ascii=False, indent=2))
+        return reader
+    for chunk in chunks:
+        print(f"## {chunk.analysis} / {chunk.label}")
+        if args.code:
+            print("\n".join(chunk.code))
+            print("-" * 40)
+        print(chunk.text)
+        for figure in chunk.figures:
+            print(f"[图] {figure}")
+    return reader
+
+
+if __name__ == "__main__":
+    main()
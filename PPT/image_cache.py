@@ -0,0 +1,167 @@
+"""
+PC047组会PPT图片预处理缓存
+ggsave导出的300dpi PNG在幻灯片上只显示约4英寸宽，直接嵌入会让PPT体积和保存时间成倍增加。
+这里按显示尺寸和目标DPI降采样并重新编码：
+- 线条图/统计图 -> 优化PNG（颜色数少时转调色板）
+- 照片类图片（颜色极多且无透明通道）-> JPEG
+结果缓存在 PPT/.cache/images/，文件名由 源文件SHA1 + 目标像素尺寸 + 格式 决定，重复构建直接复用。
+SVG原样嵌入（见 media_store.py），这里只生成一次低分辨率的PNG回退图，供不支持SVG的旧版Office显示。
+"""
+
+import hashlib
+import io
+import os
+import re
+import sys
+
+from PIL import Image
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(PPT_DIR, ".cache", "images")
+
+TARGET_DPI = 200
+JPEG_QUALITY = 85
+# 降采样后独立颜色数超过该值视为照片类图片
+PHOTO_COLOR_THRESHOLD = 65536
+# SVG的PNG回退图的分辨率
+FALLBACK_DPI = 96
+# 设为1时，既没有cairosvg也没有同名位图的SVG使用空白回退图（默认报错）
+BLANK_FALLBACK_ENV = "PC047_BLANK_SVG_FALLBACK"
+
+# SVG长度单位 -> 英寸（无单位按CSS像素，96px/英寸）
+_SVG_UNITS = {"": 1 / 96, "px": 1 / 96, "pt": 1 / 72, "pc": 1 / 6, "in": 1, "cm": 1 / 2.54, "mm": 1 / 25.4}
+_SVG_LENGTH = re.compile(r"^\s*([\d.]+)\s*([a-z]*)\s*$")
+
+# (路径, mtime, 大小) -> 源文件SHA1，避免同一进程内重复读盘计算
+_source_hashes = {}
+
+
+def source_sha1(path):
+    """源文件内容的SHA1（进程内按mtime/大小缓存）"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _source_hashes.get(key)
+    if digest is None:
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = _source_hashes[key] = h.hexdigest()
+    return digest
+
+
+def target_size(src_size, width_in=None, height_in=None, dpi=TARGET_DPI):
+    """按显示尺寸计算目标像素尺寸（保持宽高比，不放大）"""
+    src_w, src_h = src_size
+    if width_in is not None:
+        scale = width_in * dpi / src_w
+    elif height_in is not None:
+        scale = height_in * dpi / src_h
+    else:
+        scale = 1.0
+    scale = min(scale, 1.0)
+    return max(1, round(src_w * scale)), max(1, round(src_h * scale))
+
+
+def is_photographic(image):
+    """颜色数极多且无透明通道的图片按照片处理"""
+    if image.mode in ("RGBA", "LA", "P") or "transparency" in image.info:
+        return False
+    return image.convert("RGB").getcolors(maxcolors=PHOTO_COLOR_THRESHOLD) is None
+
+
+def _encode(image, path, fmt, dpi):
+    """按格式编码写入path"""
+    if fmt == "jpg":
+        image.convert("RGB").save(path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True, dpi=(dpi, dpi))
+        return
+    if image.mode not in ("RGBA", "LA", "P"):
+        image = image.convert("RGB")
+        if image.getcolors(maxcolors=256) is not None:
+            image = image.quantize(colors=256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    image.save(path, "PNG", optimize=True, dpi=(dpi, dpi))
+
+
+def preprocess_image(path, width_in=None, height_in=None, dpi=TARGET_DPI, cache_dir=CACHE_DIR):
+    """返回按显示尺寸预处理后的缓存图片路径"""
+    digest = source_sha1(path)
+    with Image.open(path) as src:
+        size = target_size(src.size, width_in, height_in, dpi)
+        # 先按尺寸查缓存，命中时不必解码像素
+        for fmt in ("png", "jpg"):
+            cached = os.path.join(cache_dir, f"{digest[:16]}_{size[0]}x{size[1]}_{dpi}.{fmt}")
+            if os.path.exists(cached):
+                return cached
+
+        image = src.copy() if size == src.size else src.resize(size, Image.Resampling.LANCZOS)
+
+    fmt = "jpg" if is_photographic(image) else "png"
+    cached = os.path.join(cache_dir, f"{digest[:16]}_{size[0]}x{size[1]}_{dpi}.{fmt}")
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cached}.{os.getpid()}.tmp"
+    _encode(image, tmp_path, fmt, dpi)
+    os.replace(tmp_path, cached)
+    return cached
+
+
+def _svg_length(value):
+    match = _SVG_LENGTH.match(value or "")
+    if not match or match.group(2) not in _SVG_UNITS:
+        return None
+    return float(match.group(1)) * _SVG_UNITS[match.group(2)]
+
+
+def svg_size(path):
+    """SVG的显示尺寸（英寸）：按根元素的 width/height，没有（或为百分比）时按 viewBox"""
+    from lxml import etree
+
+    _, root = next(etree.iterparse(path, events=("start",)))
+    width, height = _svg_length(root.get("width")), _svg_length(root.get("height"))
+    if not (width and height):
+        view_box = (root.get("viewBox") or "").replace(",", " ").split()
+        if len(view_box) != 4:
+            raise ValueError(f"{path} 没有可用的 width/height 或 viewBox")
+        width, height = (float(v) * _SVG_UNITS["px"] for v in view_box[2:])
+    return width, height
+
+
+def svg_fallback(path, width_in=None, dpi=FALLBACK_DPI, cache_dir=CACHE_DIR):
+    """返回SVG的低分辨率PNG回退图的缓存路径
+
+    安装了cairosvg时栅格化SVG；否则用同目录同名的PNG/JPEG（R脚本同时导出的位图）降采样；
+    都没有时抛出ValueError，设置环境变量 PC047_BLANK_SVG_FALLBACK=1 时改为白色占位图并警告
+    （支持SVG的PowerPoint 2016+不受影响，旧版Office显示空白）
+    """
+    svg_w, svg_h = svg_size(path)
+    scale = width_in / svg_w if width_in is not None else 1.0
+    size = max(1, round(svg_w * scale * dpi)), max(1, round(svg_h * scale * dpi))
+    try:
+        import cairosvg
+    except ImportError:
+        cairosvg = None
+    stem = os.path.splitext(path)[0]
+    raster = next((f"{stem}{ext}" for ext in (".png", ".jpg", ".jpeg") if os.path.exists(f"{stem}{ext}")), None)
+    source = "cairo" if cairosvg else ("raster" if raster else "blank")
+    if source == "blank" and os.environ.get(BLANK_FALLBACK_ENV) != "1":
+        raise ValueError(
+            f"{path} 没有同名位图且未安装cairosvg，无法生成PNG回退图"
+            f"（pip install cairosvg，或设置环境变量 {BLANK_FALLBACK_ENV}=1 使用空白回退图）"
+        )
+    # 回退图的来源写入文件名：之后安装了cairosvg或补上了位图时重新生成
+    cached = os.path.join(cache_dir, f"{source_sha1(path)[:16]}_{size[0]}x{size[1]}_{dpi}_{source}.png")
+    if os.path.exists(cached):
+        return cached
+
+    if cairosvg:
+        image = Image.open(io.BytesIO(cairosvg.svg2png(url=path, output_width=size[0], output_height=size[1])))
+    elif raster:
+        with Image.open(raster) as src:
+            image = src.resize(size, Image.Resampling.LANCZOS)
+    else:
+        print(f"警告：{os.path.basename(path)} 没有同名位图且未安装cairosvg，PNG回退图为空白", file=sys.stderr)
+        image = Image.new("RGB", size, "white")
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cached}.{os.getpid()}.tmp"
+    _encode(image, tmp_path, "png", dpi)
+    os.replace(tmp_path, cached)
+    return cached
@@ -0,0 +1,158 @@
+"""
+PC047组会PPT进程级图片仓库
+python-pptx只在单个Presentation内部按SHA1去重图片；中英文PPT嵌入的是同一批图，
+每次构建都会重新读盘、重新计算哈希、重新压缩。
+这里把预处理后的图片字节、SHA1和像素尺寸保存在进程内，同一进程构建的所有PPT复用同一份blob：
+- 同一份图片在进程内只读盘、只哈希一次
+- 插入图片时直接构造ImagePart，跳过python-pptx的重新解码与逐个比对SHA1
+- 批量构建时父进程预热后fork，子进程共享同一批blob
+SVG图片原样嵌入（XML部件，zip中按deflate压缩），图片形状本身引用低分辨率PNG回退图，
+SVG通过Office 2016的 svgBlip 扩展引用：支持SVG的PowerPoint显示矢量图，旧版本显示回退图。
+"""
+
+import hashlib
+import os
+import weakref
+
+from PIL import Image
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.parts.image import ImagePart
+from pptx.util import Emu, Inches
+
+import deck_profile
+from image_cache import TARGET_DPI, preprocess_image, svg_fallback, svg_size
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "bmp": "image/bmp",
+    "tif": "image/tiff",
+    "tiff": "image/tiff",
+    "svg": "image/svg+xml",
+}
+# a:blip 扩展：Office 2016 的SVG图片
+SVG_EXT_URI = "{96DAC541-7B7A-43D3-8B79-37D633B846F1}"
+SVG_NS = "http://schemas.microsoft.com/office/drawing/2016/SVG/main"
+
+
+class MediaEntry:
+    """一份已编码的图片：字节、SHA1、像素尺寸；SVG另有PNG回退图 fallback"""
+
+    __slots__ = ("filename", "blob", "sha1", "ext", "content_type", "px_size", "fallback")
+
+    def __init__(self, filename, blob, ext, px_size, fallback=None):
+        self.filename = filename
+        self.blob = blob
+        self.sha1 = hashlib.sha1(blob).hexdigest()
+        self.ext = ext
+        self.content_type = CONTENT_TYPES[ext]
+        self.px_size = px_size
+        self.fallback = fallback
+
+    def height_for(self, width):
+        """按宽高比计算给定宽度(EMU)对应的高度(EMU)"""
+        px_w, px_h = self.px_size
+        return Emu(int(round(width * px_h / px_w)))
+
+
+# (源路径, mtime, 大小, 显示宽度, dpi) -> MediaEntry
+_entries = {}
+# SHA1 -> MediaEntry，由已嵌入的ImagePart反查图片（片段复用时使用）
+_by_sha1 = {}
+# Package -> {sha1: ImagePart}，同一份PPT内去重
+_package_parts = weakref.WeakKeyDictionary()
+
+
+def get_media(image_path, width_in=None, dpi=TARGET_DPI):
+    """取得按显示宽度预处理后的图片（进程内只加载一次）"""
+    stat = os.stat(image_path)
+    key = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, width_in, dpi)
+    entry = _entries.get(key)
+    if entry is None:
+        with deck_profile.image_load(image_path):
+            if image_path.lower().endswith(".svg"):
+                entry = _svg_entry(image_path, width_in)
+            else:
+                entry = _read_entry(preprocess_image(image_path, width_in=width_in, dpi=dpi), os.path.basename(image_path))
+            _entries[key] = entry
+            _by_sha1.setdefault(entry.sha1, entry)
+    return entry
+
+
+def _read_entry(path, filename, fallback=None):
+    with open(path, "rb") as f:
+        blob = f.read()
+    ext = os.path.splitext(path)[1].lstrip(".").lower()
+    if ext == "svg":
+        # 宽高比按SVG的显示尺寸（以96px/英寸计的像素数只用于计算高度）
+        px_size = tuple(round(v * 96) for v in svg_size(path))
+    else:
+        with Image.open(path) as im:
+            px_size = im.size
+    return MediaEntry(filename, blob, ext, px_size, fallback)
+
+
+def _svg_entry(image_path, width_in):
+    """SVG原样嵌入，附带按显示宽度生成的低分辨率PNG回退图"""
+    fallback = _read_entry(svg_fallback(image_path, width_in=width_in), os.path.basename(image_path))
+    _by_sha1.setdefault(fallback.sha1, fallback)
+    return _read_entry(image_path, os.path.basename(image_path), fallback)
+
+
+def entry_for_part(part):
+    """ImagePart -> MediaEntry（不是经由仓库插入的图片时按其内容新建）"""
+    entry = _by_sha1.get(part.sha1)
+    if entry is None:
+        px_size = part.image.size if part.ext != "svg" else (1, 1)  # Pillow读不了SVG；拼接片段时用不到尺寸
+        entry = MediaEntry(part.desc, part.blob, part.ext, px_size)
+        _by_sha1[entry.sha1] = entry
+    return entry
+
+
+def image_part_for(package, entry):
+    """返回package中内容为entry的ImagePart，不存在时新建"""
+    parts = _package_parts.get(package)
+    if parts is None:
+        parts = _package_parts[package] = {}
+    part = parts.get(entry.sha1)
+    if part is None:
+        part = ImagePart(
+            package.next_image_partname(entry.ext), entry.content_type, package, entry.blob, entry.filename
+        )
+        # 预先填入SHA1，python-pptx后续去重时不必再次哈希
+        part.__dict__["sha1"] = entry.sha1
+        parts[entry.sha1] = part
+    return part
+
+
+def add_picture(slide, entry, left, top, width):
+    """在slide上插入entry图片（位置、宽度单位英寸，高度按宽高比计算）；SVG插入回退图并以 svgBlip 引用SVG"""
+    cx = Inches(width)
+    picture = entry.fallback or entry
+    image_part = image_part_for(slide.part.package, picture)
+    rId = slide.part.relate_to(image_part, RT.IMAGE)
+    pic = slide.shapes._add_pic_from_image_part(
+        image_part, rId, Inches(left), Inches(top), cx, entry.height_for(cx)
+    )
+    if entry.fallback is not None:
+        svg_rId = slide.part.relate_to(image_part_for(slide.part.package, entry), RT.IMAGE)
+        pic.blipFill.blip.append(parse_xml(
+            f'<a:extLst {nsdecls("a", "r")}><a:ext uri="{SVG_EXT_URI}">'
+            f'<asvg:svgBlip xmlns:asvg="{SVG_NS}" r:embed="{svg_rId}"/></a:ext></a:extLst>'
+        ))
+    return slide.shapes._shape_factory(pic)
+
+
+def stats():
+    """仓库中的图片数与总字节数"""
+    return len(_entries), sum(len(e.blob) for e in _entries.values())
+
+
+def clear():
+    """清空进程内仓库"""
+    _entries.clear()
+    _by_sha1.clear()
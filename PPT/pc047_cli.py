@@ -0,0 +1,328 @@
+"""
+PC047命令行入口：pc047 <子命令>
+    pc047 deck build [-v v6] [-l cn en] [--date 20260126]   构建组会PPT
+    pc047 deck list                                         列出可构建的版本与已有输出
+    pc047 deck watch [-l cn en]                             监视图片与描述文件，增量重建
+    pc047 deck patch [-l cn en]                             只改写已有PPT中变化的部件
+    pc047 deck profile [-l cn] [--trace trace.json]         逐页剖析构建耗时
+    pc047 deck appendix [-l cn en]                          把大结果表分页生成附录PPT
+    pc047 deck lint [PPT ...] [-l cn en]                    检查超出页面、重叠的形状与溢出的文字
+    pc047 deck preview [PPT ...] [-o DIR] [--width 960]     把每页画成PNG缩略图（按内容缓存）
+    pc047 deck diff <旧> <新> [-l cn en]                    按形状比较两份PPT（路径或版本名）
+    pc047 figures index [标签 ...] [--json]                 索引并列出分析图片
+    pc047 freeze show <分析> <标签 ...>                      读取Quarto冻结结果中代码块的输出
+
+路径按 --base-dir > 环境变量 PC047_BASE_DIR > 当前目录向上查找（含 analyses/ 与 PPT/ 的目录）> 本文件上级目录 确定。
+python-pptx、Pillow等重模块只在需要它们的子命令里导入，--help 与列表类命令不加载。
+
+安装（在PPT目录下）：
+    pip install -e .
+"""
+
+import argparse
+import os
+import sys
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR_ENV = "PC047_BASE_DIR"
+
+
+def find_base_dir(start=None):
+    """从start向上查找同时包含 analyses/ 与 PPT/ 的项目根目录"""
+    path = os.path.abspath(start or os.getcwd())
+    while True:
+        if os.path.isdir(os.path.join(path, "analyses")) and os.path.isdir(os.path.join(path, "PPT")):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def resolve_base_dir(arg=None):
+    """项目根目录：命令行参数 > 环境变量 > 向上查找 > 本文件上级目录"""
+    return os.path.abspath(arg or os.environ.get(BASE_DIR_ENV) or find_base_dir() or os.path.dirname(PPT_DIR))
+
+
+# ---------------------------------------------------------------------------
+# deck
+# ---------------------------------------------------------------------------
+
+def cmd_deck_build(args):
+    import deck_build
+
+    argv = ["--base-dir", args.base_dir, "--date", args.date]
+    if args.versions:
+        argv += ["-v", *args.versions]
+    if args.langs:
+        argv += ["-l", *args.langs]
+    if args.jobs is not None:
+        argv += ["-j", str(args.jobs)]
+    if args.force:
+        argv.append("--force")
+    if args.changed_list:
+        argv += ["--changed-list", args.changed_list]
+    deck_build.main(argv)
+    return 0
+
+
+def cmd_deck_list(args):
+    import deck_build
+
+    output_dir = os.path.join(args.base_dir, "PPT", args.date)
+    print(f"输出目录：{output_dir}")
+    print(f"{'版本':<6}{'来源':<28}{'语言':<6}{'大小(KB)':>10}  输出")
+    for version, source in deck_build.VERSIONS.items():
+        for lang in deck_build.LANGS:
+            if source == "spec":
+                origin = f"decks/{version}_{lang}.json"
+            else:
+                origin = f"{source}.py"
+            name = deck_build.OUTPUT_NAMES[lang].format(version=version)
+            path = os.path.join(output_dir, name)
+            size = f"{os.path.getsize(path) / 1024:.1f}" if os.path.exists(path) else "-"
+            print(f"{version:<6}{origin:<28}{lang:<6}{size:>10}  {name}")
+    return 0
+
+
+def cmd_deck_watch(args):
+    import deck_watch
+
+    argv = ["--base-dir", args.base_dir, "--date", args.date, "-v", args.version, "--interval", str(args.interval)]
+    if args.langs:
+        argv += ["-l", *args.langs]
+    if args.once:
+        argv.append("--once")
+    deck_watch.main(argv)
+    return 0
+
+
+def cmd_deck_patch(args):
+    import deck_patch
+
+    argv = ["--base-dir", args.base_dir, "--date", args.date, "-v", args.version]
+    if args.langs:
+        argv += ["-l", *args.langs]
+    deck_patch.main(argv)
+    return 0
+
+
+def cmd_deck_profile(args):
+    import deck_profile
+
+    argv = ["-v", args.version, "-l", args.lang, "--image-dir", args.image_dir or os.path.join(args.base_dir, "analyses", "data")]
+    if args.trace:
+        argv += ["--trace", args.trace]
+    deck_profile.main(argv)
+    return 0
+
+
+def cmd_deck_appendix(args):
+    import deck_appendix
+
+    argv = ["--base-dir", args.base_dir, "--date", args.date]
+    if args.langs:
+        argv += ["-l", *args.langs]
+    if args.spec:
+        argv += ["--spec", args.spec]
+    if args.force:
+        argv.append("--force")
+    deck_appendix.main(argv)
+    return 0
+
+
+def cmd_deck_lint(args):
+    import deck_lint
+
+    argv = [*args.paths, "-v", args.version, "--image-dir", args.image_dir or os.path.join(args.base_dir, "analyses", "data")]
+    if args.langs:
+        argv += ["-l", *args.langs]
+    return deck_lint.main(argv)
+
+
+def cmd_deck_preview(args):
+    import deck_preview
+
+    argv = [*args.paths, "-v", args.version, "--width", str(args.width),
+            "--image-dir", args.image_dir or os.path.join(args.base_dir, "analyses", "data")]
+    if args.langs:
+        argv += ["-l", *args.langs]
+    if args.output_dir:
+        argv += ["-o", args.output_dir]
+    if args.jobs is not None:
+        argv += ["-j", str(args.jobs)]
+    return deck_preview.main(argv)
+
+
+def cmd_deck_diff(args):
+    import deck_diff
+
+    argv = [args.old, args.new, "--base-dir", args.base_dir, "--date", args.date]
+    if args.langs:
+        argv += ["-l", *args.langs]
+    return deck_diff.main(argv)
+
+
+# ---------------------------------------------------------------------------
+# figures
+# ---------------------------------------------------------------------------
+
+def cmd_figures_index(args):
+    import figure_catalog
+
+    catalog = figure_catalog.open_catalog(os.path.join(args.base_dir, "analyses"))
+    figures = catalog.figures
+    if args.labels:
+        figures = [figure for label in args.labels for figure in catalog.candidates(label)]
+    if args.json:
+        import json
+        json.dump([f.to_json() for f in figures], sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+    figure_catalog.print_figures(figures)
+    return 0 if figures or not args.labels else 1
+
+
+# ---------------------------------------------------------------------------
+# freeze
+# ---------------------------------------------------------------------------
+
+def cmd_freeze_list(args):
+    import freeze_reader
+
+    argv = ["--analyses-dir", os.path.join(args.base_dir, "analyses")]
+    if args.analysis:
+        argv.append(args.analysis)
+    freeze_reader.main(argv)
+    return 0
+
+
+def cmd_freeze_show(args):
+    import freeze_reader
+
+    argv = ["--analyses-dir", os.path.join(args.base_dir, "analyses"), args.analysis, *args.labels]
+    if args.code:
+        argv.append("--code")
+    if args.json:
+        argv.append("--json")
+    freeze_reader.main(argv)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# 参数解析
+# ---------------------------------------------------------------------------
+
+def build_parser():
+    # 默认值与 deck_build 保持一致；这里不导入它，保证 --help 足够快
+    meeting_date = "20260126"
+    langs = ("cn", "en")
+
+    parser = argparse.ArgumentParser(prog="pc047", description="PC047项目命令行工具")
+    parser.add_argument("--base-dir", help=f"项目根目录（含 analyses/ 与 PPT/；也可用环境变量 {BASE_DIR_ENV}）")
+    commands = parser.add_subparsers(dest="command", metavar="<命令>")
+    commands.required = True
+
+    deck = commands.add_parser("deck", help="组会PPT").add_subparsers(dest="deck_command", metavar="<子命令>")
+    deck.required = True
+
+    build = deck.add_parser("build", help="构建PPT（默认全部版本 × 中英文）")
+    build.add_argument("--date", default=meeting_date, help="汇报日期 YYYYMMDD，输出到 PPT/<date>/")
+    build.add_argument("-v", "--versions", nargs="+", help="要构建的版本")
+    build.add_argument("-l", "--langs", nargs="+", choices=langs, help="要构建的语言")
+    build.add_argument("-j", "--jobs", type=int, help="进程数（默认CPU核数）")
+    build.add_argument("--force", action="store_true", help="总是重写输出")
+    build.add_argument("--changed-list", help="把有变化的PPT路径写入该文件")
+    build.set_defaults(func=cmd_deck_build)
+
+    listing = deck.add_parser("list", help="列出可构建的版本与已有输出")
+    listing.add_argument("--date", default=meeting_date, help="汇报日期 YYYYMMDD")
+    listing.set_defaults(func=cmd_deck_list)
+
+    watch = deck.add_parser("watch", help="监视图片与描述文件，只重建变化的页")
+    watch.add_argument("--date", default=meeting_date, help="汇报日期 YYYYMMDD")
+    watch.add_argument("-v", "--version", default="v6")
+    watch.add_argument("-l", "--langs", nargs="+", choices=langs)
+    watch.add_argument("--interval", type=float, default=0.2, help="轮询间隔（秒）")
+    watch.add_argument("--once", action="store_true", help="只构建一次后退出")
+    watch.set_defaults(func=cmd_deck_watch)
+
+    patch = deck.add_parser("patch", help="增量更新已有PPT（未变化的部件原样复制）")
+    patch.add_argument("--date", default=meeting_date, help="汇报日期 YYYYMMDD")
+    patch.add_argument("-v", "--version", default="v6")
+    patch.add_argument("-l", "--langs", nargs="+", choices=langs)
+    patch.set_defaults(func=cmd_deck_patch)
+
+    profile = deck.add_parser("profile", help="逐页剖析构建耗时与体积")
+    profile.add_argument("-v", "--version", default="v6")
+    profile.add_argument("-l", "--lang", default="cn", choices=langs)
+    profile.add_argument("--image-dir", help="图片目录（默认 <base-dir>/analyses/data）")
+    profile.add_argument("--trace", help="Chrome trace JSON输出路径")
+    profile.set_defaults(func=cmd_deck_profile)
+
+    appendix = deck.add_parser("appendix", help="把大结果表分页生成附录PPT（流式写出）")
+    appendix.add_argument("--date", default=meeting_date, help="汇报日期 YYYYMMDD")
+    appendix.add_argument("-l", "--langs", nargs="+", choices=langs)
+    appendix.add_argument("--spec", help="描述文件（默认 decks/appendix_<语言>.json）")
+    appendix.add_argument("--force", action="store_true", help="总是重写输出")
+    appendix.set_defaults(func=cmd_deck_appendix)
+
+    lint = deck.add_parser("lint", help="检查超出页面、重叠的形状与溢出的文字")
+    lint.add_argument("paths", nargs="*", help="要检查的.pptx；不给时在内存中按描述文件构建后检查")
+    lint.add_argument("-v", "--version", default="v6")
+    lint.add_argument("-l", "--langs", nargs="+", choices=langs)
+    lint.add_argument("--image-dir", help="图片目录（默认 <base-dir>/analyses/data）")
+    lint.set_defaults(func=cmd_deck_lint)
+
+    preview = deck.add_parser("preview", help="把每页画成PNG缩略图（按内容哈希缓存，不需要PowerPoint）")
+    preview.add_argument("paths", nargs="*", help="要预览的.pptx；不给时在内存中按描述文件构建后预览")
+    preview.add_argument("-o", "--output-dir", help="输出目录")
+    preview.add_argument("-v", "--version", default="v6")
+    preview.add_argument("-l", "--langs", nargs="+", choices=langs)
+    preview.add_argument("--image-dir", help="图片目录（默认 <base-dir>/analyses/data）")
+    preview.add_argument("--width", type=int, default=960, help="缩略图宽度（像素）")
+    preview.add_argument("-j", "--jobs", type=int, help="进程数（默认CPU核数）")
+    preview.set_defaults(func=cmd_deck_preview)
+
+    diff = deck.add_parser("diff", help="按形状比较两份PPT：页对齐后报告新增、删除、修改的形状、文字与媒体")
+    diff.add_argument("old", help="旧PPT路径，或版本名（如 v5）")
+    diff.add_argument("new", help="新PPT路径，或版本名")
+    diff.add_argument("--date", default=meeting_date, help="汇报日期 YYYYMMDD（按版本名比较时）")
+    diff.add_argument("-l", "--langs", nargs="+", choices=langs, help="按版本名比较时的语言")
+    diff.set_defaults(func=cmd_deck_diff)
+
+    figures = commands.add_parser("figures", help="分析图片").add_subparsers(dest="figures_command", metavar="<子命令>")
+    figures.required = True
+
+    index = figures.add_parser("index", help="增量扫描并列出 analyses/data 与 _freeze 下的图片")
+    index.add_argument("labels", nargs="*", help="只列出这些标签（如 part4-summary-1）")
+    index.add_argument("--json", action="store_true", help="以JSON输出")
+    index.set_defaults(func=cmd_figures_index)
+
+    freeze = commands.add_parser("freeze", help="Quarto冻结结果").add_subparsers(dest="freeze_command", metavar="<子命令>")
+    freeze.required = True
+
+    freeze_list = freeze.add_parser("list", help="列出各分析的代码块标签")
+    freeze_list.add_argument("analysis", nargs="?", help="分析名，如 04_network_analysis")
+    freeze_list.set_defaults(func=cmd_freeze_list)
+
+    show = freeze.add_parser("show", help="打印代码块的输出")
+    show.add_argument("analysis", help="分析名，如 04_network_analysis")
+    show.add_argument("labels", nargs="+", help="代码块标签，如 part2-bootstrap-stability")
+    show.add_argument("--code", action="store_true", help="同时打印代码")
+    show.add_argument("--json", action="store_true", help="以JSON输出")
+    show.set_defaults(func=cmd_freeze_show)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.base_dir = resolve_base_dir(args.base_dir)
+    # 以安装的入口运行时，保证同目录模块可导入
+    if PPT_DIR not in sys.path:
+        sys.path.insert(0, PPT_DIR)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+PC047组会PPT流式输出
+prs.save() 对每个部件都做deflate，包括本身已经压缩过的PNG/JPEG，既耗CPU又不减体积，图片大时还是保存耗时的大头。
+这里直接把各部件按python-pptx相同的顺序流式写入zip：
+- 已压缩的媒体（PNG/JPEG/GIF/音视频）使用 ZIP_STORED 原样存储
+- XML部件使用deflate，可选用线程池并行压缩（zlib压缩时释放GIL）
+- zip条目时间固定为1980-01-01，同样的内容重复构建得到逐字节相同的文件
+可复现模式下还会规范化核心属性（创建/修改时间、修订号、最后修改者），
+写出前先与已有文件比较内容哈希，相同则不重写（文件时间不变，下游同步也不会被触发）。
+"""
+
+import hashlib
+import io
+import os
+import struct
+import zipfile
+import zlib
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.serialized import _ContentTypesItem
+
+# 已压缩、不再deflate的内容类型
+STORED_CONTENT_TYPES = {
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/vnd.ms-photo",
+}
+STORED_PREFIXES = ("video/", "audio/")
+
+DEFLATE_LEVEL = 6
+# 小于该字节数的XML不值得提交到线程池
+PARALLEL_MIN_BYTES = 16 * 1024
+
+# 固定的zip条目时间：1980-01-01 00:00:00（DOS时间格式）
+_DOS_TIME = 0
+_DOS_DATE = (0 << 9) | (1 << 5) | 1
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+
+# 可复现模式下核心属性使用的时间：SOURCE_DATE_EPOCH（若设置），否则与zip条目时间一致
+DEFAULT_EPOCH = 315532800  # 1980-01-01T00:00:00Z
+LAST_MODIFIED_BY = "PC047"
+
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+_FLAG_UTF8 = 0x800
+
+
+def is_stored(content_type):
+    """该内容类型是否原样存储（不压缩）"""
+    return content_type in STORED_CONTENT_TYPES or content_type.startswith(STORED_PREFIXES)
+
+
+def deflate(data, level=DEFLATE_LEVEL):
+    """原始deflate流（zip条目使用，不带zlib头）"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def reproducible_timestamp():
+    """可复现构建使用的时间（不带时区的UTC时间，与python-pptx核心属性一致）"""
+    epoch = int(os.environ.get("SOURCE_DATE_EPOCH", DEFAULT_EPOCH))
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+
+
+def normalize_core_properties(prs, timestamp=None):
+    """把核心属性中随构建变化的字段固定下来"""
+    timestamp = timestamp or reproducible_timestamp()
+    props = prs.core_properties
+    props.created = timestamp
+    props.modified = timestamp
+    if props.last_printed is not None:
+        props.last_printed = timestamp
+    props.revision = 1
+    props.last_modified_by = LAST_MODIFIED_BY
+
+
+def stamp_core_properties(prs):
+    """非可复现模式：记录本次构建的修改时间"""
+    props = prs.core_properties
+    props.modified = datetime.now(timezone.utc).replace(tzinfo=None)
+    props.last_modified_by = LAST_MODIFIED_BY
+
+
+def file_digest(path):
+    """文件内容的SHA256；文件不存在时返回None"""
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def package_entries(prs):
+    """按python-pptx的写出顺序生成 (条目名, 字节, 是否原样存储)"""
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+    yield "[Content_Types].xml", serialize_part_xml(_ContentTypesItem.xml_for(parts)), False
+    yield "_rels/.rels", package._rels.xml, False
+    for part in parts:
+        yield part.partname.membername, part.blob, is_stored(part.content_type)
+        if part._rels:
+            yield part.partname.rels_uri.membername, part.rels.xml, False
+
+
+class ZipStreamWriter:
+    """顺序写出的最小zip写入器（不支持zip64，单个PPT远达不到4GB上限）"""
+
+    def __init__(self, fileobj):
+        self._file = fileobj
+        self._offset = 0
+        self._central = []
+
+    def write_raw(self, name, raw, crc, size, method):
+        """写入已编码好的条目数据（raw为存储/压缩后的字节）"""
+        name_bytes = name.encode("utf-8")
+        flags = 0 if name_bytes.isascii() else _FLAG_UTF8
+        header = _LOCAL_HEADER.pack(
+            0x04034B50, 20, flags, method, _DOS_TIME, _DOS_DATE,
+            crc, len(raw), size, len(name_bytes), 0,
+        )
+        self._file.write(header)
+        self._file.write(name_bytes)
+        self._file.write(raw)
+        self._central.append((name_bytes, flags, method, crc, len(raw), size, self._offset))
+        self._offset += len(header) + len(name_bytes) + len(raw)
+
+    def write(self, name, data, stored=False, level=DEFLATE_LEVEL, compressed=None):
+        """写入一个条目；compressed为预先压缩好的deflate数据（并行压缩时使用）"""
+        crc = zlib.crc32(data)
+        if stored:
+            self.write_raw(name, data, crc, len(data), METHOD_STORED)
+        else:
+            raw = compressed if compressed is not None else deflate(data, level)
+            self.write_raw(name, raw, crc, len(data), METHOD_DEFLATED)
+
+    def close(self):
+        """写出中央目录与结束记录"""
+        start = self._offset
+        for name_bytes, flags, method, crc, csize, size, offset in self._central:
+            header = _CENTRAL_HEADER.pack(
+                0x02014B50, 20, 20, flags, method, _DOS_TIME, _DOS_DATE,
+                crc, csize, size, len(name_bytes), 0, 0, 0, 0, 0, offset,
+            )
+            self._file.write(header)
+            self._file.write(name_bytes)
+            self._offset += len(header) + len(name_bytes)
+        count = len(self._central)
+        self._file.write(_END_RECORD.pack(0x06054B50, 0, 0, count, count, self._offset - start, start, 0))
+
+
+class RawEntry:
+    """已有zip中的一个条目：未解压的原始数据及其CRC、大小、压缩方式"""
+
+    __slots__ = ("name", "raw", "crc", "size", "method")
+
+    def __init__(self, name, raw, crc, size, method):
+        self.name = name
+        self.raw = raw
+        self.crc = crc
+        self.size = size
+        self.method = method
+
+
+def read_raw_entries(path):
+    """按中央目录顺序读取zip条目的原始（压缩后）数据，不解压"""
+    entries = []
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            f.seek(info.header_offset)
+            header = f.read(_LOCAL_HEADER.size)
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + _LOCAL_HEADER.size + name_len + extra_len)
+            raw = f.read(info.compress_size)
+            entries.append(RawEntry(info.filename, raw, info.CRC, info.file_size, info.compress_type))
+    return entries
+
+
+def write_entries(fileobj, entries, parallel=False, level=DEFLATE_LEVEL, max_workers=None):
+    """把 (条目名, 字节, 是否原样存储) 序列写入fileobj"""
+    writer = ZipStreamWriter(fileobj)
+    if not parallel:
+        for name, data, stored in entries:
+            writer.write(name, data, stored, level)
+    else:
+        entries = list(entries)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(deflate, data, level) if not stored and len(data) >= PARALLEL_MIN_BYTES else None
+                for _, data, stored in entries
+            ]
+            for (name, data, stored), future in zip(entries, futures):
+                writer.write(name, data, stored, level, future.result() if future else None)
+    writer.close()
+
+
+def write_file(path, data):
+    """先写临时文件再替换，中途失败不会留下半个PPT"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def save(prs, path, parallel=False, level=DEFLATE_LEVEL, reproducible=True):
+    """把Presentation写到path，返回是否写出了新内容
+
+    reproducible=True 时规范化核心属性，内容与已有文件相同则跳过写入；
+    否则记录当前修改时间并总是重写。
+    """
+    if reproducible:
+        normalize_core_properties(prs)
+    else:
+        stamp_core_properties(prs)
+    return save_entries(package_entries(prs), path, parallel=parallel, level=level, reproducible=reproducible)
+
+
+def save_entries(entries, path, parallel=False, level=DEFLATE_LEVEL, reproducible=True):
+    """把打包条目写到path，返回是否写出了新内容（同一份版式替换文字后写出多语言时使用）"""
+    buffer = io.BytesIO()
+    write_entries(buffer, entries, parallel=parallel, level=level)
+    data = buffer.getvalue()
+    if reproducible and hashlib.sha256(data).hexdigest() == file_digest(path):
+        return False
+    write_file(path, data)
+    return True
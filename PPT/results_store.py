@@ -0,0 +1,360 @@
+"""
+PC047分析结果仓库
+幻灯片上的数字（P=0.012、R²=33.6%、模块度0.468→0.177……）应当来自 analyses/data 下的结果CSV，
+而不是手写在描述文件里。这里把全部结果CSV导入一个SQLite缓存（PPT/.cache/results.sqlite）：
+- 以 (分析, 文件, 行键, 列名) 为主键；行键为首列的值（R的 row.names=TRUE 输出亦然），也可用 #1、#2 按行号引用
+- 按文件的修改时间与大小增量导入，未变化的CSV不再解析
+- 查询时按文件一次性载入内存字典，之后每次查找都是O(1)
+
+描述文件中的用法（decks/*.json）：
+    "bindings": {
+        "beta_p": {"ref": "01_alpha_beta_diversity_analysis/16_permanova_bray_curtis_species.csv",
+                   "row": "treatment_group", "column": "Pr(>F)",
+                   "format": "{:.3f}", "default": 0.012}
+    }
+也可以从Quarto冻结结果中某个代码块的打印输出里取值（见 freeze_reader.py），pattern 的第一个分组为值：
+        "mantel_p": {"chunk": "03_singlem_diversity_analysis/host-virus-correlation",
+                     "pattern": "Mantel[\\s\\S]*?P-value: ([0-9.]+)", "format": "{:.3f}", "default": 0.001}
+由其它绑定计算的相对降幅（基数为0时没有值，显示为"—"）：
+        "mod_drop": {"decrease": ["net_hpko_modularity", "net_hpwt_modularity"], "format": "{:.0%}"}
+文本中写 {{beta_p}}；整个字符串只有一个占位符时替换为原始数值（供构建函数的数值参数使用）。
+没有结果目录时使用default；有结果但找不到该值（CSV改名、行键或列名变化）时同样使用default并打印警告；没有default则报错。
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import sys
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(PPT_DIR, ".cache", "results.sqlite")
+
+# 超过该大小的CSV（丰度表等）不导入
+MAX_CSV_BYTES = 20 * 1024 * 1024
+# R在Windows上的write.csv可能输出本地编码
+ENCODINGS = ("utf-8-sig", "gbk")
+NA_VALUES = {"", "NA", "NaN", "nan", "NULL"}
+
+_TOKEN = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+_MISSING = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    analysis TEXT NOT NULL,
+    file TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (analysis, file)
+);
+CREATE TABLE IF NOT EXISTS cells (
+    analysis TEXT NOT NULL,
+    file TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    row_index INTEGER NOT NULL,
+    col TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (analysis, file, row_index, col)
+);
+CREATE INDEX IF NOT EXISTS cells_by_file ON cells (analysis, file);
+"""
+
+
+def convert(value):
+    """CSV文本 -> int / float / str；NA为None"""
+    if value is None or value in NA_VALUES:
+        return None
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def unique_names(header):
+    """重复的列名依次加 .1、.2 后缀（与R的make.unique一致），保证同一CSV中列名唯一"""
+    seen = set(header)
+    names = []
+    counts = {}
+    for name in header:
+        if name in counts:
+            n = counts[name]
+            while f"{name}.{n}" in seen:
+                n += 1
+            counts[name] = n + 1
+            name = f"{name}.{n}"
+            seen.add(name)
+        else:
+            counts[name] = 1
+        names.append(name)
+    return names
+
+
+def read_csv_rows(path):
+    """读取CSV为 (表头, 行列表)，自动尝试UTF-8与GBK；重复列名见 unique_names"""
+    for encoding in ENCODINGS:
+        try:
+            with open(path, newline="", encoding=encoding) as f:
+                rows = list(csv.reader(f))
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError(f"无法识别CSV编码：{path}")
+    if not rows:
+        return [], []
+    return unique_names(rows[0]), rows[1:]
+
+
+class ResultsStore:
+    """analyses/data 结果CSV的索引缓存"""
+
+    def __init__(self, data_dir, db_path=DB_PATH):
+        self.data_dir = data_dir
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # 并行构建的多个进程可能同时导入，等待写锁而不是立即失败
+        self._db = sqlite3.connect(db_path, timeout=30)
+        self._db.executescript(_SCHEMA)
+        # (分析, 文件) -> {(行键, 列名): 值}
+        self._tables = {}
+
+    def close(self):
+        self._db.close()
+
+    def scan(self):
+        """data_dir下全部CSV：(分析, 文件相对路径, 绝对路径)"""
+        if not os.path.isdir(self.data_dir):
+            return
+        for analysis in sorted(os.listdir(self.data_dir)):
+            top = os.path.join(self.data_dir, analysis)
+            if not os.path.isdir(top):
+                continue
+            for dirpath, dirnames, filenames in os.walk(top):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(".csv"):
+                        path = os.path.join(dirpath, filename)
+                        yield analysis, os.path.relpath(path, top).replace(os.sep, "/"), path
+
+    def refresh(self):
+        """增量导入：新增或变化的CSV重新解析，已删除的移出缓存；返回重新导入的文件数"""
+        known = {
+            (analysis, file): (mtime_ns, size)
+            for analysis, file, mtime_ns, size in self._db.execute("SELECT analysis, file, mtime_ns, size FROM files")
+        }
+        seen = set()
+        imported = 0
+        with self._db:
+            for analysis, file, path in self.scan():
+                stat = os.stat(path)
+                seen.add((analysis, file))
+                if stat.st_size > MAX_CSV_BYTES or known.get((analysis, file)) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                self._ingest(analysis, file, path, stat)
+                imported += 1
+            for analysis, file in set(known) - seen:
+                self._db.execute("DELETE FROM cells WHERE analysis = ? AND file = ?", (analysis, file))
+                self._db.execute("DELETE FROM files WHERE analysis = ? AND file = ?", (analysis, file))
+        if imported or set(known) - seen:
+            self._tables.clear()
+        return imported
+
+    def _ingest(self, analysis, file, path, stat):
+        header, rows = read_csv_rows(path)
+        self._db.execute("DELETE FROM cells WHERE analysis = ? AND file = ?", (analysis, file))
+        self._db.executemany(
+            "INSERT INTO cells VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (analysis, file, row[0] if row else "", idx, col, value)
+                for idx, row in enumerate(rows, 1)
+                for col, value in zip(header, row)
+            ),
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (analysis, file, stat.st_mtime_ns, stat.st_size)
+        )
+
+    def table(self, analysis, file):
+        """某个CSV的 {(行键, 列名): 值}，每个文件只从SQLite载入一次"""
+        key = (analysis, file)
+        table = self._tables.get(key)
+        if table is None:
+            table = {}
+            for row_key, row_index, col, value in self._db.execute(
+                "SELECT row_key, row_index, col, value FROM cells WHERE analysis = ? AND file = ?", key
+            ):
+                value = convert(value)
+                table[(f"#{row_index}", col)] = value
+                # 首列值重复时保留第一次出现的行
+                table.setdefault((row_key, col), value)
+            self._tables[key] = table
+        return table
+
+    def get(self, ref, row, column, default=_MISSING):
+        """按 "分析/文件.csv"、行键（或 #行号）、列名取值"""
+        analysis, _, file = ref.partition("/")
+        value = self.table(analysis, file).get((str(row), column))
+        if value is None:
+            if default is _MISSING:
+                raise KeyError(f"结果中没有 {ref} [{row}, {column}]")
+            return default
+        return value
+
+    def files(self):
+        """已导入的 (分析, 文件)"""
+        return self._db.execute("SELECT analysis, file FROM files ORDER BY analysis, file").fetchall()
+
+
+_stores = {}
+
+
+def open_store(data_dir, db_path=DB_PATH):
+    """进程内共享的结果仓库；每次打开都做一次增量导入（未变化的CSV只需stat）"""
+    key = (os.path.abspath(data_dir), db_path)
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = ResultsStore(data_dir, db_path)
+    store.refresh()
+    return store
+
+
+def freeze_path(binding, data_dir):
+    """冻结结果绑定对应的 html.json"""
+    analysis = binding["chunk"].partition("/")[0]
+    return os.path.join(os.path.dirname(os.path.abspath(data_dir)), "_freeze", analysis, "execute-results", "html.json")
+
+
+def binding_files(bindings, data_dir):
+    """绑定引用的CSV与冻结结果路径（监视模式用）"""
+    return sorted({
+        freeze_path(b, data_dir) if "chunk" in b else os.path.join(data_dir, *b["ref"].split("/"))
+        for b in bindings.values() if "chunk" in b or "ref" in b
+    })
+
+
+def freeze_value(reader, binding):
+    """冻结结果中某代码块输出里按正则取值；该块或匹配不存在时为None"""
+    analysis, _, label = binding["chunk"].partition("/")
+    try:
+        text = reader.chunk(analysis, label).text
+    except KeyError:
+        return None
+    match = re.search(binding["pattern"], text)
+    return convert(match.group(1)) if match else None
+
+
+def _lookup(binding, store, freeze):
+    """单个绑定的 (结果值, 找不到时的说明)；没有结果目录时为 (None, None)"""
+    if "chunk" in binding:
+        if freeze is None:
+            return None, None
+        value = freeze_value(freeze, binding)
+        return value, f"{binding['chunk']} 的输出中没有匹配 {binding['pattern']!r} 的值"
+    if store is None:
+        return None, None
+    value = store.get(binding["ref"], binding["row"], binding["column"], None)
+    analysis, _, file = binding["ref"].partition("/")
+    if store.table(analysis, file):
+        return value, f"{binding['ref']} 中没有 [{binding['row']}, {binding['column']}]"
+    return value, f"结果中没有 {binding['ref']}"
+
+
+# 已打印过的警告（各语言的描述绑定同一批结果，只提示一次）
+_warned = set()
+
+
+def _warn(message):
+    if message not in _warned:
+        _warned.add(message)
+        print(f"警告：{message}", file=sys.stderr)
+
+
+def _decrease(name, binding, values):
+    """相对降幅 (基数 - 新值) / 基数；基数为0时为None"""
+    base_name, new_name = binding["decrease"]
+    for other in (base_name, new_name):
+        if other not in values:
+            raise KeyError(f"绑定 {name!r} 引用了未定义的绑定 {other!r}")
+    base, new = values[base_name], values[new_name]
+    if not base:
+        _warn(f"{base_name} 为0，绑定 {name!r} 无法计算，显示为 —")
+        return None
+    return (base - new) / base
+
+
+def resolve_bindings(bindings, store, freeze=None):
+    """{名称: 绑定} -> {名称: 值}；store / freeze 为None（没有结果目录）时使用默认值"""
+    values, missing = {}, {}
+    for name, binding in bindings.items():
+        if "decrease" in binding:
+            continue
+        value, where = _lookup(binding, store, freeze)
+        if value is None:
+            # 有结果目录却找不到（CSV改名、行键或列名变化）时提示，避免悄悄显示过期的默认值
+            if where:
+                missing.setdefault(where, []).append(name)
+            value = binding.get("default", _MISSING)
+            if value is _MISSING:
+                raise KeyError(f"绑定 {name!r} 没有结果数据也没有默认值")
+        values[name] = value
+    for where, names in missing.items():
+        _warn(f"{where}，绑定 {'、'.join(names)} 使用默认值")
+    # 计算值在全部取值绑定之后
+    for name, binding in bindings.items():
+        if "decrease" in binding:
+            values[name] = _decrease(name, binding, values)
+    return values
+
+
+def format_value(value, fmt=None):
+    """按绑定的format格式化；format不适用于该值（如文本）时原样输出，没有值时为 —"""
+    if value is None:
+        return "—"
+    if fmt:
+        try:
+            return fmt.format(value)
+        except (ValueError, TypeError):
+            pass
+    return str(value)
+
+
+def _format_token(name, values, formats):
+    if name not in values:
+        raise KeyError(f"描述中引用了未定义的绑定 {{{{{name}}}}}")
+    return format_value(values[name], formats.get(name))
+
+
+def substitute(obj, values, formats):
+    """把描述中的 {{名称}} 替换为结果值（递归处理列表与字典）"""
+    if isinstance(obj, str):
+        match = _TOKEN.fullmatch(obj.strip())
+        if match and match.group(1) in values:
+            return values[match.group(1)]
+        return _TOKEN.sub(lambda m: _format_token(m.group(1), values, formats), obj)
+    if isinstance(obj, list):
+        return [substitute(item, values, formats) for item in obj]
+    if isinstance(obj, dict):
+        return {key: substitute(item, values, formats) for key, item in obj.items()}
+    return obj
+
+
+def bind_spec(spec, data_dir):
+    """返回替换了结果占位符的描述副本；描述没有bindings时原样返回"""
+    bindings = spec.get("bindings")
+    if not bindings:
+        return spec
+    store = open_store(data_dir) if data_dir and os.path.isdir(data_dir) else None
+    freeze = None
+    if data_dir and any("chunk" in b for b in bindings.values()):
+        import freeze_reader
+
+        analyses_dir = os.path.dirname(os.path.abspath(data_dir))
+        if os.path.isdir(os.path.join(analyses_dir, "_freeze")):
+            freeze = freeze_reader.open_reader(analyses_dir)
+    values = resolve_bindings(bindings, store, freeze)
+    formats = {name: b.get("format") for name, b in bindings.items()}
+    bound = dict(spec)
+    bound["slides"] = substitute(spec["slides"], values, formats)
+    return bound
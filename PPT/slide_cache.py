@@ -0,0 +1,214 @@
+"""
+PC047组会PPT静态幻灯片片段缓存
+背景页、假说页、流程图页每次构建都要通过python-pptx逐个创建几十个形状、连线和文本框，
+而它们的内容在两次组会之间几乎不变。
+这里把这些页按 (构建函数, 语言, 页上引用的统计结果, 内容哈希) 编译一次，序列化为幻灯片XML片段（spTree + 备注文本），
+之后的构建直接把片段拼接进新的Presentation，跳过对象模型的开销。
+内容哈希覆盖构建脚本源码、页面尺寸和python-pptx版本，任何一项变化都会重新编译。
+含图片或原生图表的页也可以在进程内捕获为片段（记录图片关系、图表XML与内嵌数据表），拼接时重新关联并改写rId，供监视模式增量重建使用。
+"""
+
+import copy
+import hashlib
+import json
+import os
+
+import pptx
+from lxml import etree
+from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import element_class_lookup
+from pptx.parts.chart import ChartPart
+from pptx.parts.embeddedpackage import EmbeddedXlsxPart
+
+import deck_profile
+import deck_theme
+import media_store
+import text_fit
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(PPT_DIR, ".cache", "slides")
+
+# 影响静态页输出的源文件与消息表
+DEPENDENCIES = ["generate_ppt_v6.py", "fast_shapes.py", "deck_charts.py", "deck_locale.py", "text_fit.py", "deck_theme.py",
+                "deck_colors.py", "locales/cn.json", "locales/en.json"]
+
+# 片段内允许存在的关系（版式、备注页）；有其它关系（如图片）的页不能缓存到磁盘
+_STATIC_RELTYPES = {RT.SLIDE_LAYOUT, RT.NOTES_SLIDE}
+# python-pptx的parse_xml会去掉纯空白文本（如 <a:t>\n</a:t>），片段需原样还原
+_fragment_parser = etree.XMLParser(remove_blank_text=False, resolve_entities=False)
+_fragment_parser.set_element_class_lookup(element_class_lookup)
+_R_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+# 缓存键 -> 片段
+_fragments = {}
+_source_digest = None
+
+
+def source_digest():
+    """依赖源文件与文字适配所用字体的哈希（进程内只计算一次）"""
+    global _source_digest
+    if _source_digest is None:
+        h = hashlib.sha1(pptx.__version__.encode())
+        for name in DEPENDENCIES:
+            with open(os.path.join(PPT_DIR, name), "rb") as f:
+                h.update(f.read())
+        h.update(text_fit.metrics_key().encode())
+        _source_digest = h.hexdigest()
+    return _source_digest
+
+
+def fragment_key(name, lang, prs, results=None):
+    """片段缓存键：构建函数名 + 语言 + 统计结果 + 页面尺寸 + 源码哈希"""
+    values = json.dumps(results, sort_keys=True) if results else ""
+    raw = f"{name}|{lang}|{values}|{prs.slide_width}x{prs.slide_height}|{source_digest()}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SlideFragment:
+    """单页内容：sptree为序列化的XML字节，进程内捕获的片段则直接保存元素副本；layout为所用版式名；
+    media为 (原rId, MediaEntry) 列表，charts为 (原rId, 图表XML, 内嵌xlsx) 列表，仅存在于进程内"""
+
+    __slots__ = ("sptree", "notes", "layout", "media", "charts")
+
+    def __init__(self, sptree, notes, layout=None, media=(), charts=()):
+        self.sptree = sptree
+        self.notes = notes
+        self.layout = layout
+        self.media = tuple(media)
+        self.charts = tuple(charts)
+
+    def to_json(self):
+        if self.media or self.charts or not isinstance(self.sptree, bytes):
+            raise ValueError("进程内捕获的片段不能写入磁盘缓存")
+        return json.dumps({"sptree": self.sptree.decode("utf-8"), "notes": self.notes, "layout": self.layout},
+                          ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        return cls(data["sptree"].encode("utf-8"), data["notes"], data.get("layout"))
+
+
+def compile_fragment(builder, lang, prs, results=None):
+    """在临时Presentation中执行一次构建函数，提取spTree与备注"""
+    scratch = Presentation()
+    scratch.slide_width = prs.slide_width
+    scratch.slide_height = prs.slide_height
+    deck_theme.apply_theme(scratch)
+    slide = builder(scratch, lang, results=results) if results else builder(scratch, lang)
+
+    extra = {rel.reltype for rel in slide.part.rels.values()} - _STATIC_RELTYPES
+    if extra:
+        raise ValueError(f"{builder.__name__} 引用了外部资源，不能作为静态片段缓存：{sorted(extra)}")
+
+    notes = slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else None
+    return SlideFragment(etree.tostring(slide.shapes._spTree, encoding="UTF-8"), notes, slide.slide_layout.name)
+
+
+def capture_fragment(slide):
+    """把已构建好的一页（可含图片、原生图表）捕获为片段"""
+    media, charts = [], []
+    for rId, rel in slide.part.rels.items():
+        if rel.reltype == RT.IMAGE:
+            media.append((rId, media_store.entry_for_part(rel.target_part)))
+        elif rel.reltype == RT.CHART:
+            chart_part = rel.target_part
+            charts.append((rId, chart_part.blob, chart_part.chart_workbook.xlsx_part.blob))
+        elif rel.reltype not in _STATIC_RELTYPES:
+            raise ValueError(f"第{slide.slide_id}页含有不支持的关系：{rel.reltype}")
+    notes = slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else None
+    # 保存元素副本而不是序列化字节，拼接结果与原页逐字节一致（如空文本 <a:t></a:t>）
+    return SlideFragment(copy.deepcopy(slide.shapes._spTree), notes, slide.slide_layout.name, media, charts)
+
+
+def get_fragment(builder, lang, prs, cache_dir=CACHE_DIR, results=None):
+    """取得片段：进程内缓存 -> 磁盘缓存 -> 重新编译"""
+    key = fragment_key(builder.__name__, lang, prs, results)
+    fragment = _fragments.get(key)
+    if fragment is not None:
+        return fragment
+
+    path = os.path.join(cache_dir, f"{key}.json")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            fragment = SlideFragment.from_json(f.read())
+    else:
+        fragment = compile_fragment(builder, lang, prs, results)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(fragment.to_json())
+        os.replace(tmp_path, path)
+
+    _fragments[key] = fragment
+    return fragment
+
+
+def splice_fragment(prs, fragment):
+    """按片段的版式新增一页幻灯片（没有该版式时用空白版式），并用片段替换其形状树"""
+    if fragment.layout == deck_theme.HEADER_LAYOUT:
+        layout = deck_theme.ensure_theme(prs)
+    else:
+        layout = prs.slide_layouts.get_by_name(fragment.layout) if fragment.layout else None
+    slide = prs.slides.add_slide(layout or prs.slide_layouts[6])
+    # 保留原spTree元素（slide.shapes已持有它），只替换其子节点
+    sptree = slide.shapes._spTree
+    for child in list(sptree):
+        sptree.remove(child)
+    if isinstance(fragment.sptree, bytes):
+        sptree.extend(etree.fromstring(fragment.sptree, _fragment_parser))
+    else:
+        sptree.extend(copy.deepcopy(child) for child in fragment.sptree)
+    if fragment.media:
+        _relink_media(slide, sptree, fragment.media)
+    if fragment.charts:
+        _relink_charts(slide, sptree, fragment.charts)
+    if fragment.notes is not None:
+        slide.notes_slide.notes_text_frame.text = fragment.notes
+    return slide
+
+
+def _relink_media(slide, sptree, media):
+    """在新页中重新关联片段引用的图片，并把形状中的rId改为新关系"""
+    package = slide.part.package
+    rids = {}
+    for old_rid, entry in media:
+        rids[old_rid] = slide.part.relate_to(media_store.image_part_for(package, entry), RT.IMAGE)
+    for element in sptree.iter():
+        old_rid = element.get(_R_EMBED)
+        if old_rid in rids:
+            element.set(_R_EMBED, rids[old_rid])
+
+
+def _relink_charts(slide, sptree, charts):
+    """为新页重建片段中的图表部件（每次拼接各自一份，与直接构建时的部件编号顺序一致），并改写形状中的rId"""
+    package = slide.part.package
+    rids = {}
+    for old_rid, chart_xml, xlsx_blob in charts:
+        chart_part = ChartPart.load(package.next_partname(ChartPart.partname_template), CT.DML_CHART, package, chart_xml)
+        xlsx_rid = chart_part.relate_to(EmbeddedXlsxPart.new(xlsx_blob, package), RT.PACKAGE)
+        chart_part._element.get_or_add_externalData().rId = xlsx_rid
+        rids[old_rid] = slide.part.relate_to(chart_part, RT.CHART)
+    for element in sptree.iter():
+        old_rid = element.get(_R_ID)
+        if old_rid in rids:
+            element.set(_R_ID, rids[old_rid])
+
+
+def add_cached_slide(prs, builder, lang, results=None):
+    """以片段缓存方式添加 builder(prs, lang[, results=...]) 生成的静态页；results为页上引用的统计结果"""
+    with deck_profile.track(builder.__name__, cached=True) as record:
+        slide = splice_fragment(prs, get_fragment(builder, lang, prs, results=results))
+        if record is not None:
+            record.slide = slide
+    return slide
+
+
+def clear():
+    """清空进程内片段缓存"""
+    global _source_digest
+    _fragments.clear()
+    _source_digest = None
@@ -0,0 +1,129 @@
+"""
+PC047组会PPT幻灯片形状遍历
+版式检查（deck_lint.py）与缩略图（deck_preview.py）都要逐页读取所有形状的坐标、文字，以及占位符从版式/母版继承的位置与样式。
+python-pptx的形状代理每读一次坐标、每解析一次占位符继承都要重新查找XPath，这里直接遍历lxml元素，
+每个版式的占位符继承链只解析一次。
+"""
+
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+SP = f"{P}sp"
+PIC = f"{P}pic"
+CXN_SP = f"{P}cxnSp"
+GRAPHIC_FRAME = f"{P}graphicFrame"
+GRP_SP = f"{P}grpSp"
+
+# 形状元素 -> 坐标所在路径
+XFRM_PATHS = {
+    SP: f"{P}spPr/{A}xfrm",
+    PIC: f"{P}spPr/{A}xfrm",
+    CXN_SP: f"{P}spPr/{A}xfrm",
+    GRAPHIC_FRAME: f"{P}xfrm",
+    GRP_SP: f"{P}grpSpPr/{A}xfrm",
+}
+# 文本框默认内边距（EMU）：左右0.1英寸、上下0.05英寸
+DEFAULT_INSETS = {"lIns": 91440, "rIns": 91440, "tIns": 45720, "bIns": 45720}
+
+
+def geometry(element):
+    """(x, y, cx, cy)，单位EMU；没有写坐标（继承自版式的占位符）时为None"""
+    xfrm = element.find(XFRM_PATHS[element.tag])
+    if xfrm is None:
+        return None
+    off, ext = xfrm.find(f"{A}off"), xfrm.find(f"{A}ext")
+    return int(off.get("x")), int(off.get("y")), int(ext.get("cx")), int(ext.get("cy"))
+
+
+def placeholder_keys(element):
+    """占位符的 (类型, idx)；不是占位符时为None"""
+    ph = element.find(f"{P}nvSpPr/{P}nvPr/{P}ph")
+    if ph is None:
+        return None
+    return ph.get("type", "body"), ph.get("idx")
+
+
+def shape_name(element):
+    """形状的 (id, 名称)"""
+    c_nv_pr = next(element.iter(f"{P}cNvPr"))
+    return c_nv_pr.get("id"), c_nv_pr.get("name")
+
+
+def paragraph_text(p):
+    """段落文字（换行为 \\v，与python-pptx一致）"""
+    return "".join(
+        "\v" if child.tag == f"{A}br" else "".join(t.text or "" for t in child.iter(f"{A}t"))
+        for child in p if child.tag in (f"{A}r", f"{A}br", f"{A}fld")
+    )
+
+
+def _placeholders(tree):
+    """形状树中的占位符 {("type"/"idx", 值): 元素}（同键取第一个）"""
+    found = {}
+    for element in tree:
+        keys = placeholder_keys(element) if element.tag == SP else None
+        if keys:
+            found.setdefault(("type", keys[0]), element)
+            if keys[1] is not None:
+                found.setdefault(("idx", keys[1]), element)
+    return found
+
+
+def _lookup(placeholders, keys):
+    """有 idx 时按 idx、否则（或找不到时）按类型查找"""
+    found = placeholders.get(("idx", keys[1])) if keys[1] is not None else None
+    return found if found is not None else placeholders.get(("type", keys[0]))
+
+
+class LayoutShapes:
+    """一个版式上的非占位符形状（如标题栏，绘制在各页形状之下）与占位符继承链"""
+
+    __slots__ = ("fixed", "_layout", "_master", "_chains")
+
+    def __init__(self, layout):
+        tree = layout.shapes._spTree
+        self.fixed = [e for e in tree if e.tag in XFRM_PATHS and placeholder_keys(e) is None and geometry(e)]
+        self._layout = _placeholders(tree)
+        self._master = _placeholders(layout.slide_master.shapes._spTree)
+        self._chains = {}
+
+    def chain(self, keys):
+        """幻灯片占位符继承的元素：[版式中的占位符, 母版中同类型的占位符]（找不到的省略）"""
+        if keys not in self._chains:
+            chain, ph_type = [], keys[0]
+            layout_ph = _lookup(self._layout, keys)
+            if layout_ph is not None:
+                chain.append(layout_ph)
+                ph_type = placeholder_keys(layout_ph)[0]
+            master_ph = self._master.get(("type", ph_type))
+            if master_ph is not None:
+                chain.append(master_ph)
+            self._chains[keys] = chain
+        return self._chains[keys]
+
+
+def layout_shapes(slide, cache):
+    """幻灯片所用版式的 LayoutShapes（cache 为 {版式部件: LayoutShapes}，整份PPT共用）"""
+    layout = slide.slide_layout
+    if layout.part not in cache:
+        cache[layout.part] = LayoutShapes(layout)
+    return cache[layout.part]
+
+
+def iter_shapes(slide, cache):
+    """按绘制顺序产出 (元素, 坐标, 继承的占位符元素)：版式上的非占位符形状在前，然后是幻灯片上的形状
+
+    占位符没有写坐标时取继承链中第一个写了坐标的；仍没有坐标的形状跳过
+    """
+    layout = layout_shapes(slide, cache)
+    for element in layout.fixed:
+        yield element, geometry(element), []
+    for element in slide.shapes._spTree:
+        if element.tag not in XFRM_PATHS:
+            continue
+        keys = placeholder_keys(element) if element.tag == SP else None
+        chain = layout.chain(keys) if keys else []
+        found = next((g for g in map(geometry, [element, *chain]) if g), None)
+        if found is not None:
+            yield element, found, chain
@@ -0,0 +1,53 @@
+"""
+PPT构建工具的测试公用部分：模块路径、合成的结果目录与小型演示文稿
+运行：cd PPT && python -m pytest
+"""
+
+import os
+import sys
+
+import pytest
+
+PPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (PPT_DIR, os.path.join(PPT_DIR, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# 合成图片的尺寸（足够小，构建整份v6只需一秒左右）
+IMAGE_SIZE = (300, 200)
+
+
+def write_csv(data_dir, ref, text):
+    """在结果目录下写一个CSV，ref 为 分析/文件 相对路径"""
+    path = os.path.join(data_dir, *ref.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def make_presentation(slides):
+    """[(稳定ID, 文字)] -> 每页一个文本框的Presentation"""
+    import deck_engine
+
+    prs = deck_engine.new_presentation({"slide_size": [10, 5.625]})
+    for slide_id, text in slides:
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        deck_engine.stamp_slide_id(slide, slide_id)
+        slide.shapes.add_textbox(914400, 914400, 914400 * 4, 914400).text_frame.text = text
+    return prs
+
+
+@pytest.fixture(scope="session")
+def v6_data_dir(tmp_path_factory):
+    """v6引用的全部图片（合成）与几个网络、成对比较的结果CSV"""
+    import bench_deck
+    import deck_engine
+
+    data_dir = str(tmp_path_factory.mktemp("analyses") / "data")
+    bench_deck.make_image_dir(data_dir, deck_engine.load_spec(deck_engine.spec_path("v6", "cn")), IMAGE_SIZE)
+    write_csv(data_dir, "04_network_analysis/01_bacteria_network_stats.csv",
+              "group,n_nodes,n_edges,modularity\nApcMUT_HpKO,80,1280,0.468\nApcMUT_HpWT,100,2190,0.177\n")
+    write_csv(data_dir, "01_alpha_beta_diversity_analysis/46_part4_pairwise_comparisons.csv",
+              "comparison,F_statistic,R2,p_value\nCagA@ApcMUT,3.2,0.28,0.008\nCagA@ApcWT,1.1,0.09,0.41\n")
+    return data_dir
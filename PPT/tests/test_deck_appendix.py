@@ -0,0 +1,85 @@
+"""附录：按估算行高分页、长单元格截断、续页标题与行号范围"""
+
+from pptx import Presentation
+
+import deck_appendix
+import deck_engine
+from conftest import write_csv
+
+REF = "02_functional_profiling/21_taxa_ko_associations.csv"
+
+
+def _spec():
+    spec = deck_engine.load_spec(deck_engine.spec_path("appendix", "cn"))
+    spec["tables"] = [{
+        "id": "taxa-ko", "title": "附录A", "ref": REF,
+        "where": {"FDR": {"max": 0.05}},
+        "columns": [{"column": "Species_short", "label": "物种", "width": 5},
+                    {"column": "FDR", "format": "{:.2e}", "width": 4}],
+    }]
+    return spec
+
+
+def _write_table(data_dir, n):
+    lines = ["Species_short,FDR"]
+    for i in range(n):
+        name = f"Species {i}" + (" very long epithet" * 20 if i % 7 == 0 else "")
+        lines.append(f"{name},{0.001 if i % 3 else 0.2}")
+    lines.append("NA species,NA")
+    write_csv(data_dir, REF, "\n".join(lines) + "\n")
+
+
+def test_paginate_fills_pages():
+    """每页累计行高不超过可用高度，且下一页的首行放不进上一页"""
+    spec = _spec()
+    template = deck_appendix.PageTemplate(spec, spec["tables"][0])
+    rows = [[f"row {i}" + (" long text" * 40 if i % 5 == 0 else ""), str(i)] for i in range(300)]
+    pages = list(deck_appendix.paginate(template, iter(rows)))
+    assert len(pages) > 1
+    assert sum(len(page) for page in pages) == len(rows)
+    for page, following in zip(pages, pages[1:] + [None]):
+        used = sum(height for _, height in page)
+        assert used <= template.available
+        if following:
+            assert used + following[0][1] > template.available
+
+
+def test_long_cells_are_truncated():
+    spec = _spec()
+    template = deck_appendix.PageTemplate(spec, spec["tables"][0])
+    cells, height = template.fit_row(["word " * 200, "1"])
+    assert cells[0].endswith(deck_appendix.ELLIPSIS)
+    assert height == deck_appendix.row_height(template.max_lines, template.font_size)
+
+
+def test_write_appendix(tmp_path):
+    data_dir = str(tmp_path / "data")
+    _write_table(data_dir, 200)
+    path = str(tmp_path / "appendix.pptx")
+    changed, pages = deck_appendix.write_appendix(_spec(), path, data_dir)
+    assert changed and pages > 1
+
+    prs = Presentation(path)
+    assert len(prs.slides) == pages
+    titles = [slide.shapes.title.text for slide in prs.slides]
+    assert titles[0] == "附录A" and all(t == "附录A（续）" for t in titles[1:])
+
+    # 行号范围首尾相接，只包含 FDR<0.05 的行（每3行中2行，NA行不保留）
+    ranges = []
+    for slide in prs.slides:
+        table = next(shape.table for shape in slide.shapes if shape.has_table)
+        caption = slide.shapes[-1].text_frame.text
+        first, last = (int(x) for x in caption.strip("第 行").split("–"))
+        assert last - first + 1 == len(table.rows) - 1
+        ranges.append((first, last))
+    assert ranges[0][0] == 1
+    assert all(b[0] == a[1] + 1 for a, b in zip(ranges, ranges[1:]))
+    assert ranges[-1][1] == sum(1 for i in range(200) if i % 3)
+
+    assert deck_appendix.write_appendix(_spec(), path, data_dir) == (False, pages)
+
+
+def test_missing_table_is_skipped(tmp_path, capsys):
+    changed, pages = deck_appendix.write_appendix(_spec(), str(tmp_path / "appendix.pptx"), str(tmp_path / "data"))
+    assert pages == 0
+    assert "已跳过" in capsys.readouterr().err
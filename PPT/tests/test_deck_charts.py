@@ -0,0 +1,66 @@
+"""原生图表：CSV数据的组织（分类、系列、变换、取前n项），CSV缺失时退回图片，图表页可复现构建"""
+
+import math
+
+import deck_charts
+import deck_engine
+import pptx_writer
+from conftest import write_csv
+
+ROWS = [
+    {"comparison": "A", "p_value": 0.01, "R2": 0.3},
+    {"comparison": "B", "p_value": 0.5, "R2": 0.1},
+    {"comparison": "C", "p_value": 0.001, "R2": 0.2},
+]
+
+
+def _categories(data):
+    return [category.label for category in data.categories]
+
+
+def _series(data):
+    return {series.name: list(series.values) for series in data}
+
+
+def test_category_columns_and_transform():
+    data = deck_charts.category_data(
+        {"category": "comparison", "values": ["p_value"], "transform": "neg_log10", "labels": {"p_value": "P"}}, ROWS,
+    )
+    assert _categories(data) == ["A", "B", "C"]
+    assert _series(data)["P"] == [2.0, -math.log10(0.5), 3.0]
+
+
+def test_rows_and_limit():
+    spec = {"category": "comparison", "values": ["R2"]}
+    assert _categories(deck_charts.category_data(dict(spec, rows=["C", "X", "A"]), ROWS)) == ["C", "A"]
+    assert _categories(deck_charts.category_data(dict(spec, limit=2), ROWS)) == ["A", "C"]
+
+
+def test_series_rows_are_summed():
+    rows = [
+        {"species": "E. coli", "HpKO": 1, "HpWT": 2},
+        {"species": "B. fragilis", "HpKO": 5, "HpWT": 0},
+        {"species": "E. coli", "HpKO": 3, "HpWT": 1},
+    ]
+    data = deck_charts.category_data({"series": "species", "values": ["HpKO", "HpWT"], "limit": 1}, rows)
+    assert _categories(data) == ["HpKO", "HpWT"]
+    assert _series(data) == {"E. coli": [4.0, 3.0]}
+
+
+def test_missing_csv_falls_back(tmp_path):
+    ctx = deck_engine.DeckContext("cn", str(tmp_path))
+    assert deck_charts.chart_drawer(None, ctx) is None
+    assert deck_charts.chart_drawer({"ref": "net/stats.csv", "values": ["modularity"]}, ctx) is None
+    write_csv(str(tmp_path), "net/stats.csv", "group,modularity\nHpKO,0.468\n")
+    assert deck_charts.chart_drawer({"ref": "net/stats.csv", "values": ["modularity"]}, ctx) is not None
+
+
+def test_chart_slides_build_reproducibly(tmp_path, v6_data_dir):
+    spec = deck_engine.load_spec(deck_engine.spec_path("v6", "en"))
+    outputs = [str(tmp_path / f"{i}.pptx") for i in range(2)]
+    for output in outputs:
+        prs = deck_engine.build_presentation(spec, v6_data_dir, lint=False)
+        assert any(shape.has_chart for slide in prs.slides for shape in slide.shapes)
+        pptx_writer.save(prs, output)
+    with open(outputs[0], "rb") as a, open(outputs[1], "rb") as b:
+        assert a.read() == b.read()
@@ -0,0 +1,48 @@
+"""结构比较：页对齐（相同 / 修改 / 新增 / 删除）与形状变化"""
+
+from pptx.enum.shapes import MSO_SHAPE
+
+import deck_diff
+import pptx_writer
+from conftest import make_presentation
+
+
+def _deck(tmp_path, name, slides, extra=()):
+    """extra 中的页再加一个矩形（结构不同的页）"""
+    path = str(tmp_path / name)
+    prs = make_presentation(slides)
+    for (slide_id, _), slide in zip(slides, prs.slides):
+        if slide_id in extra:
+            slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, 914400, 914400)
+    pptx_writer.save(prs, path)
+    return path
+
+
+def _statuses(diffs):
+    return [(d.old.label if d.old else None, d.new.label if d.new else None, d.status) for d in diffs]
+
+
+def test_identical_decks(tmp_path):
+    slides = [("a", "一"), ("b", "二")]
+    diffs = deck_diff.diff_decks(_deck(tmp_path, "old.pptx", slides), _deck(tmp_path, "new.pptx", slides))
+    assert [d.status for d in diffs] == ["same", "same"]
+
+
+def test_alignment(tmp_path):
+    old = _deck(tmp_path, "old.pptx", [("a", "一"), ("b", "二"), ("c", "三"), ("d", "四")])
+    new = _deck(tmp_path, "new.pptx", [("a", "一"), ("x", "新的一页"), ("b", "二（改）"), ("d", "四")], extra={"x"})
+    assert _statuses(deck_diff.diff_decks(old, new)) == [
+        ("a", "a", "same"),
+        (None, "x", "added"),
+        ("b", "b", "modified"),
+        ("c", None, "removed"),
+        ("d", "d", "same"),
+    ]
+
+
+def test_modified_shape_aspects(tmp_path):
+    old = _deck(tmp_path, "old.pptx", [("a", "一")])
+    new = _deck(tmp_path, "new.pptx", [("a", "一（改）")])
+    (diff,) = deck_diff.diff_decks(old, new)
+    assert not diff.added and not diff.removed
+    assert [aspects for _, _, aspects in diff.modified] == [["text"]]
@@ -0,0 +1,69 @@
+"""版式检查：扫描线找重叠（包含关系不算）、出界；v6中英文版没有问题"""
+
+import itertools
+import random
+
+import pytest
+
+import deck_engine
+import deck_lint
+import generate_ppt_v6 as v6
+from conftest import make_presentation
+
+EMU = 914400
+
+
+def _box(name, left, top, width, height):
+    return deck_lint.Box(1, name, name, left * EMU, top * EMU, (left + width) * EMU, (top + height) * EMU)
+
+
+def _names(pairs):
+    return sorted(tuple(sorted((a.name, b.name))) for a, b in pairs)
+
+
+def test_overlaps():
+    boxes = [
+        _box("a", 0, 0, 2, 1),
+        _box("b", 1, 0.5, 2, 1),      # 与a部分重叠
+        _box("c", 0.2, 0.2, 0.5, 0.5),  # 在a内部
+        _box("d", 2, 0, 1, 0.4),      # 与a相接
+        _box("e", 5, 5, 1, 1),
+    ]
+    assert _names(deck_lint.overlaps(boxes)) == [("a", "b")]
+
+
+def test_overlaps_match_pairwise_check():
+    """与两两比较的结果一致"""
+    rng = random.Random(7)
+    boxes = [_box(f"s{i}", rng.uniform(0, 9), rng.uniform(0, 5), rng.uniform(0.1, 3), rng.uniform(0.1, 2))
+             for i in range(60)]
+
+    def overlapping(a, b):
+        w = min(a.right, b.right) - max(a.left, b.left)
+        h = min(a.bottom, b.bottom) - max(a.top, b.top)
+        return w > deck_lint._TOL and h > deck_lint._TOL and not (a.contains(b) or b.contains(a))
+
+    expected = [(a, b) for a, b in itertools.combinations(boxes, 2) if overlapping(a, b)]
+    assert _names(deck_lint.overlaps(boxes)) == _names(expected)
+
+
+def test_lint_presentation_finds_off_canvas():
+    prs = make_presentation([("s1", "文字")])
+    prs.slides[0].shapes.add_textbox(9 * EMU, 5 * EMU, 2 * EMU, EMU // 2)
+    issues = deck_lint.lint_presentation(prs)
+    assert [issue.kind for issue in issues] == ["off_canvas"]
+    assert issues[0].slide == 1
+
+
+def test_inherited_slide_number_is_not_checked():
+    prs = make_presentation([("s1", "文字")])
+    prs.slides[0].shapes.add_textbox(8 * EMU, 4.8 * EMU, int(1.5 * EMU), EMU // 2).text_frame.text = "右下角"
+    v6.add_page_numbers_to_presentation(prs)
+    assert deck_lint.lint_presentation(prs) == []
+
+
+@pytest.mark.parametrize("lang", ["cn", "en"])
+def test_v6_has_no_issues(lang, v6_data_dir):
+    spec = deck_engine.load_spec(deck_engine.spec_path("v6", lang))
+    prs = deck_engine.build_presentation(spec, v6_data_dir, lint=False)
+    assert [str(issue) for issue in deck_lint.lint_presentation(prs)] == []
@@ -0,0 +1,39 @@
+"""多语言构建：版式只编译一次再按语言替换文字，结果与逐语言构建逐字节相同"""
+
+import os
+
+import deck_engine
+import deck_locale
+import results_store
+
+LANGS = ("cn", "en")
+
+
+def test_catalogs_have_the_same_keys():
+    deck_locale.check_catalogs()
+
+
+def test_layout_once_matches_per_language_builds(v6_data_dir, tmp_path):
+    specs = {lang: deck_engine.load_spec(deck_engine.spec_path("v6", lang)) for lang in LANGS}
+    together = {lang: str(tmp_path / f"layout_{lang}.pptx") for lang in LANGS}
+    changed = deck_engine.build_decks(specs, together, v6_data_dir)
+    assert changed == {lang: True for lang in LANGS}
+
+    for lang in LANGS:
+        single = str(tmp_path / f"single_{lang}.pptx")
+        deck_engine.build_deck(results_store.bind_spec(specs[lang], v6_data_dir), single, v6_data_dir)
+        with open(together[lang], "rb") as a, open(single, "rb") as b:
+            assert a.read() == b.read(), lang
+
+    # 再次构建内容不变，不重写
+    assert deck_engine.build_decks(specs, together, v6_data_dir) == {lang: False for lang in LANGS}
+
+
+def test_structure_mismatch_falls_back(v6_data_dir, tmp_path, capsys):
+    """各语言描述的页面结构不一致时退回逐语言构建"""
+    specs = {lang: deck_engine.load_spec(deck_engine.spec_path("v6", lang)) for lang in LANGS}
+    specs["en"]["slides"] = specs["en"]["slides"][:-1]
+    paths = {lang: str(tmp_path / f"{lang}.pptx") for lang in LANGS}
+    deck_engine.build_decks(specs, paths, v6_data_dir)
+    assert "逐语言构建" in capsys.readouterr().err
+    assert all(os.path.exists(path) for path in paths.values())
@@ -0,0 +1,52 @@
+"""增量更新：未变化的条目原样复制，按稳定ID报告变化的页，结果与完整写出相同"""
+
+import deck_patch
+import pptx_writer
+from conftest import make_presentation
+
+SLIDES = [("intro", "引言"), ("result-1", "结果1"), ("summary", "总结")]
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_first_patch_rewrites(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    report = deck_patch.patch_deck(make_presentation(SLIDES), path)
+    assert report["mode"] == "rewrite"
+    assert report["added"] == ["intro", "result-1", "summary"]
+
+
+def test_unchanged_deck_is_left_alone(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    deck_patch.patch_deck(make_presentation(SLIDES), path)
+    before = _read(path)
+    report = deck_patch.patch_deck(make_presentation(SLIDES), path)
+    assert report["mode"] == "unchanged" and not report["written"]
+    assert _read(path) == before
+
+
+def test_changed_slide_is_patched(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    deck_patch.patch_deck(make_presentation(SLIDES), path)
+    changed = [(slide_id, text + "（更新）" if slide_id == "result-1" else text) for slide_id, text in SLIDES]
+    report = deck_patch.patch_deck(make_presentation(changed), path)
+    assert report["mode"] == "patch"
+    assert report["changed"] == ["result-1"]
+    assert report["written"] == ["ppt/slides/slide2.xml"]
+    assert report["copied"] > 0
+
+    full = str(tmp_path / "full.pptx")
+    pptx_writer.save(make_presentation(changed), full)
+    assert _read(path) == _read(full)
+
+
+def test_added_and_deleted_slides(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    deck_patch.patch_deck(make_presentation(SLIDES), path)
+    slides = [SLIDES[0], ("result-2", "结果2"), SLIDES[2]]
+    report = deck_patch.patch_deck(make_presentation(slides), path)
+    assert report["added"] == ["result-2"]
+    assert report["deleted"] == ["result-1"]
@@ -0,0 +1,18 @@
+"""缩略图：没有中文字体时只提示一次"""
+
+import deck_preview
+import text_fit
+
+
+def test_missing_cjk_font_warns_once(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(text_fit, "FONT_DIRS", ())
+    monkeypatch.setenv("PC047_FONT_DIR", str(tmp_path))
+    deck_preview.font_files.cache_clear()
+    try:
+        assert deck_preview.font_files()["ea"] is None
+        deck_preview.font_files()
+    finally:
+        deck_preview.font_files.cache_clear()
+    err = capsys.readouterr().err.splitlines()
+    assert len(err) == 1
+    assert "找不到中文字体" in err[0] and "NotoSansCJK-Regular.ttc" in err[0]
@@ -0,0 +1,35 @@
+"""监视模式的增量构建：输入未变的页直接复用，输出与完整构建一致"""
+
+import shutil
+
+from PIL import Image
+
+import deck_engine
+import deck_watch
+
+
+def test_incremental_build(tmp_path, v6_data_dir):
+    data_dir = str(tmp_path / "data")
+    shutil.copytree(v6_data_dir, data_dir)
+    spec_file = deck_engine.spec_path("v6", "cn")
+    output = str(tmp_path / "watch.pptx")
+    deck = deck_watch.IncrementalDeck(spec_file, output, data_dir)
+    n_slides = len(deck_engine.load_spec(spec_file)["slides"])
+
+    first = deck.build()
+    assert (first["rebuilt"], first["reused"], first["changed"]) == (n_slides, 0, True)
+    second = deck.build()
+    assert (second["rebuilt"], second["reused"], second["changed"]) == (0, n_slides, False)
+
+    full = str(tmp_path / "full.pptx")
+    deck_engine.build_deck(deck_engine.load_spec(spec_file), full, data_dir)
+    with open(output, "rb") as a, open(full, "rb") as b:
+        assert a.read() == b.read()
+
+    # 只改一张图：只重建引用它的那一页
+    refs = [ref for slide in deck.spec["slides"] for ref in set(deck_engine.slide_image_refs(slide))]
+    ref = next(ref for ref in refs if refs.count(ref) == 1)
+    image = deck_engine.DeckContext("cn", data_dir).image_path(ref)
+    Image.new("RGB", (320, 200), "crimson").save(image)
+    third = deck.build()
+    assert (third["rebuilt"], third["changed"]) == (1, True)
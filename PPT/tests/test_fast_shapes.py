@@ -0,0 +1,47 @@
+"""一次性生成的形状XML与python-pptx逐步设置的结果一致；形状ID连续分配且不与其它代码插入的形状冲突"""
+
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches
+
+import fast_shapes
+from bench_shapes import proxy_box_with_text
+from generate_ppt_v6 import COLORS, add_box_with_text
+
+
+def _blank_slide():
+    prs = Presentation()
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+
+def _xml(shape):
+    return etree.tostring(shape._element)
+
+
+def test_box_matches_python_pptx():
+    args = (0.5, 1.0, 2.0, 0.6, "Box 1\n第1个 <&>", COLORS['light_blue'], None, 12, True)
+    fast = add_box_with_text(_blank_slide(), *args, fit=False)
+    proxy = proxy_box_with_text(_blank_slide(), *args)
+    assert _xml(fast) == _xml(proxy)
+
+
+def test_textbox_matches_python_pptx():
+    fast = fast_shapes.add_sp(_blank_slide(), Inches(1), Inches(1), Inches(3), Inches(1), textbox=True, word_wrap=True)
+    slide = _blank_slide()
+    proxy = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(3), Inches(1))
+    proxy.text_frame.word_wrap = True
+    assert _xml(fast) == _xml(proxy)
+
+
+def test_shape_ids_stay_unique_after_python_pptx_inserts():
+    slide = _blank_slide()
+    first = fast_shapes.add_sp(slide, 0, 0, Inches(1), Inches(1))
+    second = fast_shapes.add_sp(slide, 0, 0, Inches(1), Inches(1))
+    assert second.shape_id == first.shape_id + 1
+
+    # python-pptx直接插入形状后，缓存的下一个ID失效，需要重新扫描
+    slide.shapes.add_textbox(0, 0, Inches(1), Inches(1))
+    third = fast_shapes.add_placeholder(slide, "sldNum", "3", field="slidenum")
+    ids = [shape.shape_id for shape in slide.shapes]
+    assert len(ids) == len(set(ids))
+    assert third.shape_id == max(ids)
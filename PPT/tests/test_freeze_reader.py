@@ -0,0 +1,102 @@
+"""冻结结果索引：单元标签（输出图片名 / qmd标签 / 序号）、按偏移读取、文件变化后重建索引"""
+
+import json
+import os
+
+import pytest
+
+import freeze_reader
+
+MARKDOWN = "\n".join([
+    "# 标题",
+    "",
+    "::: {.cell}",
+    "```{.r .cell-code}",
+    "mantel_result <- vegan::mantel(d1, d2)",
+    "print(mantel_result)",
+    "```",
+    "",
+    "::: {.cell-output .cell-output-stdout}",
+    "```",
+    "Mantel 统计量 (r): 0.5213",
+    "P-value: 0.001",
+    "```",
+    ":::",
+    ":::",
+    "",
+    "::: {.cell}",
+    "```{.r .cell-code}",
+    "plot(stats)",
+    "```",
+    "",
+    "::: {.cell-output-display}",
+    "![](04_files/figure-html/part2-stats-barplot-1.png){width=672}",
+    ":::",
+    ":::",
+    "",
+    "::: {.cell}",
+    "```{.r .cell-code}",
+    "summary(x)",
+    "```",
+    ":::",
+])
+
+QMD = """```{r}
+#| label: host-virus-correlation
+mantel_result <- vegan::mantel(d1, d2)
+print(mantel_result)
+```
+"""
+
+
+@pytest.fixture
+def analyses_dir(tmp_path):
+    analyses = tmp_path / "analyses"
+    results = analyses / "_freeze" / "03_demo" / "execute-results"
+    results.mkdir(parents=True)
+    (results / "html.json").write_text(
+        json.dumps({"hash": "x", "result": {"engine": "knitr", "markdown": MARKDOWN}}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    (analyses / "03_demo.qmd").write_text(QMD, encoding="utf-8")
+    return str(analyses)
+
+
+def test_labels_and_chunks(analyses_dir, tmp_path):
+    reader = freeze_reader.FreezeReader(analyses_dir, str(tmp_path / "freeze.sqlite"))
+    assert reader.refresh() == 1
+    assert list(reader.labels("03_demo")) == ["host-virus-correlation", "part2-stats-barplot", "cell-3"]
+
+    chunk = reader.chunk("03_demo", "host-virus-correlation")
+    assert chunk.code == ["mantel_result <- vegan::mantel(d1, d2)", "print(mantel_result)"]
+    assert "Mantel 统计量 (r): 0.5213" in chunk.text
+    assert reader.chunk("03_demo", "part2-stats-barplot").figures == ["04_files/figure-html/part2-stats-barplot-1.png"]
+    with pytest.raises(KeyError):
+        reader.chunk("03_demo", "missing")
+    reader.close()
+
+
+def test_index_is_cached_until_the_file_changes(analyses_dir, tmp_path):
+    db_path = str(tmp_path / "freeze.sqlite")
+    reader = freeze_reader.FreezeReader(analyses_dir, db_path)
+    assert reader.refresh() == 1
+    assert reader.refresh() == 0
+
+    path = reader.results_path("03_demo")
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["result"]["markdown"] = data["result"]["markdown"].replace("0.5213", "0.6001")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.utime(path, ns=(1, 1))
+    assert reader.refresh() == 1
+    assert "0.6001" in reader.chunk("03_demo", "host-virus-correlation").text
+    reader.close()
+
+
+def test_lines_split_across_blocks(analyses_dir, tmp_path, monkeypatch):
+    """块边界落在转义序列或多字节字符中间时行内容不变"""
+    monkeypatch.setattr(freeze_reader, "BLOCK_SIZE", 7)
+    with open(os.path.join(analyses_dir, "_freeze", "03_demo", "execute-results", "html.json"), "rb") as f:
+        lines = [line for _, _, line in freeze_reader.iter_markdown_lines(f)]
+    assert lines == MARKDOWN.split("\n")
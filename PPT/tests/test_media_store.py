@@ -0,0 +1,89 @@
+"""SVG图片：原样嵌入并以svgBlip引用，形状本身显示缓存的PNG回退图；没有回退图来源时默认报错"""
+
+import os
+import sys
+import zipfile
+
+import pytest
+from lxml import etree
+
+import deck_engine
+import image_cache
+import media_store
+from bench_deck import make_svg_image
+
+SVG_REF = "summary_graphical_abstract_horizontal.svg"
+_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "asvg": media_store.SVG_NS,
+    "ct": "http://schemas.openxmlformats.org/package/2006/content-types",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+_R_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+
+
+@pytest.fixture
+def no_cairosvg(monkeypatch):
+    """按未安装cairosvg处理（回退图来自同名PNG或报错）"""
+    monkeypatch.setitem(sys.modules, "cairosvg", None)
+
+
+@pytest.fixture
+def svg_dir(tmp_path):
+    data_dir = str(tmp_path / "data")
+    make_svg_image(os.path.join(data_dir, SVG_REF), (350, 200), seed="svg")
+    return data_dir
+
+
+def test_svg_package_parts(tmp_path, svg_dir, no_cairosvg):
+    spec = {
+        "slide_size": [10, 5.625],
+        "slides": [{"type": "boxes", "title": "图形摘要", "images": [{"ref": SVG_REF, "left": 2, "top": 1.25, "width": 6}]}],
+    }
+    path = str(tmp_path / "svg.pptx")
+    deck_engine.build_deck(spec, path, svg_dir)
+
+    with zipfile.ZipFile(path) as z:
+        slide = etree.fromstring(z.read("ppt/slides/slide1.xml"))
+        rels = {
+            rel.get("Id"): rel.get("Target")
+            for rel in etree.fromstring(z.read("ppt/slides/_rels/slide1.xml.rels")).iterfind("rel:Relationship", _NS)
+        }
+        types = {
+            override.get("PartName"): override.get("ContentType")
+            for override in etree.fromstring(z.read("[Content_Types].xml")).iterfind("ct:Override", _NS)
+        }
+        blip = slide.find(".//p:pic/p:blipFill/a:blip", _NS)
+        svg_blip = blip.find(f"a:extLst/a:ext[@uri='{media_store.SVG_EXT_URI}']/asvg:svgBlip", _NS)
+        png_target, svg_target = rels[blip.get(_R_EMBED)], rels[svg_blip.get(_R_EMBED)]
+        assert png_target.endswith(".png") and svg_target.endswith(".svg")
+
+        svg_name = "/ppt/" + svg_target.replace("../", "")
+        assert types[svg_name] == "image/svg+xml"
+        with open(os.path.join(svg_dir, SVG_REF), "rb") as f:
+            assert z.read(svg_name.lstrip("/")) == f.read()
+
+
+def test_fallback_is_cached(tmp_path, svg_dir, no_cairosvg):
+    svg = os.path.join(svg_dir, SVG_REF)
+    cache_dir = str(tmp_path / "cache")
+    first = image_cache.svg_fallback(svg, width_in=6, cache_dir=cache_dir)
+    assert first.endswith("_raster.png")
+    os.utime(first, ns=(0, 0))
+    assert image_cache.svg_fallback(svg, width_in=6, cache_dir=cache_dir) == first
+    assert os.stat(first).st_mtime_ns == 0
+    assert image_cache.svg_fallback(svg, width_in=3, cache_dir=cache_dir) != first
+
+
+def test_missing_fallback_source_fails_without_opt_in(tmp_path, svg_dir, no_cairosvg, monkeypatch, capsys):
+    svg = os.path.join(svg_dir, SVG_REF)
+    os.remove(os.path.splitext(svg)[0] + ".png")
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.delenv(image_cache.BLANK_FALLBACK_ENV, raising=False)
+    with pytest.raises(ValueError, match=image_cache.BLANK_FALLBACK_ENV):
+        image_cache.svg_fallback(svg, width_in=6, cache_dir=cache_dir)
+
+    monkeypatch.setenv(image_cache.BLANK_FALLBACK_ENV, "1")
+    assert image_cache.svg_fallback(svg, width_in=6, cache_dir=cache_dir).endswith("_blank.png")
+    assert "空白" in capsys.readouterr().err
@@ -0,0 +1,68 @@
+"""流式输出：可复现构建、内容未变化时不重写、媒体原样存储、并行压缩与串行结果一致"""
+
+import io
+import os
+import zipfile
+
+from pptx import Presentation
+
+import pptx_writer
+from conftest import make_presentation
+
+
+def _with_picture(tmp_path):
+    from PIL import Image
+
+    image = str(tmp_path / "plot.png")
+    Image.new("RGB", (64, 48), "steelblue").save(image)
+    prs = make_presentation([("s1", "第一页"), ("s2", "第二页")])
+    prs.slides[0].shapes.add_picture(image, 0, 0)
+    return prs
+
+
+def test_repeat_builds_are_identical(tmp_path):
+    a, b = str(tmp_path / "a.pptx"), str(tmp_path / "b.pptx")
+    assert pptx_writer.save(_with_picture(tmp_path), a)
+    assert pptx_writer.save(_with_picture(tmp_path), b)
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        assert fa.read() == fb.read()
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    assert pptx_writer.save(_with_picture(tmp_path), path)
+    os.utime(path, ns=(0, 0))
+    assert not pptx_writer.save(_with_picture(tmp_path), path)
+    assert os.stat(path).st_mtime_ns == 0
+
+    prs = _with_picture(tmp_path)
+    prs.slides[1].shapes[0].text_frame.text = "改过的第二页"
+    assert pptx_writer.save(prs, path)
+    assert os.stat(path).st_mtime_ns != 0
+
+
+def test_non_reproducible_always_writes(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    assert pptx_writer.save(_with_picture(tmp_path), path, reproducible=False)
+    assert pptx_writer.save(_with_picture(tmp_path), path, reproducible=False)
+
+
+def test_output_opens_and_media_is_stored(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    pptx_writer.save(_with_picture(tmp_path), path, parallel=True)
+    assert len(Presentation(path).slides) == 2
+    with zipfile.ZipFile(path) as z:
+        assert z.testzip() is None
+        infos = {info.filename: info for info in z.infolist()}
+    media = [info for name, info in infos.items() if name.startswith("ppt/media/")]
+    assert media and all(info.compress_type == zipfile.ZIP_STORED for info in media)
+    assert infos["ppt/presentation.xml"].compress_type == zipfile.ZIP_DEFLATED
+    assert all(info.date_time == (1980, 1, 1, 0, 0, 0) for info in infos.values())
+
+
+def test_parallel_matches_serial(tmp_path):
+    entries = list(pptx_writer.package_entries(_with_picture(tmp_path)))
+    serial, parallel = io.BytesIO(), io.BytesIO()
+    pptx_writer.write_entries(serial, entries)
+    pptx_writer.write_entries(parallel, entries, parallel=True)
+    assert serial.getvalue() == parallel.getvalue()
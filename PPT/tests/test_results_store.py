@@ -0,0 +1,107 @@
+"""结果绑定：CSV取值、默认值与警告、相对降幅、占位符替换"""
+
+import pytest
+
+import results_store
+from conftest import write_csv
+
+PERMANOVA = "01_alpha_beta_diversity_analysis/16_permanova_bray_curtis_species.csv"
+NETWORK = "04_network_analysis/01_bacteria_network_stats.csv"
+
+BINDINGS = {
+    "beta_p": {"ref": PERMANOVA, "row": "treatment_group", "column": "Pr(>F)", "format": "{:.3f}", "default": 0.012},
+    "beta_r2": {"ref": PERMANOVA, "row": "treatment_group", "column": "R2", "format": "{:.1%}", "default": 0.331},
+    "ko_mod": {"ref": NETWORK, "row": "ApcMUT_HpKO", "column": "modularity", "default": 0.468},
+    "wt_mod": {"ref": NETWORK, "row": "ApcMUT_HpWT", "column": "modularity", "default": 0.177},
+    "mod_drop": {"decrease": ["ko_mod", "wt_mod"], "format": "{:.0%}"},
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_warnings(monkeypatch):
+    monkeypatch.setattr(results_store, "_warned", set())
+
+
+@pytest.fixture
+def store(tmp_path):
+    data_dir = tmp_path / "data"
+    write_csv(str(data_dir), PERMANOVA,
+              '"","Df","SumOfSqs","R2","F","Pr(>F)"\n'
+              '"treatment_group",5,1.2,0.3312,2.1,0.011\n'
+              '"Residual",24,2.4,0.6688,NA,NA\n')
+    write_csv(str(data_dir), NETWORK, "group,n_nodes,n_edges,modularity\nApcMUT_HpKO,80,1280,0.5\nApcMUT_HpWT,100,2190,0.2\n")
+    store = results_store.ResultsStore(str(data_dir), str(tmp_path / "results.sqlite"))
+    store.refresh()
+    yield store
+    store.close()
+
+
+def test_values_come_from_csv(store, capsys):
+    """有结果时取CSV中的值，不打印警告"""
+    values = results_store.resolve_bindings(BINDINGS, store)
+    assert values["beta_p"] == 0.011
+    assert values["beta_r2"] == 0.3312
+    assert values["mod_drop"] == pytest.approx(0.6)
+    assert capsys.readouterr().err == ""
+
+
+def test_duplicate_header_is_made_unique(store):
+    """重复列名按R的make.unique改名，不会因主键冲突导入失败"""
+    ref = "05_misc/dup.csv"
+    write_csv(store.data_dir, ref, "id,x,x,y\nA,1,2,3\n")
+    assert store.refresh() == 1
+    assert [store.get(ref, "A", col) for col in ("x", "x.1", "y")] == [1, 2, 3]
+
+
+def test_no_results_dir_uses_defaults_silently(capsys):
+    """没有结果目录时静默使用默认值"""
+    values = results_store.resolve_bindings(BINDINGS, None)
+    assert values["beta_p"] == 0.012
+    assert values["mod_drop"] == pytest.approx((0.468 - 0.177) / 0.468)
+    assert capsys.readouterr().err == ""
+
+
+def test_missing_value_warns_once(store, capsys):
+    """有结果但找不到行或文件时使用默认值并按文件合并警告，同样的警告只打印一次"""
+    bindings = dict(BINDINGS)
+    bindings["beta_p"] = dict(BINDINGS["beta_p"], row="genotype")
+    bindings["func_p"] = {"ref": "02_functional_profiling/04_permanova_bray_humann_pathway.csv",
+                          "row": "treatment_group", "column": "Pr(>F)", "default": 0.012}
+    values = results_store.resolve_bindings(bindings, store)
+    results_store.resolve_bindings(bindings, store)
+    assert values["beta_p"] == 0.012 and values["func_p"] == 0.012
+    err = capsys.readouterr().err.splitlines()
+    assert len(err) == 2
+    assert "[genotype, Pr(>F)]" in err[0] and "beta_p" in err[0]
+    assert "结果中没有 02_functional_profiling/04_permanova_bray_humann_pathway.csv" in err[1]
+
+
+def test_missing_without_default_raises(store):
+    with pytest.raises(KeyError):
+        results_store.resolve_bindings({"x": {"ref": PERMANOVA, "row": "nope", "column": "R2"}}, store)
+
+
+def test_decrease_with_zero_base(capsys):
+    """降幅的基数为0时没有值，显示为 —"""
+    bindings = {"a": {"default": 0}, "b": {"default": 0}, "drop": {"decrease": ["a", "b"], "format": "{:.0%}"}}
+    values = results_store.resolve_bindings(bindings, None)
+    assert values["drop"] is None
+    assert results_store.format_value(values["drop"], "{:.0%}") == "—"
+    assert "a 为0" in capsys.readouterr().err
+
+
+def test_substitute():
+    """字符串中的占位符按format格式化；整个字符串只有一个占位符时替换为原始数值"""
+    values = {"beta_p": 0.0114, "mod_drop": 0.62, "n": 5}
+    formats = {"beta_p": "{:.3f}", "mod_drop": "{:.0%}"}
+    slides = [{"text": "P={{beta_p}}，降低{{ mod_drop }}", "results": {"beta_p": "{{beta_p}}"}, "count": ["{{n}}"]}]
+    assert results_store.substitute(slides, values, formats) == [
+        {"text": "P=0.011，降低62%", "results": {"beta_p": 0.0114}, "count": [5]}
+    ]
+    with pytest.raises(KeyError):
+        results_store.substitute("{{unknown}} 次", values, formats)
+
+
+def test_bind_spec_without_bindings_is_unchanged():
+    spec = {"slides": [{"title": "{{beta_p}}"}]}
+    assert results_store.bind_spec(spec, None) is spec
@@ -0,0 +1,90 @@
+"""静态页片段缓存：拼接结果与直接构建一致、磁盘缓存往返；含图片与原生图表的页捕获后在新PPT中重新关联"""
+
+import os
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+import deck_charts
+import deck_engine
+import generate_ppt_v6 as v6
+import slide_cache
+from conftest import write_csv
+
+SPEC = {"slide_size": [10, 5.625]}
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def _sptree(slide):
+    return etree.tostring(slide.shapes._spTree)
+
+
+def test_spliced_static_slide_matches_direct_build(tmp_path):
+    direct = v6.add_hypothesis_slide(deck_engine.new_presentation(SPEC), "cn")
+    prs = deck_engine.new_presentation(SPEC)
+    fragment = slide_cache.get_fragment(v6.add_hypothesis_slide, "cn", prs, cache_dir=str(tmp_path))
+    spliced = slide_cache.splice_fragment(prs, fragment)
+    assert _sptree(spliced) == _sptree(direct)
+    assert spliced.notes_slide.notes_text_frame.text == direct.notes_slide.notes_text_frame.text
+    assert spliced.slide_layout.name == direct.slide_layout.name
+
+
+def test_disk_cache_round_trip(tmp_path):
+    slide_cache.clear()
+    prs = deck_engine.new_presentation(SPEC)
+    first = slide_cache.get_fragment(v6.add_background_slide_1, "en", prs, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+    slide_cache.clear()
+    second = slide_cache.get_fragment(v6.add_background_slide_1, "en", prs, cache_dir=str(tmp_path))
+    assert second is not first
+    assert (second.sptree, second.notes, second.layout) == (first.sptree, first.notes, first.layout)
+
+
+def test_results_are_part_of_the_key():
+    prs = deck_engine.new_presentation(SPEC)
+    keys = {
+        slide_cache.fragment_key("add_hypothesis_slide", "cn", prs, results)
+        for results in (None, {"beta_p": 0.012}, {"beta_p": 0.02})
+    }
+    assert len(keys) == 3
+
+
+def _figure_slide(prs, image, csv_path):
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    v6.add_picture(slide, image, 0.5, 1.2, 4)
+    deck_charts.add_chart(slide, {"kind": "bar", "category": "group", "values": ["modularity"]}, csv_path, 5, 1.2, 4, 3)
+    slide.notes_slide.notes_text_frame.text = "备注"
+    return slide
+
+
+def test_captured_slide_relinks_media_and_charts(tmp_path):
+    from PIL import Image
+
+    image = str(tmp_path / "figure.png")
+    Image.new("RGB", (400, 300), "seagreen").save(image)
+    other = str(tmp_path / "other.png")
+    Image.new("RGB", (400, 300), "orange").save(other)
+    csv_path = write_csv(str(tmp_path), "net/stats.csv", "group,modularity\nHpKO,0.468\nHpWT,0.177\n")
+
+    source = deck_engine.new_presentation(SPEC)
+    fragment = slide_cache.capture_fragment(_figure_slide(source, image, csv_path))
+    assert len(fragment.media) == 1 and len(fragment.charts) == 1
+
+    # 目标PPT中已有其它图片与图表，关系ID与部件名都会不同
+    target = deck_engine.new_presentation(SPEC)
+    _figure_slide(target, other, csv_path)
+    spliced = slide_cache.splice_fragment(target, fragment)
+    direct = _figure_slide(deck_engine.new_presentation(SPEC), image, csv_path)
+
+    rels = spliced.part.rels
+    for element in spliced.shapes._spTree.iter():
+        for attr in (f"{_R}embed", f"{_R}id"):
+            if element.get(attr):
+                assert element.get(attr) in rels
+    picture, chart = spliced.shapes[0], spliced.shapes[1]
+    assert picture.image.blob == direct.shapes[0].image.blob
+    assert chart.chart.part is not target.slides[0].shapes[1].chart.part
+    assert chart.chart.part.blob == direct.shapes[1].chart.part.blob
+    assert chart.chart.part.chart_workbook.xlsx_part.blob == direct.shapes[1].chart.part.chart_workbook.xlsx_part.blob
+    assert sorted(rel.reltype for rel in rels.values()) == sorted([RT.SLIDE_LAYOUT, RT.NOTES_SLIDE, RT.IMAGE, RT.CHART])
+    assert spliced.notes_slide.notes_text_frame.text == "备注"
@@ -0,0 +1,42 @@
+"""文字适配：能放下时用最大字号，放不下时逐级缩小；多语言共用版式时各语言字号必须一致"""
+
+import pytest
+
+import deck_locale
+import text_fit
+
+SHORT = "PERMANOVA"
+LONG = "幽门螺杆菌缺失改变了ApcMUT小鼠肠道菌群的组成与功能冗余。" * 4
+
+
+def test_short_text_keeps_max_size():
+    assert text_fit.fit_font_size([SHORT], 3, 0.6, 14) == 14
+
+
+def test_long_text_gets_largest_fitting_size():
+    size = text_fit.fit_font_size([LONG], 3, 1.5, 16)
+    assert text_fit.MIN_FONT_SIZE <= size < 16
+    assert text_fit.text_height([LONG], 3, size) <= 1.5
+    assert text_fit.text_height([LONG], 3, size + text_fit.SIZE_STEP) > 1.5
+
+
+def test_warns_when_min_size_does_not_fit(capsys):
+    assert text_fit.fit_text(LONG * 3, 2, 0.3, 14) == text_fit.MIN_FONT_SIZE
+    assert "仍放不下" in capsys.readouterr().err
+
+
+@pytest.fixture
+def layout():
+    saved = dict(deck_locale._layout)
+    yield
+    deck_locale._layout.update(saved)
+
+
+def test_per_language_sizes_must_match(layout):
+    deck_locale.begin_layout(["cn", "en"], {"slides/0/text": {"cn": SHORT, "en": LONG}})
+    token = deck_locale.tokenize("s", "slides/0/text", SHORT)
+    with pytest.raises(deck_locale.LocaleMismatch):
+        text_fit.fit_text(token, 3, 1.5, 16)
+
+    deck_locale.begin_layout(["cn", "en"], {"slides/0/text": {"cn": SHORT, "en": "Beta"}})
+    assert text_fit.fit_text(token, 3, 1.5, 16) == 16
@@ -0,0 +1,296 @@
+"""
+PC047组会PPT文字适配
+add_box_with_text / add_content_slide 原来使用固定字号（10~28pt），中英文长句溢出方框要打开PowerPoint才发现。
+这里不经过渲染，按字形步进宽度表直接计算折行与能放下的最大字号：
+- 步进宽度表（字符 -> em宽度）首次从字体文件测量（Pillow读取TrueType），缓存在 PPT/.cache/fonts/<字体>.json；
+  找不到字体文件时使用内置近似表（东亚全角字符1em，拉丁字符按字形类别估计）
+- 按PowerPoint的规则折行：拉丁文在空格处断行，中日韩字符逐字可断，超过一行的单词按字符断开
+- 文字宽度随字号线性变化：各词的em宽度只算一次，每个候选字号只需一次贪心折行，二分查找最大字号
+拉丁字符使用主题正文字体（Calibri），东亚字符使用中文字体（微软雅黑）。
+"""
+
+import json
+import os
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+PPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(PPT_DIR, ".cache", "fonts")
+
+LATIN_FONT = "Calibri"
+EA_FONT = "Microsoft YaHei"
+
+# 字体名 -> 候选字体文件（Carlito与Calibri度量兼容）
+FONT_FILES = {
+    "Calibri": ("calibri.ttf", "Carlito-Regular.ttf"),
+    "Calibri Bold": ("calibrib.ttf", "Carlito-Bold.ttf"),
+    "Microsoft YaHei": ("msyh.ttc", "msyh.ttf", "NotoSansCJK-Regular.ttc", "NotoSansSC-Regular.otf", "wqy-microhei.ttc"),
+}
+FONT_DIRS = (
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+    os.path.expanduser("~/Library/Fonts"),
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+)
+
+# 预先测量的字符：ASCII、Latin-1、希腊字母、常用标点/箭头/符号，以及代表全角字符的“中”
+CHARSET = (
+    [chr(c) for c in range(0x20, 0x7F)]
+    + [chr(c) for c in range(0xA0, 0x100)]
+    + [chr(c) for c in range(0x391, 0x3CA)]
+    + [chr(c) for c in range(0x2010, 0x2027)]
+    + list("→←↑↓×−✓✗○●⭐…")
+    + ["中"]
+)
+
+# 行高（字号的倍数）、默认内边距（英寸，与PowerPoint文本框默认值一致）
+LINE_SPACING = 1.2
+INSET_X = 0.1
+MIN_FONT_SIZE = 8
+SIZE_STEP = 0.5
+# 没有粗体字体文件时，粗体拉丁字符按常规宽度放大
+BOLD_FACTOR = 1.05
+
+# 内置近似表：字形类别 -> em宽度
+_APPROX = (
+    ("ijlI.,:;!|'`", 0.24),
+    ("ftr()[]{}\"-/\\", 0.34),
+    (" ", 0.23),
+    ("mwMW@%", 0.82),
+    ("ABCDEFGHJKLNOPQRSTUVXYZ&", 0.60),
+    ("0123456789", 0.51),
+)
+_APPROX_DEFAULT = 0.50
+_APPROX_SYMBOL = 0.55
+
+# 可断行单元：单个全角字符 | 连续空白 | 连续的其它字符（单词）
+_UNITS = re.compile(r"[\u2E80-\u9FFF\uF900-\uFAFF\uFF00-\uFFEF\u3000-\u303F\uAC00-\uD7AF]|\s+|[^\s\u2E80-\u9FFF\uF900-\uFAFF\uFF00-\uFFEF\u3000-\u303F\uAC00-\uD7AF]+")
+_MARKUP = re.compile(r"\*\*")
+
+
+def _is_wide(ch):
+    return unicodedata.east_asian_width(ch) in "WF"
+
+
+def _approx_advance(ch):
+    if _is_wide(ch):
+        return 1.0
+    for chars, width in _APPROX:
+        if ch in chars:
+            return width
+    return _APPROX_DEFAULT if ch.isalpha() else _APPROX_SYMBOL
+
+
+def find_font_file(name, files=None):
+    """按候选文件名（默认 FONT_FILES[name]，靠前的优先）在常见字体目录中查找，找不到时为None
+    （可用环境变量 PC047_FONT_DIR 指定目录）"""
+    candidates = [f.lower() for f in (files if files is not None else FONT_FILES.get(name, ()))]
+    dirs = [os.environ["PC047_FONT_DIR"]] if os.environ.get("PC047_FONT_DIR") else []
+    found = {}
+    for font_dir in dirs + list(FONT_DIRS):
+        if not os.path.isdir(font_dir):
+            continue
+        for root, _, names in os.walk(font_dir):
+            for f in names:
+                if f.lower() in candidates:
+                    found.setdefault(f.lower(), os.path.join(root, f))
+        if found:
+            return found[min(found, key=candidates.index)]
+    return None
+
+
+class FontMetrics:
+    """一种字体的步进宽度表（em）"""
+
+    def __init__(self, name):
+        self.name = name
+        self._font = None
+        self.path = find_font_file(name)
+        self.advances = self._load() if self.path else {}
+
+    def _cache_path(self):
+        return os.path.join(CACHE_DIR, re.sub(r"\W+", "_", self.name) + ".json")
+
+    def _load(self):
+        """读取缓存的宽度表；字体文件变化或没有缓存时重新测量"""
+        stat = os.stat(self.path)
+        source = {"path": self.path, "size": stat.st_size, "mtime": int(stat.st_mtime)}
+        try:
+            with open(self._cache_path(), encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("source") == source:
+                return cached["advances"]
+        except (OSError, ValueError):
+            pass
+        try:
+            advances = {ch: self._measure(ch) for ch in CHARSET}
+        except OSError as e:
+            print(f"警告：无法读取字体 {self.path}（{e}），使用近似宽度", file=sys.stderr)
+            self.path = None
+            return {}
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{self._cache_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"source": source, "advances": advances}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._cache_path())
+        return advances
+
+    def _measure(self, ch):
+        if self._font is None:
+            from PIL import ImageFont
+            self._font = ImageFont.truetype(self.path, 1000)
+        return round(self._font.getlength(ch) / 1000, 4)
+
+    def advance(self, ch):
+        """字符的em宽度；表中没有的字符用字体文件补测，没有字体文件时用近似值"""
+        width = self.advances.get(ch)
+        if width is None:
+            width = self._measure(ch) if self.path else _approx_advance(ch)
+            self.advances[ch] = width
+        return width
+
+
+_metrics = {}
+
+
+def metrics(name):
+    """按字体名缓存的 FontMetrics"""
+    if name not in _metrics:
+        _metrics[name] = FontMetrics(name)
+    return _metrics[name]
+
+
+def metrics_key():
+    """影响测量结果的字体文件（供片段缓存判断是否失效）"""
+    return ";".join(f"{name}={metrics(name).path}" for name in (LATIN_FONT, f"{LATIN_FONT} Bold", EA_FONT))
+
+
+def char_width(ch, bold=False):
+    """单个字符的em宽度：全角字符按中文字体，其余按拉丁字体"""
+    if _is_wide(ch):
+        return metrics(EA_FONT).advance(ch) if metrics(EA_FONT).path else 1.0
+    if bold:
+        bold_metrics = metrics(f"{LATIN_FONT} Bold")
+        if bold_metrics.path:
+            return bold_metrics.advance(ch)
+        return metrics(LATIN_FONT).advance(ch) * BOLD_FACTOR
+    return metrics(LATIN_FONT).advance(ch)
+
+
+@lru_cache(maxsize=65536)
+def text_width(text, bold=False):
+    """一行文字的em宽度（乘以字号得磅数）"""
+    return sum(char_width(ch, bold) for ch in text)
+
+
+@lru_cache(maxsize=4096)
+def _units(text, bold):
+    """段落 -> ((em宽度, 是否空白, 文字), ...)"""
+    return tuple((text_width(u, bold), u.isspace(), u) for u in _UNITS.findall(text))
+
+
+def _wrap_units(units, width_em, bold):
+    """贪心折行，返回各行文字（行尾空白不占宽度）"""
+    lines, line, used = [], "", 0.0
+    gap, gap_width = "", 0.0
+    for width, space, text in units:
+        if space:
+            if line:
+                gap, gap_width = gap + text, gap_width + width
+            continue
+        if line and used + gap_width + width > width_em:
+            lines.append(line)
+            line, used = "", 0.0
+        elif line:
+            line, used = line + gap, used + gap_width
+        gap, gap_width = "", 0.0
+        if width <= width_em or line:
+            line, used = line + text, used + width
+            continue
+        # 单词比整行还宽：按字符断开
+        for ch in text:
+            w = char_width(ch, bold)
+            if line and used + w > width_em:
+                lines.append(line)
+                line, used = "", 0.0
+            line, used = line + ch, used + w
+    lines.append(line)
+    return lines
+
+
+def plain_text(text):
+    """去掉 **加粗** 标记后的文字"""
+    return _MARKUP.sub("", text)
+
+
+def wrap(text, width, font_size, bold=False):
+    """按可用宽度（英寸）折行，返回各行文字"""
+    width_em = width * 72 / font_size
+    lines = []
+    for paragraph in plain_text(text).replace("\v", "\n").split("\n"):
+        lines.extend(_wrap_units(_units(paragraph, bold), width_em, bold))
+    return lines
+
+
+def line_count(paragraphs, width, font_size, bold=False):
+    """各段落在该字号下的折行数"""
+    width_em = width * 72 / font_size
+    return [
+        sum(len(_wrap_units(_units(line, bold), width_em, bold)) for line in plain_text(p).replace("\v", "\n").split("\n"))
+        for p in paragraphs
+    ]
+
+
+def text_height(paragraphs, width, font_size, bold=False, space_before=0):
+    """多段文字在该字号下的高度（英寸）；space_before为段前距（磅）"""
+    lines = sum(line_count(paragraphs, width, font_size, bold))
+    return (lines * font_size * LINE_SPACING + max(len(paragraphs) - 1, 0) * space_before) / 72
+
+
+def fit_font_size(paragraphs, width, height, max_size, min_size=MIN_FONT_SIZE, bold=False, space_before=0):
+    """能放进 width×height（英寸）的最大字号（不超过max_size，按SIZE_STEP取整）
+
+    paragraphs 为字符串或段落列表；最小字号仍放不下时返回 min_size
+    """
+    if isinstance(paragraphs, str):
+        paragraphs = [paragraphs]
+    if text_height(paragraphs, width, max_size, bold, space_before) <= height:
+        return max_size
+    # 二分查找：lo 放得下（或为最小字号），hi 放不下
+    lo, hi = 0, int((max_size - min_size) / SIZE_STEP) + 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if text_height(paragraphs, width, min_size + mid * SIZE_STEP, bold, space_before) <= height:
+            lo = mid
+        else:
+            hi = mid
+    return min_size + lo * SIZE_STEP
+
+
+def fit_text(text, width, height, max_size, min_size=MIN_FONT_SIZE, bold=False, space_before=0):
+    """构建函数用：返回能放下的字号，最小字号仍放不下时警告
+
+    text 为字符串或段落列表；含多语言版式的占位标记时按各语言分别计算，字号不一致时抛出 deck_locale.LocaleMismatch
+    """
+    import deck_locale
+
+    paragraphs = [text] if isinstance(text, str) else list(text)
+    expanded = [deck_locale.expand(p) for p in paragraphs]
+    langs = next((list(e) for e in expanded if e), [None])
+    sizes = {}
+    for lang in langs:
+        variant = [e[lang] if e else p for p, e in zip(paragraphs, expanded)]
+        size = fit_font_size(variant, width, height, max_size, min_size, bold, space_before)
+        if size == min_size and text_height(variant, width, size, bold, space_before) > height:
+            snippet = plain_text(" ".join(variant)).replace("\n", " ")[:30]
+            print(f"警告：文字在{size}pt仍放不下 {width:.2f}×{height:.2f}英寸：{snippet}…", file=sys.stderr)
+        sizes[lang] = size
+    if len(set(sizes.values())) > 1:
+        raise deck_locale.LocaleMismatch(f"文字适配后各语言字号不同 {sizes}")
+    return sizes[langs[0]]